@@ -0,0 +1,44 @@
+import argparse
+import sys
+import time
+
+from pathlib import Path
+from ntwheel.core.verifier import WheelVerifier
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ntwheel", description="Build tooling commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify = commands.add_parser("verify", help="Check wheels against their RECORD and SHA256SUMS.")
+    verify.add_argument("paths", nargs="+", type=Path, help="Wheel files or directories of wheels.")
+    verify.add_argument("--workers", type=int, default=None)
+    verify.add_argument("--update-store", action="store_true", help="Record the hashes of wheels that pass.")
+    verify.add_argument("--full", action="store_true", help="Hash the members of wheels that match the store too.")
+    verify.add_argument("--quiet", action="store_true", help="Only print failures and the summary.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    verifier = WheelVerifier(max_workers=args.workers, full=args.full)
+    try:
+        checks = verifier.verify(args.paths)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    failed = [check for check in checks if not check.ok]
+    for check in checks:
+        if check.ok and not args.quiet:
+            print(f"[Verify] ✅ {check.path} ({check.members} files)")
+        elif not check.ok:
+            print(f"[Verify] ❌ {check.path}")
+            for error in check.errors:
+                print(f"      {error}")
+    if args.update_store:
+        verifier.update_stores(checks)
+    print(f"{len(checks)} wheels, {sum(c.members for c in checks)} files verified in {elapsed:.2f} s: {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
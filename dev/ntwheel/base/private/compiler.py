@@ -0,0 +1,168 @@
+# Runs under the nox session's interpreter, which does not have ntwheel
+# installed: this module only uses the standard library.
+import argparse
+import hashlib
+import importlib.util
+import os
+import py_compile
+import shutil
+import sys
+import sysconfig
+import zipfile
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Header of a checked-hash pyc: magic, flags (hash-based | check source), source hash
+_CHECKED_HASH_FLAGS = (0b11).to_bytes(4, "little")
+
+
+def _expected_header(source: bytes) -> bytes:
+    return importlib.util.MAGIC_NUMBER + _CHECKED_HASH_FLAGS + importlib.util.source_hash(source)
+
+
+def compile_one(path: str, store: Optional[str] = None) -> str:
+    """
+    Write the checked-hash pyc of one source file unless it is already current.
+
+    A pyc whose header holds the source's hash is left alone. Otherwise the
+    pyc is copied from the store, where compiled files are kept by source
+    hash, or compiled and added to it. The code's filename is fixed up by the
+    import system on load, so one stored pyc serves every copy of a source.
+
+    Args:
+        path (str): The `.py` file.
+        store (Optional[str]): Directory of pycs by source hash, for this interpreter.
+
+    Returns:
+        str: "fresh", "cached", "compiled" or "error".
+    """
+    try:
+        source = Path(path).read_bytes()
+    except OSError:
+        return "error"
+    cfile = Path(importlib.util.cache_from_source(path))
+    header = _expected_header(source)
+    try:
+        with open(cfile, "rb") as f:
+            if f.read(len(header)) == header:
+                return "fresh"
+    except OSError:
+        pass
+
+    stored = Path(store) / f"{hashlib.blake2b(source, digest_size=16).hexdigest()}.pyc" if store else None
+    if stored is not None and stored.exists():
+        cfile.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cfile.with_name(f"{cfile.name}.{os.getpid()}.tmp")
+        shutil.copyfile(stored, tmp)
+        os.replace(tmp, cfile)
+        return "cached"
+
+    try:
+        py_compile.compile(path, cfile=str(cfile), doraise=True,
+                           invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+    except py_compile.PyCompileError:
+        return "error"
+    if stored is not None:
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        tmp = stored.with_name(f"{stored.name}.{os.getpid()}.tmp")
+        shutil.copyfile(cfile, tmp)
+        os.replace(tmp, stored)
+    return "compiled"
+
+
+def _compile_chunk(paths: List[str], store: Optional[str]) -> List[str]:
+    return [compile_one(path, store) for path in paths]
+
+
+def precompile(paths: Iterable[Path], store: Optional[Path] = None, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Compile source files to checked-hash pycs in a process pool.
+
+    Files that fail to compile are reported and counted; they do not stop the others.
+
+    Args:
+        paths (Iterable[Path]): The `.py` files.
+        store (Optional[Path]): Cache directory; a subdirectory per interpreter is used.
+        workers (Optional[int]): Worker processes; defaults to the CPU count. 1 compiles in this process.
+
+    Returns:
+        Dict[str, int]: How many files were fresh, cached, compiled or failed.
+    """
+    files = [str(path) for path in paths]
+    store_dir = str(Path(store) / sys.implementation.cache_tag) if store else None
+    workers = workers or os.cpu_count() or 1
+    counts = {"fresh": 0, "cached": 0, "compiled": 0, "error": 0}
+    if not files:
+        return counts
+
+    if workers == 1 or len(files) < 2 * workers:
+        results: Iterable[str] = _compile_chunk(files, store_dir)
+    else:
+        # Chunks amortize process round trips; most files are only header checks
+        size = max(1, len(files) // (workers * 4))
+        chunks = [files[i:i + size] for i in range(0, len(files), size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [r for chunk in executor.map(_compile_chunk, chunks, [store_dir] * len(chunks)) for r in chunk]
+    for path, result in zip(files, results):
+        counts[result] += 1
+        if result == "error":
+            print(f"[NTWheel] ⚠️  Could not compile {path}")
+    return counts
+
+
+def sources_in(directory: Path) -> List[Path]:
+    """List the `.py` files under a directory, skipping `__pycache__`."""
+    return sorted(p for p in Path(directory).rglob("*.py") if "__pycache__" not in p.parts)
+
+
+def sources_of_wheel(wheel: Path) -> Tuple[List[Path], List[str]]:
+    """
+    Locate the installed `.py` files of a wheel in this interpreter's site-packages.
+
+    Args:
+        wheel (Path): The wheel that was installed.
+
+    Returns:
+        Tuple[List[Path], List[str]]: Installed files, and members that were not found.
+    """
+    purelib = Path(sysconfig.get_paths()["purelib"])
+    with zipfile.ZipFile(wheel) as archive:
+        members = [name for name in archive.namelist() if name.endswith(".py")]
+    found = [purelib / name for name in members if (purelib / name).is_file()]
+    missing = [name for name in members if not (purelib / name).is_file()]
+    return found, missing
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompile sources to checked-hash pycs, cached by source hash.")
+    parser.add_argument("dirs", nargs="*", type=Path, help="Source directories to compile.")
+    parser.add_argument("--wheel", type=Path, action="append", default=[], help="Compile an installed wheel's files.")
+    parser.add_argument("--store", type=Path, help="Cache directory of pycs by source hash.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--strict", action="store_true", help="Exit with 1 if any file fails to compile.")
+    args = parser.parse_args(argv)
+
+    files: List[Path] = []
+    for directory in args.dirs:
+        files += sources_in(directory)
+    for wheel in args.wheel:
+        found, missing = sources_of_wheel(wheel)
+        files += found
+        if missing:
+            print(f"[NTWheel] ⚠️  {len(missing)} files of {wheel.name} are not installed in {sys.prefix}")
+
+    counts = precompile(files, store=args.store, workers=args.workers)
+    print(
+        f"[NTWheel] Precompiled {len(files)} files for {sys.implementation.cache_tag}: "
+        f"{counts['compiled']} compiled, {counts['cached']} from cache, {counts['fresh']} up to date"
+        + (f", {counts['error']} failed" if counts["error"] else "")
+    )
+    # Sources that do not compile cannot be imported either, so the tests report them;
+    # a missing pyc only costs a compile on first import
+    return 1 if args.strict and counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# Runs under the nox session's interpreter, which does not have ntwheel
+# installed: this module only uses the standard library.
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import zipfile
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Metrics compared between builds, and the unit they are reported in
+METRICS = {
+    "wheel_bytes": "B",
+    "unpacked_bytes": "B",
+    "file_count": "files",
+    "import_ms": "ms",
+    "import_rss_kb": "KiB",
+    "import_modules": "modules",
+}
+
+# Measures one cold import in a fresh, isolated interpreter: `-I` keeps the
+# working directory off sys.path, so the installed package is imported, not a checkout
+_PROBE = """
+import json, os, sys, time
+def rss():
+    # Current resident memory in KiB, or None where it cannot be read
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (field, ctypes.c_size_t) for field in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+        counters = Counters(cb=ctypes.sizeof(Counters))
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize // 1024
+        return None
+    # macOS and the BSDs: ps reports the current RSS in KiB, where ru_maxrss
+    # would be the peak, and in bytes on macOS
+    import subprocess
+    try:
+        return int(subprocess.run(["ps", "-o", "rss=", "-p", str(os.getpid())], capture_output=True, text=True).stdout)
+    except (OSError, ValueError):
+        return None
+# Loads what the fallbacks need before modules are counted
+rss()
+modules, before = len(sys.modules), rss()
+start = time.perf_counter()
+import {package}
+elapsed = time.perf_counter() - start
+after = rss()
+kb = after - before if after is not None and before is not None else None
+print(json.dumps({{"ms": elapsed * 1000, "kb": kb, "modules": len(sys.modules) - modules}}))
+"""
+
+
+def top_level(wheel: Path) -> str:
+    """
+    Find the importable top-level package of a wheel.
+
+    Args:
+        wheel (Path): The wheel file.
+
+    Returns:
+        str: The name from `top_level.txt`, else the first package or module in the archive.
+
+    Raises:
+        ValueError: If the wheel contains no importable name.
+    """
+    with zipfile.ZipFile(wheel) as archive:
+        names = archive.namelist()
+        for name in names:
+            if name.endswith(".dist-info/top_level.txt"):
+                lines = archive.read(name).decode("utf-8").split()
+                if lines:
+                    return lines[0]
+    for name in names:
+        first = name.split("/")[0]
+        if first.endswith((".dist-info", ".data")):
+            continue
+        return first[:-3] if first.endswith(".py") else first
+    raise ValueError(f"[Footprint] No importable package in {wheel.name}")
+
+
+def measure_wheel(wheel: Path) -> Dict[str, Any]:
+    """
+    Measure the size of a wheel from its archive.
+
+    Args:
+        wheel (Path): The wheel file.
+
+    Returns:
+        Dict[str, Any]: Compressed and uncompressed size in bytes and the number of files.
+    """
+    with zipfile.ZipFile(wheel) as archive:
+        infos = [info for info in archive.infolist() if not info.is_dir()]
+    return {
+        "wheel": wheel.name,
+        "wheel_bytes": wheel.stat().st_size,
+        "unpacked_bytes": sum(info.file_size for info in infos),
+        "file_count": len(infos),
+    }
+
+
+def measure_import(package: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Time cold imports of a package, each in a new interpreter.
+
+    Args:
+        package (str): The top-level package to import.
+        runs (int): Number of fresh interpreters; the medians are reported.
+
+    Returns:
+        Dict[str, Any]: Import wall time, resident memory added and modules loaded;
+            the memory is left out where the current resident size cannot be read.
+
+    Raises:
+        RuntimeError: If the package cannot be imported.
+    """
+    samples: List[Dict[str, float]] = []
+    for _ in range(max(runs, 1)):
+        proc = subprocess.run(
+            [sys.executable, "-I", "-c", _PROBE.format(package=package)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"[Footprint] Importing {package} failed:\n{proc.stderr.strip()}")
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    footprint = {
+        "package": package,
+        "import_ms": round(statistics.median(s["ms"] for s in samples), 2),
+        "import_modules": int(statistics.median(s["modules"] for s in samples)),
+        "import_runs": len(samples),
+    }
+    # Left out where the platform gives no current resident memory
+    if all(s["kb"] is not None for s in samples):
+        footprint["import_rss_kb"] = int(statistics.median(s["kb"] for s in samples))
+    return footprint
+
+
+def compare(
+    current: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+    limits: Optional[Dict[str, float]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Compare a footprint with the previous release and check it against limits.
+
+    A limit named like a metric (`import_ms`) is an absolute maximum; one
+    suffixed `_growth` (`wheel_bytes_growth`) is the largest allowed
+    increase over the previous release, as a fraction (0.1 is +10%).
+    Growth limits are skipped when there is no previous value.
+
+    Args:
+        current (Dict[str, Any]): The footprint of this build.
+        previous (Optional[Dict[str, Any]]): The footprint of the previous release, if any.
+        limits (Optional[Dict[str, float]]): Thresholds by metric name.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], List[str]]: Per-metric current value,
+            previous value and change, and a message for every exceeded limit.
+
+    Raises:
+        ValueError: If a limit names an unknown metric.
+    """
+    previous = previous or {}
+    limits = limits or {}
+    changes: Dict[str, Dict[str, Any]] = {}
+    for metric in METRICS:
+        if metric not in current:
+            continue
+        value, before = current[metric], previous.get(metric)
+        change = None
+        if before is not None and before:
+            change = round((value - before) / before, 4)
+        changes[metric] = {"value": value, "previous": before, "change": change}
+
+    violations = []
+    for name, limit in limits.items():
+        metric = name[:-len("_growth")] if name.endswith("_growth") else name
+        if metric not in METRICS:
+            raise ValueError(f"[Footprint] Unknown footprint limit: {name}")
+        entry = changes.get(metric)
+        if entry is None:
+            continue
+        unit = METRICS[metric]
+        if name.endswith("_growth"):
+            if entry["change"] is not None and entry["change"] > limit:
+                violations.append(
+                    f"{metric} grew {entry['change']:+.1%} ({entry['previous']} -> {entry['value']} {unit}), limit {limit:+.1%}"
+                )
+        elif entry["value"] > limit:
+            violations.append(f"{metric} is {entry['value']} {unit}, limit {limit} {unit}")
+    return changes, violations
+
+
+def format_changes(changes: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Format one line per metric: value, unit and the change from the previous release."""
+    lines = []
+    for metric, entry in changes.items():
+        change = f" ({entry['change']:+.1%} vs {entry['previous']})" if entry["change"] is not None else ""
+        lines.append(f"{metric:<15} {entry['value']} {METRICS[metric]}{change}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the footprint and import cost of an installed wheel.")
+    parser.add_argument("wheel", type=Path, help="The installed wheel.")
+    parser.add_argument("--output", type=Path, required=True, help="JSON file to write the footprint to.")
+    parser.add_argument("--package", help="Top-level package to import; read from the wheel by default.")
+    parser.add_argument("--runs", type=int, default=5, help="Cold imports to take the median of.")
+    args = parser.parse_args(argv)
+
+    footprint = measure_wheel(args.wheel)
+    footprint.update(measure_import(args.package or top_level(args.wheel), args.runs))
+    footprint["python"] = sys.implementation.cache_tag
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(footprint, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
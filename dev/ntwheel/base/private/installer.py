@@ -1,10 +1,13 @@
 
 from platform import release
+import json
 import shutil
 from pathlib import Path
 from typing import Dict, List, Optional
 from venv import create
 from nox.sessions import Session
+from ntwheel.base.private.footprint import compare, format_changes, measure_wheel
+from ntwheel.core.verifier import WheelVerifier
 
 class Installer:
     def __init__(self, session: Session, build_dir: Path, pkg_dir:Path, release_dir:Path):
@@ -23,6 +26,10 @@ class Installer:
         self.dist_dir = self.build_dir / "dist"
         self.egg_dir = self.build_dir / "egg"
         self.build_tmp_dir = self.build_dir / "build"
+        self.pyc_store_dir = self.build_dir / ".pyc-cache"
+        self.compiler_path = Path(__file__).parent / "compiler.py"
+        self.footprint_script_path = Path(__file__).parent / "footprint.py"
+        self.footprint_path = self.build_dir / "footprint.json"
 
     def clean_artifacts(self, target: Path) -> None:
         """
@@ -54,7 +61,123 @@ class Installer:
         if not wheel_path.exists():
             raise FileNotFoundError(f"[Installer] Wheel not found: {wheel_path}")
 
-        self.session.install(str(wheel_path))
+        self.wheels_verify([wheel_path])
+
+        # pip's timestamp pycs would be replaced by `wheel_precompile` anyway
+        self.session.install("--no-compile", str(wheel_path))
+
+
+    def wheel_precompile(self, wheel_path: Path) -> None:
+        """
+        Precompile the installed files of a wheel into checked-hash pycs.
+
+        Runs in the session's interpreter so the bytecode matches the one the
+        tests import with. Compiled files are kept in `build_dir/.pyc-cache`
+        by source hash, so unchanged modules are copied instead of compiled.
+
+        Args:
+            wheel_path (Path): The wheel that was installed.
+        """
+        self.session.run(
+            "python", str(self.compiler_path),
+            "--wheel", str(wheel_path),
+            "--store", str(self.pyc_store_dir),
+        )
+
+
+    def release_precompile(self) -> None:
+        """
+        Precompile the `release/src` snapshot into checked-hash pycs, reusing the cache of `wheel_precompile`.
+        """
+        src_dir = self.release_dir / "src"
+        if not src_dir.exists():
+            raise FileNotFoundError(f"[Release] Source snapshot not found: {src_dir}")
+
+        self.session.run(
+            "python", str(self.compiler_path),
+            str(src_dir),
+            "--store", str(self.pyc_store_dir),
+        )
+
+
+    def wheel_footprint(
+        self,
+        wheel_path: Path,
+        limits: Optional[Dict[str, float]] = None,
+        report_path: Optional[Path] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Measure the installed wheel and compare it with the previous release.
+
+        The wheel's compressed and uncompressed size and file count are read
+        from the archive; the cold-import time, resident memory and modules
+        loaded by importing its top-level package are medians over fresh
+        interpreters of the session. The previous release is the wheel of the
+        same distribution in `release/release`, with the import figures
+        recorded next to it by `wheel_release`.
+
+        Args:
+            wheel_path (Path): The wheel that was installed.
+            limits (Optional[Dict[str, float]]): Thresholds, see `footprint.compare`.
+            report_path (Optional[Path]): JSON report to store the comparison in, under `footprint`.
+
+        Returns:
+            Dict[str, Dict]: Per-metric value, previous value and change.
+
+        Raises:
+            RuntimeError: If a limit is exceeded.
+        """
+        self.session.run(
+            "python", str(self.footprint_script_path),
+            str(wheel_path), "--output", str(self.footprint_path),
+        )
+        current = json.loads(self.footprint_path.read_text(encoding="utf-8"))
+
+        previous = None
+        previous_wheel = self._previous_wheel(wheel_path)
+        if previous_wheel is not None:
+            previous = measure_wheel(previous_wheel)
+            recorded_path = self.release_dir / self.footprint_path.name
+            if recorded_path.exists():
+                recorded = json.loads(recorded_path.read_text(encoding="utf-8"))
+                if recorded.get("wheel") == previous_wheel.name and recorded.get("python") == current.get("python"):
+                    previous = {**recorded, **previous}
+
+        changes, violations = compare(current, previous, limits)
+        print(f"[Footprint] {current['wheel']} vs {previous['wheel'] if previous else 'no previous release'}")
+        for line in format_changes(changes):
+            print(f"  {line}")
+
+        if report_path is not None:
+            report_path = Path(report_path)
+            try:
+                report = json.loads(report_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                report = {}
+            report["footprint"] = {
+                "wheel": current["wheel"],
+                "package": current["package"],
+                "previous": previous["wheel"] if previous else None,
+                "metrics": changes,
+                "limits": limits or {},
+                "violations": violations,
+            }
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+        if violations:
+            raise RuntimeError("[Footprint] Limits exceeded:\n  " + "\n  ".join(violations))
+        return changes
+
+    def _previous_wheel(self, wheel_path: Path) -> Optional[Path]:
+        # The released wheel of the same distribution, preferring the same file name
+        release_wheels = self.release_dir / "release"
+        same = release_wheels / wheel_path.name
+        if same.exists():
+            return same
+        distribution = wheel_path.name.split("-")[0]
+        candidates = list(release_wheels.glob(f"{distribution}-*.whl"))
+        return max(candidates, key=lambda w: (w.stat().st_mtime, w.name)) if candidates else None
 
 
     def wheel_test(self, test_files: Optional[Dict[str, List[str]]]=None) -> None:
@@ -159,6 +282,18 @@ class Installer:
         for wheel in wheel_files:
             shutil.copy2(wheel, dst_release_dir / wheel.name)
 
+        # Record the released wheels' hashes, checked by `wheels_verify` before offline installs
+        # A rebuild of the same version overwrites the released file, so its old entry is not compared
+        checks = WheelVerifier().verify([dst_release_dir / wheel.name for wheel in wheel_files], use_store=False)
+        failed = [check for check in checks if not check.ok]
+        if failed:
+            raise RuntimeError(f"[Release] Released wheel does not match its RECORD: {failed[0].path}: {failed[0].errors[0]}")
+        WheelVerifier.update_stores(checks)
+
+        # The next build compares its footprint with this one
+        if self.footprint_path.exists():
+            shutil.copy2(self.footprint_path, self.release_dir / self.footprint_path.name)
+
         print(f"[Release] ✅ Release created at {self.release_dir}")
 
 
@@ -181,6 +316,8 @@ class Installer:
         if not offline_dir.exists():
             raise FileNotFoundError(f"[Handler] Offline directory does not exist: {offline_dir}")
 
+        self.wheels_verify([offline_dir])
+
         for subdir in offline_dir.iterdir():
             if subdir.is_dir():
                 wheel_files = list(subdir.glob("*.whl"))
@@ -195,6 +332,26 @@ class Installer:
                         str(subdir), *[str(w) for w in wheel_files],
                     )
 
+    def wheels_verify(self, paths: List[Path]) -> None:
+        """
+        Pre-install hook: check wheels against their RECORD and the hashes stored next to them.
+
+        Args:
+            paths (List[Path]): Wheel files or directories of wheels.
+
+        Raises:
+            RuntimeError: If any wheel fails verification.
+        """
+        checks = WheelVerifier().verify(paths)
+        failed = [check for check in checks if not check.ok]
+        for check in failed:
+            print(f"[Verify] ❌ {check.path}")
+            for error in check.errors:
+                print(f"      {error}")
+        if failed:
+            raise RuntimeError(f"[Verify] {len(failed)} of {len(checks)} wheels failed verification")
+        print(f"[Verify] ✅ {len(checks)} wheels match their RECORD")
+
     def packages_requirements_sync(self, export: bool, path: Path) -> None:
         """
         Sync the current environment’s requirements to or from a file.
@@ -0,0 +1,154 @@
+import base64
+import csv
+import hashlib
+import io
+import mmap
+import zipfile
+import zlib
+
+from pathlib import Path
+from typing import Dict, Optional
+from ntwheel.base.public.models import WheelCheck
+
+# Hashes of the wheels of a directory, in `sha256sum` format
+STORE_NAME = "SHA256SUMS"
+# RECORD may not list a hash for itself or its signatures
+_UNHASHED = ("RECORD", "RECORD.jws", "RECORD.p7s")
+_WEAK = {"md5", "sha1"}
+_CHUNK = 1 << 20
+
+
+def read_store(directory: Path) -> Dict[str, str]:
+    """
+    Read the wheel hashes recorded in a directory's store.
+
+    Args:
+        directory (Path): A directory of wheels.
+
+    Returns:
+        Dict[str, str]: Hex SHA-256 by wheel file name; empty without a store.
+    """
+    path = Path(directory) / STORE_NAME
+    if not path.exists():
+        return {}
+    store = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        digest, _, name = line.strip().partition("  ")
+        if digest and name:
+            store[name.lstrip("*")] = digest
+    return store
+
+
+def write_store(directory: Path, hashes: Dict[str, str]) -> None:
+    """Write the wheel hashes of a directory, sorted by file name."""
+    path = Path(directory) / STORE_NAME
+    path.write_text("".join(f"{digest}  {name}\n" for name, digest in sorted(hashes.items())), encoding="utf-8")
+
+
+class _MappedReader(io.RawIOBase):
+    # zipfile needs `seekable`, which mmap objects only have from Python 3.13
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mapped.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+
+def _record_digest(algorithm: str, data_hash: "hashlib._Hash") -> str:
+    return f"{algorithm}=" + base64.urlsafe_b64encode(data_hash.digest()).rstrip(b"=").decode("ascii")
+
+
+def _check_members(archive: zipfile.ZipFile, check: WheelCheck, hash_members: bool = True) -> None:
+    infos = {info.filename: info for info in archive.infolist() if not info.is_dir()}
+    check.members = len(infos)
+    if not hash_members:
+        return
+    records = [name for name in infos if name.count("/") == 1 and name.endswith(".dist-info/RECORD")]
+    if len(records) != 1:
+        check.errors.append(f"expected one .dist-info/RECORD, found {len(records)}")
+        return
+    dist_info = records[0].split("/")[0]
+
+    rows = csv.reader(io.TextIOWrapper(archive.open(records[0]), encoding="utf-8", newline=""))
+    listed = set()
+    for row in rows:
+        if not row:
+            continue
+        name, digest, size = (row + ["", ""])[:3]
+        listed.add(name)
+        info = infos.get(name)
+        if info is None:
+            check.errors.append(f"{name}: listed in RECORD but missing")
+            continue
+        if not digest:
+            if name not in (f"{dist_info}/{unhashed}" for unhashed in _UNHASHED):
+                check.errors.append(f"{name}: no hash in RECORD")
+            continue
+        algorithm = digest.partition("=")[0]
+        if algorithm in _WEAK or algorithm not in hashlib.algorithms_guaranteed:
+            check.errors.append(f"{name}: unsupported hash {algorithm}")
+            continue
+        if size and int(size) != info.file_size:
+            check.errors.append(f"{name}: size {info.file_size}, RECORD says {size}")
+            continue
+        # Members are decompressed straight from the mapped archive, never written to disk
+        member_hash = hashlib.new(algorithm)
+        try:
+            with archive.open(info) as member:
+                for chunk in iter(lambda: member.read(_CHUNK), b""):
+                    member_hash.update(chunk)
+        except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+            check.errors.append(f"{name}: corrupt: {e}")
+            continue
+        if _record_digest(algorithm, member_hash) != digest:
+            check.errors.append(f"{name}: hash does not match RECORD")
+
+    for name in infos:
+        if name not in listed:
+            check.errors.append(f"{name}: not listed in RECORD")
+        if name.startswith("/") or ".." in name.split("/"):
+            check.errors.append(f"{name}: unsafe path")
+
+
+def verify_wheel(path: str, expected: Optional[str] = None, full: bool = False) -> WheelCheck:
+    """
+    Check a wheel against its RECORD and, if given, the hash recorded for it.
+
+    The archive is memory-mapped: the whole-file hash reads the mapping
+    directly and members are hashed as they are decompressed from it.
+    Stores only hold wheels that passed, so a wheel matching its store
+    entry is not decompressed again unless `full` is set.
+
+    Args:
+        path (str): The wheel file.
+        expected (Optional[str]): Hex SHA-256 of the file from the release store.
+        full (bool): Hash the members even if the file matches the store.
+
+    Returns:
+        WheelCheck: The file hash, the member count and every mismatch found.
+    """
+    check = WheelCheck(path=path)
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            check.sha256 = hashlib.sha256(mapped).hexdigest()
+            if expected is not None and expected != check.sha256:
+                check.errors.append(f"sha256 {check.sha256} does not match the store ({expected})")
+            with zipfile.ZipFile(_MappedReader(mapped)) as archive:
+                _check_members(archive, check, hash_members=full or expected != check.sha256)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        # ValueError: empty files cannot be mapped, or a malformed RECORD
+        check.errors.append(f"unreadable: {e}")
+    return check
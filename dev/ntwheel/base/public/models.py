@@ -1,4 +1,4 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from typing import Dict, List, Optional
 import json
 
@@ -11,6 +11,8 @@ class EnvModel:
     build_dir: str = "build"
     test_files: Optional[Dict[str, List[str]]] = None
     release_dir: str = "release"
+    # Footprint thresholds that fail the build, e.g. {"import_ms": 300, "wheel_bytes_growth": 0.1}
+    footprint_limits: Optional[Dict[str, float]] = None
 
     def __post_init__(self):
         # Ensure test_files is always a dict (not None or str)
@@ -33,6 +35,11 @@ class EnvModel:
             except Exception:
                 return {"test1.py": ["--arg1", "--flag"]}
 
+        def parse_limits(value):
+            if isinstance(value, dict) or value is None:
+                return value
+            return json.loads(value)
+
         normalized = {k.lower(): v for k, v in env.items()}
         return cls(
             python_version=normalized.get("python_version", "3.10"),
@@ -40,5 +47,19 @@ class EnvModel:
             build_dir=normalized.get("build_dir", "build"),
             release_dir=normalized.get("release_dir", "release"),
             test_files=parse_test_files(normalized.get("test_files", {})),
-            pkgs_req_dir=normalized.get("pkgs_req_dir", "ubuntu")
+            pkgs_req_dir=normalized.get("pkgs_req_dir", "ubuntu"),
+            footprint_limits=parse_limits(normalized.get("footprint_limits")),
         )
+
+
+@dataclass
+class WheelCheck:
+    path: str
+    sha256: str = ""
+    members: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the wheel matched its RECORD and the release store."""
+        return not self.errors
@@ -34,6 +34,7 @@ def build_test(session: Session):
     print(f"▶️ TEST_FILES              = {env.test_files}")
     print(f"📄 PKGS_REQ_DIR            = {env.pkgs_req_dir}")
     print(f"🐍 PYTHON_VERSION          = {env.python_version}")
+    print(f"📏 FOOTPRINT_LIMITS        = {env.footprint_limits}")
     print(f"📛 SESSION_NAME            = {session.name}")
 
     # Install and run
@@ -49,6 +50,21 @@ def build_test(session: Session):
     wheel_path = installer.wheel_build()
 
     installer.wheel_install(wheel_path)
+    installer.wheel_precompile(wheel_path)
+    report_path = os.environ.get("NTWHEEL_REPORT")
+    footprint_error = None
+    try:
+        installer.wheel_footprint(
+            wheel_path,
+            limits=env.footprint_limits,
+            report_path=Path(report_path) if report_path else None,
+        )
+    except RuntimeError as e:
+        footprint_error = str(e)
+    # The tests still run, so a footprint limit does not hide their results
     installer.wheel_test(env.test_files)
+    if footprint_error is not None:
+        session.error(footprint_error)
 
     installer.wheel_release()
+    installer.release_precompile()
@@ -42,6 +42,7 @@ class NTWheel:
         proc_env["PYTHONPATH"] = str(pkg_dir) 
         proc_env["NTWHEEL_ENV"] = json.dumps(self.env.to_dict())
         proc_env["PYTHON_VERSION"] = self.env.python_version
+        proc_env["NTWHEEL_REPORT"] = self.report_path
         
         print(f"[NTWheel] Running: {' '.join(shlex.quote(arg) for arg in cmd)}")
 
@@ -0,0 +1,93 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from ntwheel.base.private.verify import read_store, verify_wheel, write_store
+from ntwheel.base.public.models import WheelCheck
+
+
+class WheelVerifier:
+    def __init__(self, max_workers: Optional[int] = None, full: bool = False):
+        """
+        Verify wheels against their RECORD and the hashes stored next to them, in parallel.
+
+        Every member of a wheel is hashed and compared with its RECORD
+        entry, and the wheel itself with the `SHA256SUMS` of its directory
+        when there is one. Wheels are spread over a process pool.
+
+        Args:
+            max_workers (Optional[int]): Worker processes; defaults to the CPU count. 1 verifies in this process.
+            full (bool): Hash the members of wheels that already match their store entry too.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.full = full
+
+    @staticmethod
+    def wheels(paths: Iterable[Path]) -> List[Path]:
+        """
+        Collect the wheels to verify.
+
+        Args:
+            paths (Iterable[Path]): Wheel files, or directories searched recursively.
+
+        Returns:
+            List[Path]: The wheel files, sorted.
+
+        Raises:
+            FileNotFoundError: If a path does not exist.
+        """
+        found = set()
+        for path in map(Path, paths):
+            if not path.exists():
+                raise FileNotFoundError(f"[Verify] Path not found: {path}")
+            found.update([path] if path.is_file() else path.rglob("*.whl"))
+        return sorted(found)
+
+    def verify(self, paths: Iterable[Path], use_store: bool = True) -> List[WheelCheck]:
+        """
+        Verify wheels, or every wheel under directories.
+
+        Args:
+            paths (Iterable[Path]): Wheel files or directories.
+            use_store (bool): Compare with the stored hashes; False checks only RECORD,
+                e.g. for wheels that were just rebuilt over a released file of the same name.
+
+        Returns:
+            List[WheelCheck]: One result per wheel, in path order.
+        """
+        wheels = self.wheels(paths)
+        stores = {directory: read_store(directory) if use_store else {} for directory in {wheel.parent for wheel in wheels}}
+        expected = [stores[wheel.parent].get(wheel.name) for wheel in wheels]
+        files = [str(wheel) for wheel in wheels]
+
+        if self.max_workers == 1 or len(wheels) < 2:
+            return list(map(verify_wheel, files, expected, [self.full] * len(files)))
+        chunksize = max(1, len(wheels) // (self.max_workers * 4))
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(wheels))) as executor:
+            return list(executor.map(verify_wheel, files, expected, [self.full] * len(files), chunksize=chunksize))
+
+    @staticmethod
+    def update_stores(checks: Iterable[WheelCheck]) -> int:
+        """
+        Record the hashes of verified wheels in the store of their directory.
+
+        Wheels that failed verification are left out, and entries of wheels
+        that no longer exist are dropped.
+
+        Args:
+            checks (Iterable[WheelCheck]): Results of `verify`.
+
+        Returns:
+            int: Number of stores written.
+        """
+        by_dir = {}
+        for check in checks:
+            if check.ok:
+                by_dir.setdefault(Path(check.path).parent, {})[Path(check.path).name] = check.sha256
+        for directory, hashes in by_dir.items():
+            kept = {name: digest for name, digest in read_store(directory).items() if (directory / name).exists()}
+            kept.update(hashes)
+            write_store(directory, kept)
+        return len(by_dir)
@@ -0,0 +1,36 @@
+import argparse
+import sys
+import time
+
+from pathlib import Path
+from ntdocs.core.search import SearchIndex
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ntdocs", description="Query generated documentation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Search headings, symbols and docstrings.")
+    search.add_argument("docs_dir", type=Path, help="The `documentations` directory of a build.")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        hits = SearchIndex(args.docs_dir).search(" ".join(args.query), limit=args.limit)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        label = hit.name or hit.title
+        print(f"{hit.score:>4}  {label}  {hit.file}  release.md#{hit.anchor}")
+        if hit.summary:
+            print(f"      {hit.summary}")
+    print(f"{len(hits)} hits in {elapsed:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
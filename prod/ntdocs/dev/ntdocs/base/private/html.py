@@ -0,0 +1,189 @@
+import html
+import re
+
+from typing import List, Tuple
+from ntdocs.base.private.markdown import Slugger
+
+# Part of every page hash: bump it when the rendered output changes
+RENDER_VERSION = 1
+
+_FENCE = re.compile(r"^```\s*([\w+-]*)")
+_HEADER = re.compile(r"^(#{1,6})\s+(.*)")
+_ITEM = re.compile(r"^( *)[-*+]\s+(.*)")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_STRONG = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+_EM = re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])|(?<![\w_])_(?=\S)(.+?)(?<=\S)_(?![\w_])")
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - {package}</title>
+<style>
+body {{ margin: 0; display: flex; font: 15px/1.5 system-ui, sans-serif; color: #1f2328; }}
+nav {{ width: 18rem; flex: none; height: 100vh; overflow: auto; position: sticky; top: 0;
+       padding: 1rem; box-sizing: border-box; background: #f6f8fa; font-size: 14px; }}
+nav ul {{ list-style: none; padding-left: 0.8rem; margin: 0; }}
+nav a.current {{ font-weight: 600; }}
+main {{ max-width: 52rem; padding: 1rem 2rem; }}
+pre {{ background: #f6f8fa; padding: 0.8rem; overflow: auto; }}
+code {{ font: 13px ui-monospace, monospace; }}
+</style>
+</head>
+<body>
+<nav id="nav"></nav>
+<main>
+{body}
+</main>
+<script src="nav.js"></script>
+</body>
+</html>
+"""
+
+# Loaded by every page under a fixed name, so pages do not change when the nav does
+NAV_SCRIPT = """window.NTDOCS_NAV = {nav};
+(function () {{
+  var here = location.pathname.split("/").pop();
+  var root = document.createElement("ul");
+  NTDOCS_NAV.forEach(function (page) {{
+    var stack = [[0, root]];
+    page.headings.forEach(function (h) {{
+      while (stack.length > 1 && stack[stack.length - 1][0] >= h[0]) stack.pop();
+      var item = document.createElement("li"), link = document.createElement("a");
+      link.textContent = h[1];
+      link.href = page.href + (stack.length > 1 ? "#" + h[2] : "");
+      if (page.href === here && stack.length === 1) link.className = "current";
+      item.appendChild(link);
+      var list = document.createElement("ul");
+      item.appendChild(list);
+      stack[stack.length - 1][1].appendChild(item);
+      stack.push([h[0], list]);
+    }});
+  }});
+  document.getElementById("nav").appendChild(root);
+}})();
+"""
+
+
+def render_inline(text: str) -> str:
+    """Render links, code spans and emphasis of one line of Markdown, escaping everything else."""
+    parts = []
+    last = 0
+    for match in _LINK.finditer(text):
+        parts.append(_render_code(text[last:match.start()]))
+        href = html.escape(match.group(2), quote=True)
+        parts.append(f'<a href="{href}">{_render_code(match.group(1))}</a>')
+        last = match.end()
+    parts.append(_render_code(text[last:]))
+    return "".join(parts)
+
+
+def _render_code(text: str) -> str:
+    # Odd pieces are inside backticks
+    pieces = text.split("`")
+    if len(pieces) % 2 == 0:
+        # Unbalanced: the last backtick is literal
+        pieces[-2:] = [pieces[-2] + "`" + pieces[-1]]
+    rendered = []
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            rendered.append(f"<code>{html.escape(piece)}</code>")
+        else:
+            piece = _STRONG.sub(r"<strong>\1</strong>", html.escape(piece, quote=False))
+            rendered.append(_EM.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", piece))
+    return "".join(rendered)
+
+
+def render_markdown(text: str) -> Tuple[str, List[Tuple[int, str, str]]]:
+    """
+    Render the Markdown NTDocs writes to HTML.
+
+    Supports headers, fenced and indented code blocks, nested bullet lists,
+    paragraphs, links, code spans and emphasis. Headers get the same
+    anchors as in the Markdown table of contents, unique within the page.
+
+    Args:
+        text (str): Markdown text.
+
+    Returns:
+        Tuple[str, List[Tuple[int, str, str]]]: The HTML, and the level, title
+            and anchor of every header.
+    """
+    out: List[str] = []
+    headings: List[Tuple[int, str, str]] = []
+    slugger = Slugger()
+    paragraph: List[str] = []
+    lists: List[int] = []
+    lines = text.splitlines()
+
+    def close_paragraph():
+        if paragraph:
+            out.append(f"<p>{' '.join(render_inline(line.strip()) for line in paragraph)}</p>")
+            paragraph.clear()
+
+    def close_lists(indent: int = -1):
+        while lists and lists[-1] > indent:
+            lists.pop()
+            out.append("</li></ul>")
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = _FENCE.match(line)
+        header = _HEADER.match(line)
+        item = _ITEM.match(line)
+        if fence:
+            close_paragraph()
+            close_lists()
+            code = []
+            i += 1
+            while i < len(lines) and not lines[i].startswith("```"):
+                code.append(lines[i])
+                i += 1
+            language = f' class="language-{fence.group(1)}"' if fence.group(1) else ""
+            out.append(f"<pre><code{language}>{html.escape(chr(10).join(code))}</code></pre>")
+        elif header:
+            close_paragraph()
+            close_lists()
+            level, title = len(header.group(1)), header.group(2).strip()
+            anchor = slugger.slug(title)
+            headings.append((level, title, anchor))
+            out.append(f'<h{level} id="{html.escape(anchor)}">{render_inline(title)}</h{level}>')
+        elif item:
+            close_paragraph()
+            indent = len(item.group(1))
+            if lists and lists[-1] >= indent:
+                close_lists(indent)
+                if lists and lists[-1] == indent:
+                    out.append("</li>")
+                else:
+                    out.append("<ul>")
+                    lists.append(indent)
+            else:
+                out.append("<ul>")
+                lists.append(indent)
+            out.append(f"<li>{render_inline(item.group(2))}")
+        elif not line.strip():
+            close_paragraph()
+            if not (i + 1 < len(lines) and _ITEM.match(lines[i + 1])):
+                close_lists()
+        elif line.startswith("    ") and not paragraph and not lists:
+            code = []
+            while i < len(lines) and (lines[i].startswith("    ") or not lines[i].strip()):
+                code.append(lines[i][4:])
+                i += 1
+            while code and not code[-1].strip():
+                code.pop()
+            out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+            continue
+        elif lists and not paragraph:
+            # Continuation of a list item
+            out.append(" " + render_inline(line.strip()))
+        else:
+            paragraph.append(line)
+        i += 1
+
+    close_paragraph()
+    close_lists()
+    return "\n".join(out), headings
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import time
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+MANIFEST_NAME = ".ntdocs-manifest.json"
+MANIFEST_VERSION = 2
+
+
+def content_hash(*parts: str) -> str:
+    """Hash text parts into a short hex digest."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Hash a file's bytes, reading it in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, docs_dir: Path):
+        """
+        Record what produced every generated file so unchanged outputs are not rewritten.
+
+        Each output is stored with the hash of its inputs and the size and
+        mtime it had when written; a file is up to date when the inputs hash
+        matches and the file was not touched since. Reads of a missing or
+        corrupt manifest start empty, which rebuilds everything once.
+
+        Args:
+            docs_dir (Path): The documentation directory the manifest lives in.
+        """
+        self.docs_dir = docs_dir
+        self.path = docs_dir / MANIFEST_NAME
+        self.data: Dict[str, Any] = {"version": MANIFEST_VERSION, "outputs": {}, "fragments": {}, "sources": {}, "retired": {}}
+        self._changed = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self.data.update(data)
+        except (OSError, ValueError):
+            pass
+
+    def _key(self, path: Path) -> str:
+        return Path(path).relative_to(self.docs_dir).as_posix()
+
+    def _stamp(self, path: Path) -> Optional[List[int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def up_to_date(self, path: Path, inputs: str) -> bool:
+        """
+        Whether a file was generated from these inputs and not modified since.
+
+        Args:
+            path (Path): The output file.
+            inputs (str): Hash of everything the output is generated from.
+
+        Returns:
+            bool: True if the file does not need to be generated again.
+        """
+        entry = self.data["outputs"].get(self._key(path))
+        return bool(entry) and entry["inputs"] == inputs and entry["stamp"] == self._stamp(path)
+
+    def write(self, path: Path, text: str, stage: str, inputs: Optional[str] = None) -> bool:
+        """
+        Write an output unless it is up to date or already holds exactly this text.
+
+        Args:
+            path (Path): The output file.
+            text (str): Its content.
+            stage (str): The build step producing it, used to find stale outputs.
+            inputs (Optional[str]): Hash of the inputs; defaults to the hash of `text`.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        inputs = inputs or content_hash(text)
+        if self.up_to_date(path, inputs):
+            return False
+
+        written = False
+        data = text.encode("utf-8")
+        try:
+            same = path.stat().st_size == len(data) and path.read_bytes() == data
+        except FileNotFoundError:
+            same = False
+        if not same:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            written = True
+        self.record(path, stage, inputs)
+        return written
+
+    def record(self, path: Path, stage: str, inputs: str) -> None:
+        """Remember the inputs an output was generated from, and its current size and mtime."""
+        self.data["outputs"][self._key(path)] = {"stage": stage, "inputs": inputs, "stamp": self._stamp(path)}
+        self._changed = True
+
+    def outputs(self, stage: str) -> List[Path]:
+        """List the outputs recorded for a build step."""
+        return [self.docs_dir / key for key, entry in self.data["outputs"].items() if entry["stage"] == stage]
+
+    def intact(self, stage: str) -> bool:
+        """Whether every output recorded for a build step is still as it was written."""
+        return all(
+            entry["stamp"] == self._stamp(self.docs_dir / key)
+            for key, entry in self.data["outputs"].items() if entry["stage"] == stage
+        )
+
+    def forget(self, path: Path) -> None:
+        """Delete a generated file and its record."""
+        path.unlink(missing_ok=True)
+        self.data["outputs"].pop(self._key(path), None)
+        self.data["fragments"].pop(self._key(path), None)
+        self._changed = True
+
+    def fragment(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached fragment data of a release section if the file is unchanged.
+
+        Args:
+            path (Path): A section file included in the release.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached data, or None if the file changed or was never seen.
+        """
+        entry = self.data["fragments"].get(self._key(path))
+        if entry and entry["stamp"] == self._stamp(path):
+            return entry
+        return None
+
+    def set_fragment(self, path: Path, **values: Any) -> Dict[str, Any]:
+        """Cache data derived from a release section, tied to the file's current size and mtime."""
+        entry = dict(values, stamp=self._stamp(path))
+        self.data["fragments"][self._key(path)] = entry
+        self._changed = True
+        return entry
+
+    def source(self, name: str) -> Optional[str]:
+        """Return the fingerprint recorded for a package source."""
+        return self.data["sources"].get(name)
+
+    def set_source(self, name: str, fingerprint: str) -> None:
+        """Record the fingerprint of a package source the module pages were built from."""
+        if self.data["sources"].get(name) != fingerprint:
+            self.data["sources"][name] = fingerprint
+            self._changed = True
+
+    def retire(self, current: Iterable[str], present: Iterable[str], keep: int) -> List[str]:
+        """
+        Track generated files that are no longer current and pick the ones to evict.
+
+        A file is retired when it stops being current and revived if it
+        becomes current again; once more than `keep` files are retired, the
+        ones retired longest ago are returned for deletion.
+
+        Args:
+            current (Iterable[str]): Names of the files the latest build uses.
+            present (Iterable[str]): Names of the files that exist.
+            keep (int): How many retired files to keep.
+
+        Returns:
+            List[str]: Names of the files to delete, already forgotten.
+        """
+        retired = self.data["retired"]
+        current = set(current)
+        now = time.time()
+        for name in list(retired):
+            if name in current:
+                del retired[name]
+                self._changed = True
+        for name in present:
+            if name not in current and name not in retired:
+                retired[name] = now
+                self._changed = True
+
+        evicted = sorted(retired, key=retired.get)[:max(len(retired) - keep, 0)]
+        for name in evicted:
+            del retired[name]
+            self._changed = True
+        return evicted
+
+    def save(self) -> None:
+        """Write the manifest if anything was recorded; the file is replaced atomically."""
+        if not self._changed:
+            return
+        self.docs_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.data, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._changed = False
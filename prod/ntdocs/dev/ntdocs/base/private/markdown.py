@@ -0,0 +1,159 @@
+import re
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_HEADER = re.compile(r"^(#{1,6})\s+(.*)")
+_FENCE = "```"
+# Same as _HEADER and _FENCE, for searching whole chunks of lines at once
+_HEADER_OR_FENCE = re.compile(r"^(?:(```)|(#{1,6})[^\S\n]+([^\n]*))", re.MULTILINE)
+_NON_WORD = re.compile(r"[^\w]+")
+_SUFFIXED = re.compile(r"^(.*)-(\d+)$")
+
+
+@lru_cache(maxsize=4096)
+def slugify(text: str) -> str:
+    """Turn a header title into its anchor, e.g. `Table of Contents` -> `table-of-contents`."""
+    return _NON_WORD.sub("-", text.strip().lower()).strip("-")
+
+
+class Slugger:
+    def __init__(self, *taken: str):
+        """
+        Give every header of a document a unique anchor, the way GitHub does.
+
+        A repeated slug gets `-1`, `-2`, ... appended, skipping suffixed slugs
+        that are already taken, so the second `__init__` links to `#__init__-1`.
+        Only one counter per distinct slug is kept: `name-3` is known to be
+        taken while the counter of `name` is at least 3, so memory does not
+        grow with the number of repeated headers.
+
+        Args:
+            taken (str): Titles of headers that come first, e.g. `Table of Contents`.
+        """
+        self._counts: Dict[str, int] = {}
+        for title in taken:
+            self.slug(title)
+
+    def slug(self, title: str) -> str:
+        """Return the anchor of the next header with this title."""
+        base = slugify(title)
+        if not self._taken(base):
+            self._counts[base] = 0
+            return base
+        # A new `base-N` can only clash with a header titled exactly that
+        while True:
+            count = self._counts[base] = self._counts.get(base, 0) + 1
+            slug = f"{base}-{count}"
+            if slug not in self._counts:
+                return slug
+
+    def _taken(self, slug: str) -> bool:
+        if slug in self._counts:
+            return True
+        match = _SUFFIXED.match(slug)
+        return bool(match) and match.group(2)[0] != "0" and self._counts.get(match.group(1), 0) >= int(match.group(2))
+
+
+def _heading(line: str, fenced: bool) -> Tuple[bool, Optional[Tuple[int, str]]]:
+    # Track code blocks: a `#` line inside one is not a header
+    if line.startswith(_FENCE):
+        return not fenced, None
+    match = None if fenced else _HEADER.match(line)
+    return fenced, (len(match.group(1)), match.group(2).strip()) if match else None
+
+
+def scan_headings(lines: Iterable[str]) -> List[Tuple[int, str]]:
+    """
+    List the headers of a Markdown document, ignoring `#` lines in code blocks.
+
+    Args:
+        lines (Iterable[str]): The lines, e.g. an open file.
+
+    Returns:
+        List[Tuple[int, str]]: Level and title of every header, in order.
+    """
+    headings = []
+    fenced = False
+    for line in lines:
+        fenced, heading = _heading(line, fenced)
+        if heading is not None:
+            headings.append(heading)
+    return headings
+
+
+def file_headings(path: Path, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, str]]:
+    """
+    Stream the headers of a Markdown file, ignoring `#` lines in code blocks.
+
+    The file is read in chunks of whole lines and searched with one
+    multiline pattern, so only header and fence lines reach Python code.
+
+    Args:
+        path (Path): The file.
+        chunk_size (int): Characters to read at a time, rounded up to a line end.
+
+    Yields:
+        Tuple[int, str]: Level and title of every header, in order.
+    """
+    fenced = False
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            if not chunk.endswith("\n"):
+                chunk += f.readline()
+            for match in _HEADER_OR_FENCE.finditer(chunk):
+                if match.group(1):
+                    fenced = not fenced
+                elif not fenced:
+                    yield len(match.group(2)), match.group(3).strip()
+
+
+def toc_line(level: int, title: str, anchor: str) -> str:
+    """Format a TOC entry, indented by level."""
+    return f"{'  ' * (level - 1)}- [{title}](#{anchor})"
+
+
+def toc_entries(content: str, slugger: Optional[Slugger] = None) -> List[str]:
+    """
+    Extract Markdown headers and convert them to TOC links.
+
+    Args:
+        content (str): Markdown text.
+        slugger (Optional[Slugger]): Shared across the parts of one document to keep anchors unique.
+
+    Returns:
+        List[str]: One indented link per header.
+    """
+    slugger = slugger or Slugger()
+    return [toc_line(level, title, slugger.slug(title)) for level, title in scan_headings(content.splitlines())]
+
+
+def split_headings(content: str) -> Iterator[Tuple[int, str, List[str]]]:
+    """
+    Split Markdown into headings and the lines under them, ignoring `#` lines in code blocks.
+
+    Args:
+        content (str): Markdown text.
+
+    Yields:
+        Tuple[int, str, List[str]]: Heading level, title and body lines; text
+            before the first heading is skipped.
+    """
+    current = None
+    body: List[str] = []
+    fenced = False
+    for line in content.splitlines():
+        fenced, heading = _heading(line, fenced)
+        if heading is not None:
+            if current is not None:
+                yield current[0], current[1], body
+            current = heading
+            body = []
+        elif current is not None:
+            body.append(line)
+    if current is not None:
+        yield current[0], current[1], body
@@ -0,0 +1,134 @@
+import json
+import re
+
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+from ntdocs.base.private.manifest import Manifest
+from ntdocs.base.private.markdown import split_headings
+
+SEARCH_DIR = "search"
+INDEX_VERSION = 1
+
+_WORD = re.compile(r"\w+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_SYMBOL = re.compile(r"^`([^`]+)`$")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it",
+    "of", "on", "or", "the", "this", "to", "was", "with",
+}
+# Weight of a term in a heading or symbol name, against one per occurrence in the body
+TITLE_WEIGHT = 8
+MAX_BODY_WEIGHT = 5
+
+
+def terms(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Identifiers are kept whole and also split on underscores and case
+    changes, so `configure_file` and `NTLog` match `file` and `log`.
+
+    Args:
+        text (str): Any text.
+
+    Returns:
+        List[str]: The terms, with repeats, in order.
+    """
+    found = []
+    for word in _WORD.findall(text):
+        lower = word.lower()
+        if len(lower) > 1 and lower not in STOPWORDS:
+            found.append(lower)
+        parts = [p for part in word.split("_") for p in _CAMEL.findall(part)]
+        if len(parts) > 1:
+            found.extend(p.lower() for p in parts if len(p) > 1 and p.lower() not in STOPWORDS)
+    return found
+
+
+def shard_key(term: str) -> str:
+    """The shard a term is stored in: its first character if alphanumeric ASCII, else `_`."""
+    first = term[0]
+    return first if first.isascii() and first.isalnum() else "_"
+
+
+class IndexBuilder:
+    def __init__(self):
+        """
+        Collect an inverted index of headings, symbols and their text.
+
+        Every heading is one document. Headings written as `` `name` `` are
+        symbols, named after the enclosing symbols, e.g. `NTLog.configure`.
+        """
+        self.docs: List[list] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+
+    def add(self, file: str, content: str, anchor: Callable[[str], str]) -> None:
+        """
+        Index the headings of one documentation file.
+
+        Args:
+            file (str): The file, relative to the documentation directory.
+            content (str): Its Markdown.
+            anchor (Callable[[str], str]): Gives the anchor of a heading title.
+        """
+        symbols: List[Tuple[int, str]] = []
+        for level, title, body in split_headings(content):
+            symbols = [(lvl, name) for lvl, name in symbols if lvl < level]
+            match = _SYMBOL.match(title)
+            name = ""
+            if match:
+                symbols.append((level, match.group(1)))
+                name = ".".join(symbol for _, symbol in symbols)
+
+            doc_id = len(self.docs)
+            summary = _summary(body)
+            self.docs.append([title, file, anchor(title), "symbol" if name else "heading", name, summary[:160]])
+
+            weights: Dict[str, int] = {}
+            for term in terms(" ".join(body)):
+                weights[term] = min(weights.get(term, 0) + 1, MAX_BODY_WEIGHT)
+            for term in set(terms(f"{title} {name}")):
+                weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+            for term, weight in weights.items():
+                self.postings.setdefault(term, {})[doc_id] = weight
+
+    def write(self, out_dir: Path, manifest: Manifest, inputs: str) -> None:
+        """
+        Write the document table and one postings shard per leading character.
+
+        Postings are flat `[doc, weight, doc, weight, ...]` lists, so a lookup
+        reads one small shard. Files that did not change are not rewritten.
+
+        Args:
+            out_dir (Path): The search index directory.
+            manifest (Manifest): Records the written files.
+            inputs (str): Hash of the indexed files, recorded on the document table.
+        """
+        shards: Dict[str, Dict[str, List[int]]] = {}
+        for term in sorted(self.postings):
+            flat = [value for pair in sorted(self.postings[term].items()) for value in pair]
+            shards.setdefault(shard_key(term), {})[term] = flat
+
+        written = set()
+        for key, postings in shards.items():
+            path = out_dir / f"{key}.json"
+            manifest.write(path, json.dumps(postings, separators=(",", ":")), stage="search")
+            written.add(path)
+        meta = {"version": INDEX_VERSION, "shards": sorted(shards), "docs": self.docs}
+        meta_path = out_dir / "meta.json"
+        manifest.write(meta_path, json.dumps(meta, separators=(",", ":")), stage="search", inputs=inputs)
+        written.add(meta_path)
+
+        for stale in set(manifest.outputs("search")) - written:
+            manifest.forget(stale)
+
+
+def _summary(body: List[str]) -> str:
+    # First line of text outside code blocks
+    fenced = False
+    for line in body:
+        if line.startswith("```"):
+            fenced = not fenced
+        elif not fenced and line.strip():
+            return line.strip()
+    return ""
@@ -0,0 +1,399 @@
+import ast
+import hashlib
+import zipfile
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from ntdocs.base.public.models import ApiDoc
+
+NO_DOC = "*No docstring provided.*"
+# Module-level mapping of export names to the modules a PEP 562 `__getattr__` loads them from
+LAZY_EXPORTS = "_EXPORTS"
+# Decorators that turn a function into something inspect.isfunction rejects
+_SKIPPED_DECORATORS = {"property", "cached_property", "setter", "getter", "deleter"}
+
+Definition = Union[ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+class SourceTree:
+    def __init__(self, source: Path, pkg_name: str):
+        """
+        Read the modules of a package from a source directory or a wheel, without importing them.
+
+        Args:
+            source (Path): A wheel (`.whl`), the package directory, or a directory containing it.
+            pkg_name (str): The top-level package name.
+        """
+        self.pkg_name = pkg_name
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._root: Optional[Path] = None
+
+        source = Path(source)
+        if source.is_file() and zipfile.is_zipfile(source):
+            self._zip = zipfile.ZipFile(source)
+            self._names = set(self._zip.namelist())
+        elif source.is_dir():
+            self._root = source.parent if source.name == pkg_name and (source / "__init__.py").exists() else source
+        else:
+            raise FileNotFoundError(f"Package source not found: {source}")
+
+    def read(self, module: str) -> Optional[Tuple[str, bool]]:
+        """
+        Return the source of a module and whether it is a package.
+
+        Args:
+            module (str): Dotted module name, e.g. `ntexample.core.ntexample`.
+
+        Returns:
+            Optional[Tuple[str, bool]]: The source and True for an `__init__.py`, or None if not found.
+        """
+        base = module.replace(".", "/")
+        for path, is_package in ((f"{base}.py", False), (f"{base}/__init__.py", True)):
+            if self._zip is not None:
+                if path in self._names:
+                    return self._zip.read(path).decode("utf-8"), is_package
+            elif (self._root / path).is_file():
+                return (self._root / path).read_text(encoding="utf-8"), is_package
+        return None
+
+    def modules(self) -> List[str]:
+        """List the dotted names of every module of the package."""
+        if self._zip is not None:
+            paths = [name for name in self._names if name.startswith(f"{self.pkg_name}/") and name.endswith(".py")]
+        else:
+            paths = [p.relative_to(self._root).as_posix() for p in (self._root / self.pkg_name).rglob("*.py")]
+        names = []
+        for path in sorted(paths):
+            name = path[:-3].replace("/", ".")
+            names.append(name[:-len(".__init__")] if name.endswith(".__init__") else name)
+        return names
+
+    def fingerprint(self) -> str:
+        """Hash the paths and sources of every module, to tell whether the API may have changed."""
+        digest = hashlib.blake2b(digest_size=16)
+        for module in self.modules():
+            source, is_package = self.read(module)
+            digest.update(f"{module}:{is_package}\0".encode("utf-8"))
+            digest.update(source.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+
+
+class StaticExtractor:
+    def __init__(self, tree: SourceTree):
+        """
+        Resolve `__all__`, classes, functions, signatures and docstrings with `ast`.
+
+        Re-exports (`from .core.x import Name`, `import *`, aliases) are
+        followed within the package; names defined outside it are skipped.
+
+        Args:
+            tree (SourceTree): Where module sources are read from.
+        """
+        self.tree = tree
+        self._parsed: Dict[str, Optional[Tuple[ast.Module, bool]]] = {}
+
+    def parse(self, module: str) -> Optional[Tuple[ast.Module, bool]]:
+        """Parse a module once; returns its tree and whether it is a package, or None if not found."""
+        if module not in self._parsed:
+            found = self.tree.read(module)
+            self._parsed[module] = (ast.parse(found[0], filename=module), found[1]) if found else None
+        return self._parsed[module]
+
+    def exports(self, module: str) -> Optional[List[str]]:
+        """
+        Evaluate a module's `__all__` from its literal assignments.
+
+        Args:
+            module (str): Dotted module name.
+
+        Returns:
+            Optional[List[str]]: The exported names, or None if the module has no `__all__`.
+        """
+        parsed = self.parse(module)
+        if parsed is None:
+            return None
+        names: Optional[List[str]] = None
+        for node in _top_level(parsed[0]):
+            if isinstance(node, ast.Assign) and any(_is_name(t, "__all__") for t in node.targets):
+                names = _literal_names(node.value)
+            elif isinstance(node, ast.AnnAssign) and _is_name(node.target, "__all__") and node.value:
+                names = _literal_names(node.value)
+            elif isinstance(node, ast.AugAssign) and _is_name(node.target, "__all__"):
+                names = (names or []) + _literal_names(node.value)
+        return names
+
+    def resolve(self, module: str, name: str, depth: int = 0) -> Optional[Tuple[str, Definition]]:
+        """
+        Find where a name visible in a module is defined.
+
+        Args:
+            module (str): Dotted module name.
+            name (str): The name to resolve.
+            depth (int): Re-exports followed so far.
+
+        Returns:
+            Optional[Tuple[str, Definition]]: The defining module and node, or None.
+        """
+        parsed = self.parse(module)
+        if parsed is None or depth > 20:
+            return None
+        tree, is_package = parsed
+
+        found = None
+        for node in _top_level(tree):
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+                found = (module, node)
+            elif isinstance(node, ast.ImportFrom):
+                source = self._absolute(module, is_package, node)
+                if source is None:
+                    continue
+                for alias in node.names:
+                    if alias.name == "*":
+                        hit = self.resolve(source, name, depth + 1)
+                        found = hit or found
+                    elif (alias.asname or alias.name) == name:
+                        found = self.resolve(source, alias.name, depth + 1)
+            elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Name):
+                if any(_is_name(t, name) for t in node.targets):
+                    found = self.resolve(module, node.value.id, depth + 1)
+            elif isinstance(node, ast.Assign) and any(_is_name(t, LAZY_EXPORTS) for t in node.targets):
+                # PEP 562 lazy exports: `_EXPORTS = {"Name": ".core.module"}`, loaded by `__getattr__`
+                target = _lazy_target(node.value, name)
+                if target is not None:
+                    source = self._relative(module, is_package, len(target) - len(target.lstrip(".")),
+                                            target.lstrip(".") or None)
+                    if source is not None:
+                        found = self.resolve(source, name, depth + 1)
+        return found
+
+    def api(self, module: str, node: Definition, name: Optional[str] = None) -> ApiDoc:
+        """
+        Describe a class and its public methods, or a function.
+
+        Args:
+            module (str): The module defining the node.
+            node (Definition): The class or function definition.
+            name (Optional[str]): The exported name, if it differs from the definition's.
+
+        Returns:
+            ApiDoc: The documentation of the symbol.
+        """
+        name = name or node.name
+        if not isinstance(node, ast.ClassDef):
+            return ApiDoc(name=name, kind="function", signature=signature(node),
+                          doc=ast.get_docstring(node) or NO_DOC)
+
+        api = ApiDoc(name=name, kind="class", doc=ast.get_docstring(node) or "")
+        members: Dict[str, ApiDoc] = {}
+        # Inherited methods first, so the class's own definitions override them
+        for base in node.bases:
+            if isinstance(base, ast.Name) and base.id != "object":
+                resolved = self.resolve(module, base.id)
+                if resolved is not None and isinstance(resolved[1], ast.ClassDef):
+                    members.update(self.api(*resolved).members)
+        for child in node.body:
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) or child.name.startswith("_"):
+                continue
+            if any(_decorator_name(d) in _SKIPPED_DECORATORS for d in child.decorator_list):
+                continue
+            # Like inspect.getdoc, fall back to the overridden method's docstring
+            inherited = members.get(child.name)
+            doc = ast.get_docstring(child) or (inherited.doc if inherited else NO_DOC)
+            members[child.name] = ApiDoc(name=child.name, kind="function", signature=signature(child), doc=doc)
+        # inspect.getmembers lists members alphabetically
+        api.members = dict(sorted(members.items()))
+        return api
+
+    def _absolute(self, module: str, is_package: bool, node: ast.ImportFrom) -> Optional[str]:
+        return self._relative(module, is_package, node.level, node.module)
+
+    def _relative(self, module: str, is_package: bool, level: int, target: Optional[str]) -> Optional[str]:
+        # Resolve `from <level dots><target> import ...` as seen from `module`
+        if level == 0:
+            target = target or ""
+            return target if target.split(".")[0] == self.tree.pkg_name else None
+        package = module.split(".") if is_package else module.split(".")[:-1]
+        if level > 1:
+            package = package[:-(level - 1)]
+        return ".".join(package + ([target] if target else []))
+
+
+def signature(node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> str:
+    """
+    Render a function's signature from its definition, e.g. `add(self, proxy: ProxyModel) -> bool`.
+
+    Args:
+        node (Union[ast.FunctionDef, ast.AsyncFunctionDef]): The definition.
+
+    Returns:
+        str: The signature, prefixed with `async` for coroutines.
+    """
+    text = f"{node.name}({_format_arguments(node.args)})"
+    if node.returns is not None:
+        text += f" -> {ast.unparse(node.returns)}"
+    # A decorated coroutine such as an asynccontextmanager is not awaited itself
+    if isinstance(node, ast.AsyncFunctionDef) and not node.decorator_list:
+        return f"async {text}"
+    return text
+
+
+def _format_arguments(args: ast.arguments) -> str:
+    # Spaced like inspect.signature: `a: int = 1`, `b=2`
+    def one(arg: ast.arg, default: Optional[ast.expr] = None, prefix: str = "") -> str:
+        text = prefix + arg.arg
+        if arg.annotation is not None:
+            text += f": {ast.unparse(arg.annotation)}"
+        if default is not None:
+            text += f" = {ast.unparse(default)}" if arg.annotation is not None else f"={ast.unparse(default)}"
+        return text
+
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    parts = [one(arg, default) for arg, default in zip(positional, defaults)]
+    if args.posonlyargs:
+        parts.insert(len(args.posonlyargs), "/")
+    if args.vararg is not None:
+        parts.append(one(args.vararg, prefix="*"))
+    elif args.kwonlyargs:
+        parts.append("*")
+    parts += [one(arg, default) for arg, default in zip(args.kwonlyargs, args.kw_defaults)]
+    if args.kwarg is not None:
+        parts.append(one(args.kwarg, prefix="**"))
+    return ", ".join(parts)
+
+
+def extract(source: Path, pkg_name: str) -> Optional[List[ApiDoc]]:
+    """
+    Describe every symbol in a package's `__all__` without importing it.
+
+    Args:
+        source (Path): A wheel, the package directory, or a directory containing it.
+        pkg_name (str): The top-level package name.
+
+    Returns:
+        Optional[List[ApiDoc]]: One entry per resolvable symbol, or None if the package has no `__all__`.
+    """
+    tree = SourceTree(source, pkg_name)
+    try:
+        extractor = StaticExtractor(tree)
+        names = extractor.exports(pkg_name)
+        if names is None:
+            return None
+        apis = []
+        for name in names:
+            resolved = extractor.resolve(pkg_name, name)
+            if resolved is not None:
+                apis.append(extractor.api(*resolved, name=name))
+        return apis
+    finally:
+        tree.close()
+
+
+def module_symbols(source: Path, pkg_name: str) -> Dict[str, List[str]]:
+    """
+    List the public names of every module of a package without importing it.
+
+    Args:
+        source (Path): A wheel, the package directory, or a directory containing it.
+        pkg_name (str): The top-level package name.
+
+    Returns:
+        Dict[str, List[str]]: Per dotted module name, its `__all__`, or else the
+            public classes and functions it defines.
+    """
+    tree = SourceTree(source, pkg_name)
+    try:
+        return _module_names(StaticExtractor(tree))
+    finally:
+        tree.close()
+
+
+def module_apis(source: Path, pkg_name: str) -> Dict[str, List[ApiDoc]]:
+    """
+    Describe the classes and functions every module of a package defines, without importing it.
+
+    Args:
+        source (Path): A wheel, the package directory, or a directory containing it.
+        pkg_name (str): The top-level package name.
+
+    Returns:
+        Dict[str, List[ApiDoc]]: Per dotted module name, its public names that it
+            defines itself; re-exported names are described under their own module.
+    """
+    tree = SourceTree(source, pkg_name)
+    try:
+        extractor = StaticExtractor(tree)
+        apis: Dict[str, List[ApiDoc]] = {}
+        for module, names in _module_names(extractor).items():
+            apis[module] = []
+            for name in names:
+                resolved = extractor.resolve(module, name)
+                if resolved is not None and resolved[0] == module:
+                    apis[module].append(extractor.api(*resolved, name=name))
+        return apis
+    finally:
+        tree.close()
+
+
+def _module_names(extractor: StaticExtractor) -> Dict[str, List[str]]:
+    symbols = {}
+    for module in extractor.tree.modules():
+        names = extractor.exports(module)
+        if names is None:
+            names = [
+                node.name for node in _top_level(extractor.parse(module)[0])
+                if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+                and not node.name.startswith("_")
+            ]
+        symbols[module] = names
+    return symbols
+
+
+def _top_level(tree: ast.Module):
+    # Module body, including definitions under top-level if/try blocks
+    stack = list(reversed(tree.body))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.If, ast.Try)):
+            nested = node.body + node.orelse + getattr(node, "finalbody", [])
+            for handler in getattr(node, "handlers", []):
+                nested += handler.body
+            stack.extend(reversed(nested))
+        else:
+            yield node
+
+
+def _lazy_target(node: ast.AST, name: str) -> Optional[str]:
+    # The module a lazy export mapping loads `name` from
+    if not isinstance(node, ast.Dict):
+        return None
+    for key, value in zip(node.keys, node.values):
+        if isinstance(key, ast.Constant) and key.value == name:
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                return value.value
+    return None
+
+
+def _is_name(node: ast.AST, name: str) -> bool:
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def _literal_names(node: ast.AST) -> List[str]:
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError):
+        return []
+    return [item for item in value if isinstance(item, str)] if isinstance(value, (list, tuple)) else []
+
+
+def _decorator_name(node: ast.AST) -> str:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return node.id if isinstance(node, ast.Name) else ""
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+@dataclass
+class ApiDoc:
+    name: str
+    kind: str
+    signature: str = ""
+    doc: str = ""
+    members: Dict[str, "ApiDoc"] = field(default_factory=dict)
+
+    KINDS = ['class', 'function']
+
+    def __post_init__(self):
+        if self.kind not in self.KINDS:
+            raise ValueError(f"Unsupported API kind: {self.kind}")
+
+
+@dataclass
+class PackageDoc:
+    name: str
+    symbols: List[str] = field(default_factory=list)
+    modules: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class SearchHit:
+    title: str
+    file: str
+    anchor: str
+    kind: str
+    name: str = ""
+    summary: str = ""
+    score: int = 0
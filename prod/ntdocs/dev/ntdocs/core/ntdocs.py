@@ -1,18 +1,56 @@
 import importlib
 import inspect
-import re
+import json
+import os
+import pkgutil
+import shutil
 
-from importlib.util import module_from_spec
+from html import escape
+from importlib import metadata
+from importlib.util import find_spec, module_from_spec
 from sys import modules
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
+from ntdocs.base.private.html import NAV_SCRIPT, PAGE, RENDER_VERSION, render_markdown
+from ntdocs.base.private.markdown import Slugger, file_headings, slugify, toc_entries, toc_line
+from ntdocs.base.private.search import SEARCH_DIR, IndexBuilder
+from ntdocs.base.private.manifest import Manifest, content_hash, file_hash
+from ntdocs.base.private.static import NO_DOC, SourceTree, extract, module_apis, module_symbols
+from ntdocs.base.public.models import ApiDoc
+
+TOC_TITLE = "Table of Contents"
+COPY_CHUNK = 1 << 20
+HTML_DIR = "html"
+SUBMODULES_DIR = "submodules"
+# Part of the module pages' fingerprint: bump it when build_modules or the
+# extractor write pages differently, so sources that did not change are read again
+PAGES_VERSION = 1
+
 
 class NTDocs:
-    def __init__(self, pkg_name: str, save_dir: Path):
+    def __init__(self, pkg_name: str, save_dir: Path, source: Optional[Path] = None, static: bool = False):
+        """
+        Build documentation for a package.
+
+        Builds are incremental: a manifest in `docs_dir` records the inputs of
+        every generated file, and files whose inputs did not change are left
+        untouched, mtimes included.
+
+        Args:
+            pkg_name (str): The package to document.
+            save_dir (Path): Directory the `documentations` folder is written to.
+            source (Optional[Path]): A wheel, the package directory, or a directory containing it;
+                implies `static`.
+            static (bool): Read the API with `ast` instead of importing the package. Without
+                `source`, the installed package is located but not executed.
+        """
         self.pkg_name = pkg_name
         self.docs_dir = save_dir / "documentations"
+        self.source = Path(source) if source else None
+        self.static = static or source is not None
         self.templates: Dict[str, Dict[str, str]] = {}
+        self.manifest = Manifest(self.docs_dir)
 
         self.release_order = [
             "technical/index.md",
@@ -42,104 +80,401 @@ class NTDocs:
         self.templates[name] = tree
 
     def build_templates(self):
-        """Generate the documentation files from templates."""
+        """Generate the documentation files from templates; unchanged files are not rewritten."""
+        generated = set()
         for section, files in self.templates.items():
             section_dir = self.docs_dir / section
             section_dir.mkdir(parents=True, exist_ok=True)
 
             for filename, content in files.items():
                 file_path = section_dir / filename
-                file_path.write_text(content, encoding="utf-8")
+                self.manifest.write(file_path, content, stage="templates")
+                generated.add(file_path)
+
+        for stale in set(self.manifest.outputs("templates")) - generated:
+            self.manifest.forget(stale)
+        self.manifest.save()
 
     def build_modules(self):
         """Extract public classes/functions from symbols in __all__ and write docs."""
+        # In static mode the pages depend only on the package sources, so an
+        # unchanged source with intact pages skips extraction entirely
+        fingerprint = self._fingerprint() if self.static else None
+        if fingerprint is not None and self.manifest.source(self.pkg_name) == fingerprint \
+                and self.manifest.intact("modules"):
+            return
+
+        apis = self._collect_static() if self.static else self._collect_imported()
+        if apis is None:
+            return
+
+        modules: Dict[str, Dict[str, ApiDoc]] = {}
+        for api in apis:
+            public_members = api.members if api.kind == "class" else {api.name: api}
+            if public_members:
+                modules[api.name] = public_members
+
+        # Generate Markdown files
+        module_docs_dir = self.docs_dir / "modules"
+        module_docs_dir.mkdir(parents=True, exist_ok=True)
+
+        generated = set()
+        for modname, contents in modules.items():
+            doc_lines = [f"## `{modname}`\n"]
+            for symbol, member in contents.items():
+                doc_lines.append(f"### `{symbol}`\n\n{_signature_block(member)}{member.doc}\n")
+            doc_text = "\n".join(doc_lines)
+
+            doc_path = module_docs_dir / f"{modname}.md"
+            self.manifest.write(doc_path, doc_text, stage="modules")
+            generated.add(doc_path)
+
+        # Pages of symbols no longer exported
+        for stale in set(self.manifest.outputs("modules")) - generated:
+            self.manifest.forget(stale)
+        if fingerprint is not None:
+            self.manifest.set_source(self.pkg_name, fingerprint)
+        self.manifest.save()
+
+    def build_submodules(self) -> Dict[str, List[str]]:
+        """
+        Write a page for every module of the package to `submodules/<module>.md`; unchanged pages are not rewritten.
+
+        A page documents the classes and functions the module defines, and
+        links the names it re-exports to the page of the module defining them.
+
+        Returns:
+            Dict[str, List[str]]: The public names of every module, by dotted name.
+        """
+        collected = self._collect_modules_static() if self.static else self._collect_modules_imported()
+        if collected is None:
+            return {}
+        symbols, apis = collected
+
+        owners: Dict[str, str] = {}
+        for module, defined in apis.items():
+            for api in defined:
+                owners.setdefault(api.name, module)
+
+        pages_dir = self.docs_dir / SUBMODULES_DIR
+        pages_dir.mkdir(parents=True, exist_ok=True)
+        generated = set()
+        for module, names in symbols.items():
+            doc_lines = [f"## `{module}`\n"]
+            doc_lines.extend(_api_section(api) for api in apis.get(module, []))
+            reexported = [name for name in names if owners.get(name, module) != module]
+            if reexported:
+                links = ", ".join(f"[`{name}`]({owners[name]}.md)" for name in reexported)
+                doc_lines.append(f"Re-exports {links}.\n")
+
+            page = pages_dir / f"{module}.md"
+            self.manifest.write(page, "\n".join(doc_lines), stage="submodules")
+            generated.add(page)
+
+        for stale in set(self.manifest.outputs("submodules")) - generated:
+            self.manifest.forget(stale)
+        self.manifest.save()
+        return symbols
+
+    def _collect_modules_static(self) -> Optional[Tuple[Dict[str, List[str]], Dict[str, List[ApiDoc]]]]:
+        source = self._static_source()
+        if source is None:
+            print(f"Error locating {self.pkg_name}: package not found")
+            return None
+        try:
+            return module_symbols(source, self.pkg_name), module_apis(source, self.pkg_name)
+        except (OSError, SyntaxError) as e:
+            print(f"Error reading modules of {self.pkg_name} from {source}: {e}")
+            return None
+
+    def _collect_modules_imported(self) -> Optional[Tuple[Dict[str, List[str]], Dict[str, List[ApiDoc]]]]:
+        try:
+            package = importlib.import_module(self.pkg_name)
+        except ImportError as e:
+            print(f"Error importing {self.pkg_name}: {e}")
+            return None
+
+        found = [package]
+        if hasattr(package, "__path__"):
+            for info in pkgutil.walk_packages(package.__path__, prefix=f"{self.pkg_name}.", onerror=lambda _: None):
+                try:
+                    found.append(importlib.import_module(info.name))
+                except Exception as e:
+                    print(f"Error importing {info.name}: {e}")
+
+        symbols: Dict[str, List[str]] = {}
+        apis: Dict[str, List[ApiDoc]] = {}
+        for module in sorted(found, key=lambda m: m.__name__):
+            names = symbols[module.__name__] = _public_names(module)
+            # Only what the module defines; re-exports are described where they are defined
+            defined = (
+                (name, getattr(module, name, None)) for name in names
+                if getattr(getattr(module, name, None), "__module__", None) == module.__name__
+            )
+            apis[module.__name__] = [api for api in (self._object_api(name, obj) for name, obj in defined) if api]
+        return symbols, apis
+
+    def _static_source(self) -> Optional[Path]:
+        if self.source is not None:
+            return self.source
+        # Locating a top-level package does not execute it
+        spec = find_spec(self.pkg_name)
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        return Path(list(spec.submodule_search_locations)[0])
+
+    def _fingerprint(self) -> Optional[str]:
+        source = self._static_source()
+        if source is None:
+            return None
+        try:
+            tree = SourceTree(source, self.pkg_name)
+        except OSError:
+            return None
+        try:
+            # An upgraded ntdocs may render the same sources differently
+            return content_hash(tree.fingerprint(), str(PAGES_VERSION), _ntdocs_version())
+        except (OSError, UnicodeDecodeError):
+            return None
+        finally:
+            tree.close()
+
+    def _collect_static(self) -> Optional[List[ApiDoc]]:
+        source = self._static_source()
+        if source is None:
+            print(f"Error locating {self.pkg_name}: package not found")
+            return None
+
+        try:
+            apis = extract(source, self.pkg_name)
+        except (OSError, SyntaxError) as e:
+            print(f"Error reading {self.pkg_name} from {source}: {e}")
+            return None
+        if apis is None:
+            print(f"Module {self.pkg_name} has no __all__ attribute.")
+        return apis
+
+    def _collect_imported(self) -> Optional[List[ApiDoc]]:
         try:
             top_module = importlib.import_module(self.pkg_name)
         except ImportError as e:
             print(f"Error importing {self.pkg_name}: {e}")
-            return
+            return None
 
         if not hasattr(top_module, "__all__"):
             print(f"Module {self.pkg_name} has no __all__ attribute.")
-            return
+            return None
 
-        modules: Dict[str, Dict[str, str]] = {}
+        apis: List[ApiDoc] = []
 
         for symbol_name in top_module.__all__:
             try:
                 obj = getattr(top_module, symbol_name)
             except AttributeError:
                 continue
+            api = self._object_api(symbol_name, obj)
+            if api is not None:
+                apis.append(api)
 
-            public_members = {}
+        return apis
 
-            # For classes: include public methods
-            if inspect.isclass(obj):
-                for name, member in inspect.getmembers(obj):
-                    if name.startswith("_"):
-                        continue
-                    if inspect.isfunction(member) or inspect.ismethod(member):
-                        doc = inspect.getdoc(member) or "*No docstring provided.*"
-                        public_members[name] = doc
+    def _object_api(self, name: str, obj) -> Optional[ApiDoc]:
+        # For classes: include public methods
+        if inspect.isclass(obj):
+            api = ApiDoc(name=name, kind="class", doc=inspect.getdoc(obj) or "")
+            for member_name, member in inspect.getmembers(obj):
+                if member_name.startswith("_"):
+                    continue
+                if inspect.isfunction(member) or inspect.ismethod(member):
+                    api.members[member_name] = self._function_api(member_name, member)
+            return api
+        # For functions directly in __all__
+        if inspect.isfunction(obj):
+            return self._function_api(name, obj)
+        return None
 
-            # For functions directly in __all__
-            elif inspect.isfunction(obj):
-                doc = inspect.getdoc(obj) or "*No docstring provided.*"
-                public_members[symbol_name] = doc
+    def _function_api(self, name: str, func) -> ApiDoc:
+        try:
+            signature = f"{name}{inspect.signature(func)}"
+        except (TypeError, ValueError):
+            signature = ""
+        if inspect.iscoroutinefunction(func):
+            signature = f"async {signature}"
+        return ApiDoc(name=name, kind="function", signature=signature, doc=inspect.getdoc(func) or NO_DOC)
 
-            if public_members:
-                modules[symbol_name] = public_members
+    def build_release(self):
+        """
+        Assemble `release.md` from the sections in `release_order`, with a table of contents.
 
-        # Generate Markdown files
-        module_docs_dir = self.docs_dir / "modules"
-        module_docs_dir.mkdir(parents=True, exist_ok=True)
+        The release is written in two passes so memory does not grow with the
+        documentation: section headers are streamed into the table of
+        contents, then section files are copied in chunks. Repeated headers
+        get GitHub-style anchors: `#init`, `#init-1`, ...
+        """
+        sections = self._release_sections()
+        inputs = self._release_inputs(sections)
 
-        for modname, contents in modules.items():
-            doc_lines = [f"## `{modname}`\n"]
-            for symbol, docstring in contents.items():
-                doc_lines.append(f"### `{symbol}`\n\n{docstring}\n")
-            doc_text = "\n".join(doc_lines)
+        release_path = self.docs_dir / "release.md"
+        if not self.manifest.up_to_date(release_path, inputs):
+            slugger = Slugger(TOC_TITLE)
+            tmp_path = release_path.with_name(f".{release_path.name}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                out.write(f"# {TOC_TITLE}\n")
+                for path in sections:
+                    out.write("".join(
+                        "\n" + toc_line(level, title, slugger.slug(title)) for level, title in file_headings(path)
+                    ))
+                out.write("\n\n")
+                out.flush()
+                for i, path in enumerate(sections):
+                    if i:
+                        out.write("\n\n")
+                        out.flush()
+                    with open(path, "rb") as section:
+                        shutil.copyfileobj(section, out.buffer, COPY_CHUNK)
+            os.replace(tmp_path, release_path)
+            self.manifest.record(release_path, stage="release", inputs=inputs)
 
-            doc_path = module_docs_dir / f"{modname}.md"
-            doc_path.write_text(doc_text, encoding="utf-8")
+        self._build_search(sections, inputs)
+        self.manifest.save()
 
-    def build_release(self):
-        release_lines = []
-        toc_lines = ["# Table of Contents\n"]
-        modules_dir = self.docs_dir / "modules"
+    def build_search(self):
+        """Write the search index of the release sections to `search/`; see `SearchIndex`."""
+        sections = self._release_sections()
+        self._build_search(sections, self._release_inputs(sections))
+        self.manifest.save()
+
+    def _build_search(self, sections: List[Path], inputs: str):
+        search_dir = self.docs_dir / SEARCH_DIR
+        if self.manifest.up_to_date(search_dir / "meta.json", inputs) and self.manifest.intact("search"):
+            return
+        # Anchors point into release.md, so they are numbered across all sections
+        slugger = Slugger(TOC_TITLE)
+        builder = IndexBuilder()
+        for path in sections:
+            builder.add(path.relative_to(self.docs_dir).as_posix(), path.read_text(encoding="utf-8"),
+                        anchor=slugger.slug)
+        builder.write(search_dir, self.manifest, inputs)
+
+    def build_html(self, keep_stale: int = 64):
+        """
+        Render the release sections to HTML pages in `html/`, with a navigation built from their headers.
+
+        Pages are named after a hash of their content, e.g.
+        `modules-NTLog.3f2a9c1b7e4d.html`, so they can be served with long
+        cache lifetimes, and a page is only rendered when its section
+        changed: the manifest remembers each section's page and navigation,
+        so an unchanged section is neither read nor rendered again. The
+        navigation lives in `nav.js` and the entry point in `index.html`;
+        both keep their names and should be served uncached.
 
+        Args:
+            keep_stale (int): Pages of earlier builds to keep for clients still
+                linking to them; the ones replaced longest ago are deleted first.
+        """
+        html_dir = self.docs_dir / HTML_DIR
+        html_dir.mkdir(parents=True, exist_ok=True)
+        sections = self._release_sections()
+        self._release_inputs(sections)
+
+        nav = []
+        for path in sections:
+            fragment = self.manifest.fragment(path)
+            name = path.relative_to(self.docs_dir).with_suffix("").as_posix().replace("/", "-")
+            digest = content_hash(fragment["hash"], self.pkg_name, str(RENDER_VERSION))[:12]
+            page = html_dir / f"{name}.{digest}.html"
+
+            if fragment.get("page") != page.name or not page.exists():
+                body, headings = render_markdown(path.read_text(encoding="utf-8"))
+                if not page.exists():
+                    title = headings[0][1].replace("`", "") if headings else name
+                    page.write_text(
+                        PAGE.format(title=escape(title), package=escape(self.pkg_name), body=body),
+                        encoding="utf-8",
+                    )
+                # Pages list their first three header levels in the navigation
+                fragment = self.manifest.set_fragment(
+                    path, hash=fragment["hash"], page=page.name,
+                    nav=[[level, title.replace("`", ""), anchor] for level, title, anchor in headings if level <= 3],
+                )
+            nav.append({"href": page.name, "headings": fragment["nav"]})
+
+        self.manifest.write(html_dir / "nav.js", NAV_SCRIPT.format(nav=json.dumps(nav)), stage="html")
+        index = '<!DOCTYPE html>\n<meta charset="utf-8">\n'
+        if nav:
+            index += f'<meta http-equiv="refresh" content="0; url={nav[0]["href"]}">\n'
+        self.manifest.write(html_dir / "index.html", index, stage="html")
+
+        current = [entry["href"] for entry in nav]
+        present = [p.name for p in html_dir.glob("*.*.html")]
+        for stale in self.manifest.retire(current, present, keep=keep_stale):
+            (html_dir / stale).unlink(missing_ok=True)
+        self.manifest.save()
+
+    def _release_inputs(self, sections: List[Path]) -> str:
+        # Each section's hash is cached while its file is unchanged, so an
+        # up-to-date release costs one stat per section
+        fragments = []
+        for path in sections:
+            fragment = self.manifest.fragment(path)
+            if fragment is None:
+                fragment = self.manifest.set_fragment(path, hash=file_hash(path))
+            fragments.append(fragment)
+
+        return content_hash(*(
+            f"{path.relative_to(self.docs_dir).as_posix()}:{fragment['hash']}"
+            for path, fragment in zip(sections, fragments)
+        ))
+
+    def _release_sections(self) -> List[Path]:
+        sections = []
+        modules_dir = self.docs_dir / "modules"
         for item in self.release_order:
             if item == "modules/<ALL_MODULES>":
-                all_mod_files = sorted(
+                sections.extend(sorted(
                     f for f in modules_dir.glob("*.md")
                     if f.name != "technical_details.md"
-                )
-                for f in all_mod_files:
-                    content = f.read_text()
-                    release_lines.append(content)
-                    toc_lines.extend(self._extract_headers_for_toc(content))
+                ))
             else:
                 fpath = self.docs_dir / item
                 if fpath.exists():
-                    content = fpath.read_text()
-                    release_lines.append(content)
-                    toc_lines.extend(self._extract_headers_for_toc(content))
-
-        toc = "\n".join(toc_lines)
-        full_release = toc + "\n\n" + "\n\n".join(release_lines)
-        (self.docs_dir / "release.md").write_text(full_release, encoding="utf-8")
+                    sections.append(fpath)
+        return sections
 
     def _extract_headers_for_toc(self, content: str) -> list[str]:
         """Extract Markdown headers and convert them to TOC links."""
-        toc_entries = []
-        for line in content.splitlines():
-            match = re.match(r"^(#{1,6})\s+(.*)", line)
-            if match:
-                level, title = match.groups()
-                indent = "  " * (len(level) - 1)
-                slug = self._slugify(title)
-                toc_entries.append(f"{indent}- [{title}](#{slug})")
-        return toc_entries
-    
+        return toc_entries(content)
+
     def _slugify(self, text: str) -> str:
-        return re.sub(r"[^\w]+", "-", text.strip().lower()).strip("-")
+        return slugify(text)
+
+
+def _ntdocs_version() -> str:
+    try:
+        return metadata.version("ntdocs")
+    except metadata.PackageNotFoundError:
+        # Run from a source checkout
+        return "source"
+
+
+def _signature_block(api: ApiDoc) -> str:
+    return f"```python\n{api.signature}\n```\n\n" if api.signature else ""
+
+
+def _api_section(api: ApiDoc) -> str:
+    # A function, or a class with its docstring and methods, under a module heading
+    if api.kind == "function":
+        return f"### `{api.name}`\n\n{_signature_block(api)}{api.doc}\n"
+    lines = [f"### `{api.name}`\n"] + ([f"{api.doc}\n"] if api.doc else [])
+    lines.extend(f"#### `{name}`\n\n{_signature_block(member)}{member.doc}\n" for name, member in api.members.items())
+    return "\n".join(lines)
+
+
+def _public_names(module) -> List[str]:
+    if hasattr(module, "__all__"):
+        return [name for name in module.__all__ if isinstance(name, str)]
+    return [
+        name for name, obj in vars(module).items()
+        if not name.startswith("_") and (inspect.isclass(obj) or inspect.isfunction(obj))
+        and getattr(obj, "__module__", None) == module.__name__
+    ]
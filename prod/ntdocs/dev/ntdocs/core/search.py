@@ -0,0 +1,88 @@
+import json
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from ntdocs.base.private.search import INDEX_VERSION, SEARCH_DIR, shard_key, terms
+from ntdocs.base.public.models import SearchHit
+
+
+class SearchIndex:
+    def __init__(self, docs_dir: Path):
+        """
+        Query the search index NTDocs writes next to the documentation.
+
+        Only the document table and the shards of the queried terms are
+        read, so a lookup does not depend on the size of the Markdown.
+
+        Args:
+            docs_dir (Path): The `documentations` directory of a build.
+
+        Raises:
+            FileNotFoundError: If the directory has no search index.
+            ValueError: If the index was written by an incompatible version.
+        """
+        self.dir = Path(docs_dir) / SEARCH_DIR
+        meta_path = self.dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Search index not found: {meta_path}")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported search index version: {meta.get('version')}")
+        self.docs: List[list] = meta["docs"]
+        self._shard_keys = set(meta["shards"])
+        self._shards: Dict[str, Dict[str, List[int]]] = {}
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """
+        Find the headings and symbols matching every term of a query.
+
+        The last term also matches as a prefix unless the query ends with a
+        space, so `conf` finds `configure`. Hits in headings and symbol names
+        rank above hits in the text.
+
+        Args:
+            query (str): Words or identifiers, e.g. `NTLog configure`.
+            limit (int): Maximum number of hits.
+
+        Returns:
+            List[SearchHit]: The best hits first.
+        """
+        wanted = list(dict.fromkeys(terms(query)))
+        if not wanted:
+            return []
+
+        scores: Optional[Dict[int, int]] = None
+        for i, term in enumerate(wanted):
+            prefix = i == len(wanted) - 1 and not query[-1].isspace()
+            matched = self._postings(term, prefix)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {doc: score + matched[doc] for doc, score in scores.items() if doc in matched}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [self._hit(doc, score) for doc, score in ranked]
+
+    def _postings(self, term: str, prefix: bool) -> Dict[int, int]:
+        shard = self._shard(shard_key(term))
+        lists = [postings for key, postings in shard.items() if key.startswith(term)] if prefix \
+            else [shard.get(term, [])]
+        matched: Dict[int, int] = {}
+        for flat in lists:
+            for doc, weight in zip(flat[::2], flat[1::2]):
+                # Count a document once per query term, by its best matching word
+                if weight > matched.get(doc, 0):
+                    matched[doc] = weight
+        return matched
+
+    def _shard(self, key: str) -> Dict[str, List[int]]:
+        if key not in self._shards:
+            path = self.dir / f"{key}.json"
+            self._shards[key] = json.loads(path.read_text(encoding="utf-8")) if key in self._shard_keys else {}
+        return self._shards[key]
+
+    def _hit(self, doc: int, score: int) -> SearchHit:
+        title, file, anchor, kind, name, summary = self.docs[doc]
+        return SearchHit(title=title, file=file, anchor=anchor, kind=kind, name=name, summary=summary, score=score)
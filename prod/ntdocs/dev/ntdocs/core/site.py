@@ -0,0 +1,133 @@
+import os
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from ntdocs.base.private.manifest import Manifest
+from ntdocs.base.private.markdown import Slugger, toc_entries
+from ntdocs.base.public.models import PackageDoc
+from ntdocs.core.ntdocs import SUBMODULES_DIR, TOC_TITLE, NTDocs
+
+# Headings that can go one level deeper; a six-level heading stays as it is
+_DEMOTED = re.compile(r"#{1,5}\s")
+
+
+class NTDocsSite:
+    def __init__(self, packages: Union[List[str], Dict[str, Optional[Path]]], save_dir: Path,
+                 static: bool = False, max_workers: Optional[int] = None):
+        """
+        Build documentation for several packages in parallel, with a shared index and release.
+
+        Every package is documented by its own `NTDocs` under
+        `save_dir/<package>/documentations`, in a separate process, with a
+        page per module in `submodules/` and its release rendered to `html/`;
+        the site index and the combined release go to `save_dir/documentations`.
+
+        Args:
+            packages (Union[List[str], Dict[str, Optional[Path]]]): Package names, or package
+                names mapped to their source (a wheel or directory, read statically).
+            save_dir (Path): Directory the package folders and the site `documentations` are written to.
+            static (bool): Read every package with `ast` instead of importing it.
+            max_workers (Optional[int]): Worker processes; defaults to one per CPU, at most one per package.
+        """
+        sources = packages if isinstance(packages, dict) else dict.fromkeys(packages)
+        self.packages: Dict[str, Optional[Path]] = {
+            name: Path(source) if source else None for name, source in sources.items()
+        }
+        self.save_dir = Path(save_dir)
+        self.docs_dir = self.save_dir / "documentations"
+        self.static = static
+        self.max_workers = max_workers or min(len(self.packages), os.cpu_count() or 1) or 1
+        self.manifest = Manifest(self.docs_dir)
+
+    def package_docs(self, name: str) -> NTDocs:
+        """Return the `NTDocs` that documents one package of the site."""
+        return NTDocs(name, self.save_dir / name, source=self.packages[name], static=self.static)
+
+    def build(self) -> List[PackageDoc]:
+        """
+        Document every package, then write the site index and release.
+
+        Returns:
+            List[PackageDoc]: The packages that were documented, in the order given.
+        """
+        jobs = [(name, self.save_dir, source, self.static) for name, source in self.packages.items()]
+        if self.max_workers == 1:
+            packages = [_build_package(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                packages = list(executor.map(_build_package, *zip(*jobs)))
+
+        self.build_index(packages)
+        self.build_release(packages)
+        self.manifest.save()
+        return packages
+
+    def build_index(self, packages: List[PackageDoc]):
+        """Write `index.md`, listing every package's symbols and modules with links to their pages."""
+        # A name defined in one package and re-exported by another links to its page
+        owners: Dict[str, str] = {}
+        for package in packages:
+            for symbol in package.symbols:
+                owners.setdefault(symbol, package.name)
+
+        def link(symbol: str, package: PackageDoc) -> str:
+            owner = package.name if symbol in package.symbols else owners.get(symbol)
+            if owner is None:
+                return f"`{symbol}`"
+            return f"[`{symbol}`](../{owner}/documentations/modules/{symbol}.md)"
+
+        lines = ["# Packages\n"]
+        for package in packages:
+            lines.append(f"## `{package.name}`\n")
+            lines.extend(f"- {link(symbol, package)}" for symbol in package.symbols)
+            if package.modules:
+                lines.append("\n### Modules\n")
+                for module, names in package.modules.items():
+                    listed = ", ".join(link(name, package) for name in names)
+                    page = f"../{package.name}/documentations/{SUBMODULES_DIR}/{module}.md"
+                    lines.append(f"- [`{module}`]({page})" + (f": {listed}" if listed else ""))
+            lines.append("")
+        self.manifest.write(self.docs_dir / "index.md", "\n".join(lines), stage="site")
+
+    def build_release(self, packages: List[PackageDoc]):
+        """Write `release.md`: a table of contents, the index, then every package's sections under its own heading."""
+        body = [(self.docs_dir / "index.md").read_text()]
+        for package in packages:
+            sections = self.package_docs(package.name)._release_sections()
+            body.append(f"# `{package.name}`")
+            body.extend(_demote(section.read_text()) for section in sections)
+
+        slugger = Slugger(TOC_TITLE)
+        toc_lines = [f"# {TOC_TITLE}\n"]
+        for content in body:
+            toc_lines.extend(toc_entries(content, slugger))
+        release = "\n".join(toc_lines) + "\n\n" + "\n\n".join(body)
+        self.manifest.write(self.docs_dir / "release.md", release, stage="site")
+
+
+def _build_package(name: str, save_dir: Path, source: Optional[Path], static: bool) -> PackageDoc:
+    # Runs in a worker process: build one package's pages, including one per module
+    docs = NTDocs(name, save_dir / name, source=source, static=static)
+    docs.build_templates()
+    docs.build_modules()
+    docs.build_release()
+    docs.build_html()
+
+    package = PackageDoc(name=name, symbols=sorted(p.stem for p in docs.manifest.outputs("modules")))
+    package.modules = docs.build_submodules()
+    return package
+
+
+def _demote(content: str) -> str:
+    # Nest a package's headings one level under its own, leaving code blocks alone
+    lines = []
+    fenced = False
+    for line in content.splitlines():
+        if line.startswith("```"):
+            fenced = not fenced
+        elif not fenced and _DEMOTED.match(line):
+            line = "#" + line
+        lines.append(line)
+    return "\n".join(lines)
@@ -1,11 +1,11 @@
-import ntexample
-
 from ntdocs import NTDocs  # type: ignore
 from pathlib import Path
 
 prod_dir = Path(__file__).parent.parent
+example_src = prod_dir.parent.parent / "ntexample" / "dev"
 
-nt = NTDocs(pkg_name="ntexample", save_dir=prod_dir/"release") # type: ignore
+# Read ntexample with ast: it does not need to be installed
+nt = NTDocs(pkg_name="ntexample", save_dir=prod_dir/"release", source=example_src) # type: ignore
 nt.build_templates()
 nt.build_modules()
 nt.build_release()
@@ -0,0 +1,34 @@
+import tempfile
+
+from ntdocs import NTDocsSite, SearchIndex  # type: ignore
+from pathlib import Path
+
+packages_dir = Path(__file__).parent.parent.parent.parent
+
+# Every nt* package, read with ast from its dev sources, one process each
+sources = {p.name: p / "dev" for p in sorted(packages_dir.glob("nt*")) if (p / "dev" / p.name).is_dir()}
+
+if __name__ == "__main__":
+    save_dir = Path(tempfile.mkdtemp(prefix="ntdocs-site-"))
+    packages = NTDocsSite(sources, save_dir, static=True).build()
+
+    for package in packages:
+        print(f"{package.name}: {len(package.symbols)} symbols, {len(package.modules)} modules")
+    assert (save_dir / "documentations" / "index.md").exists()
+
+    # Every module of a package gets a page, linked from the index
+    for package in packages:
+        for module in package.modules:
+            assert (save_dir / package.name / "documentations" / "submodules" / f"{module}.md").exists(), module
+
+    # Every package's release is rendered to HTML; a rebuild reuses every page
+    html_dir = save_dir / "ntlog" / "documentations" / "html"
+    pages = {p.name: p.stat().st_mtime_ns for p in html_dir.iterdir()}
+    assert "nav.js" in pages and "index.html" in pages and len(pages) > 2, pages
+    NTDocsSite(sources, save_dir, static=True).build()
+    assert {p.name: p.stat().st_mtime_ns for p in html_dir.iterdir()} == pages
+
+    # Every package gets a search index next to its pages
+    hits = SearchIndex(save_dir / "ntproxy" / "documentations").search("pool health")
+    assert hits and hits[0].name == "ProxyPool.healthy", hits
+    print(f"Site written to {save_dir / 'documentations'}")
@@ -1,5 +1,61 @@
-__path__ = __import__('pkgutil').extend_path(__path__, __name__)
+def _extend_path(path, name):
+    # pkgutil.extend_path for a top-level package, without importing pkgutil
+    # (it pulls in typing, which costs more than the rest of this import).
+    # Portions are found through the finders the import system caches per
+    # sys.path entry, so zip and egg entries are searched like directories,
+    # and `<name>.pkg` files are read, as extend_path does
+    import os
+    import sys
+    path = list(path)
+    for entry in sys.path:
+        if not isinstance(entry, str):
+            continue
+        finder = sys.path_importer_cache.get(entry)
+        if entry not in sys.path_importer_cache:
+            for hook in sys.path_hooks:
+                try:
+                    finder = sys.path_importer_cache.setdefault(entry, hook(entry))
+                    break
+                except ImportError:
+                    continue
+        spec = finder.find_spec(name) if hasattr(finder, "find_spec") else None
+        for portion in (spec.submodule_search_locations or []) if spec is not None else []:
+            if portion not in path:
+                path.append(portion)
+        pkg_file = os.path.join(entry, name + ".pkg")
+        if os.path.isfile(pkg_file):
+            with open(pkg_file) as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line and not line.startswith("#") and line not in path:
+                        path.append(line)
+    return path
 
-from .core.ntlog import NTLog
 
-__all__ = ["NTLog"]
\ No newline at end of file
+# Extend the package path to support namespace packages
+__path__ = _extend_path(__path__, __name__)
+
+# Exports are imported on first access (PEP 562), so importing the package
+# does not load modules the caller never uses
+_EXPORTS = {
+    "NTLog": ".core.ntlog",
+    "NTSpan": ".core.span",
+}
+
+__all__ = [
+    "NTLog",
+    "NTSpan",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(__name__ + module, fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,228 @@
+import asyncio
+import copy
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from ntlog.base.private.metrics import metered
+from ntlog.base.private.writer import write_batch
+
+
+class AsyncSinkHandler(logging.Handler):
+    def __init__(self, handlers: List[logging.Handler], loop: asyncio.AbstractEventLoop,
+                 maxsize: int = 10000, batch_size: int = 256):
+        """
+        Hand records to a writer task so logging never blocks the event loop.
+
+        `emit` only puts the record on an `asyncio.Queue` (from other threads via
+        `call_soon_threadsafe`); a task on the loop collects batches and writes
+        them to the real sinks in a dedicated thread. When the queue is full the
+        record is dropped and counted rather than blocking; the count is
+        written to the sinks as a warning on the next flush or close.
+
+        Args:
+            handlers (List[logging.Handler]): The sinks records are written to.
+            loop (asyncio.AbstractEventLoop): The loop running the writer task.
+            maxsize (int): Maximum number of queued records.
+            batch_size (int): Maximum number of records written per batch.
+        """
+        super().__init__()
+        self.handlers = handlers
+        self.loop = loop
+        self.batch_size = batch_size
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ntlog-async")
+        self._loop_thread = threading.get_ident()
+        self._stopped = False
+        # Records dropped because the queue was full, since the last report
+        self.dropped = 0
+        # Held while a batch is written, so `swap` waits for it
+        self._write_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = loop.create_task(self._run(), name="ntlog-async-writer")
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Nothing to serialise here: the queue is thread-confined to the loop
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Render now: args may be mutated before the writer gets to them.
+            # Into a copy, as the other handlers of the logger share the record
+            message = record.getMessage()
+            record = copy.copy(record)
+            record.msg, record.args = message, None
+            if self._stopped:
+                # The writer task is gone (loop shut down): write in place
+                self._write([record])
+            elif threading.get_ident() == self._loop_thread:
+                self._put(record)
+            else:
+                self.loop.call_soon_threadsafe(self._put, record)
+        except Exception:
+            self.handleError(record)
+
+    def _put(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except asyncio.QueueFull:
+            # Only counted: reporting it here would block the loop
+            self.dropped += 1
+            metrics = getattr(self, "metrics", None)
+            if metrics is not None and metrics.enabled:
+                dropped = metrics.shard().dropped
+                dropped[record.levelno] = dropped.get(record.levelno, 0) + 1
+
+    async def flush_async(self) -> None:
+        """Wait until every record queued so far has been written, and report drops."""
+        await self.queue.join()
+        report = self._drop_report()
+        if report is not None:
+            await asyncio.wrap_future(self._executor.submit(self._write, [report]))
+
+    async def aclose(self, close_handlers: bool = True) -> None:
+        """
+        Write pending records, stop the writer task and release the sinks.
+
+        Args:
+            close_handlers (bool): If False, leave the sinks open so they can be reused.
+        """
+        if self._task is not None:
+            await self.queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+        report = self._drop_report()
+        if report is not None:
+            self._write([report])
+        if close_handlers:
+            for handler in self.handlers:
+                handler.close()
+        super().close()
+
+    def swap(self, handlers: List[logging.Handler]) -> None:
+        """
+        Replace the sinks, waiting for a batch being written to the old ones.
+
+        Once this returns the writer no longer uses the old sinks, so they can be closed.
+
+        Args:
+            handlers (List[logging.Handler]): The new sinks.
+        """
+        with self._write_lock:
+            self.handlers = handlers
+
+    def bound_to(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Whether the writer task is alive on this loop."""
+        return not self._stopped and self.loop is loop
+
+    def detach(self) -> None:
+        """
+        Stop the writer without awaiting, writing what is queued synchronously.
+
+        Used when the sink is dropped from synchronous code or after the loop stopped.
+        """
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._drain_now()
+        report = self._drop_report()
+        if report is not None:
+            self._write([report])
+        self._executor.shutdown(wait=False)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                while len(batch) < self.batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+
+                future = self._executor.submit(self._write, batch)
+                try:
+                    await asyncio.shield(asyncio.wrap_future(future))
+                except asyncio.CancelledError:
+                    # Shutting down mid-write: let the batch finish, then drain
+                    future.result()
+                    raise
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            # Cancelled when the loop shuts down: do not lose what is queued
+            self._stopped = True
+            self._drain_now()
+
+    def _drain_now(self) -> None:
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if batch:
+            self._write(batch)
+
+    def _drop_report(self) -> Optional[logging.LogRecord]:
+        if not self.dropped:
+            return None
+        dropped, self.dropped = self.dropped, 0
+        return logging.makeLogRecord({
+            "name": "ntlog", "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": f"[NTLog] Dropped {dropped} records: the async queue was full",
+        })
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        with self._write_lock:
+            write_batch(self.handlers, batch)
+
+
+_sinks: Dict[str, AsyncSinkHandler] = {}
+
+
+def get_async_sink(name: str, handlers: List[logging.Handler]) -> AsyncSinkHandler:
+    """
+    Return the async sink of a logger name on the running loop, creating it if needed.
+
+    A sink left over from a loop that is gone, or whose writer stopped, is
+    detached and replaced.
+
+    Args:
+        name (str): The logger instance name.
+        handlers (List[logging.Handler]): Sinks used when a new async sink is created.
+
+    Returns:
+        AsyncSinkHandler: The sink bound to the running loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        raise ValueError("asyncio loggers must be configured from a running event loop")
+
+    sink = _sinks.get(name)
+    if sink is not None and not sink.bound_to(loop):
+        sink.detach()
+        sink = None
+    if sink is None:
+        sink = _sinks[name] = metered(AsyncSinkHandler)(handlers, loop)
+    return sink
+
+
+def pop_async_sink(name: str) -> Optional[AsyncSinkHandler]:
+    """
+    Forget the async sink of a logger name and return it.
+
+    Args:
+        name (str): The logger instance name.
+
+    Returns:
+        Optional[AsyncSinkHandler]: The sink, if there was one.
+    """
+    return _sinks.pop(name, None)
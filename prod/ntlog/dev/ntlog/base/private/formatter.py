@@ -0,0 +1,191 @@
+import json
+import logging
+import re
+import sys
+import time
+
+from typing import Callable, Optional
+
+# ANSI color codes
+COLOR_CODES = {
+    'DEBUG': '\033[94m',    # Blue
+    'INFO': '\033[92m',     # Green
+    'WARNING': '\033[93m',  # Yellow
+    'ERROR': '\033[91m',    # Red
+    'CRITICAL': '\033[95m', # Magenta
+}
+RESET_CODE = '\033[0m'
+
+BASE_FMT = '[%(asctime)s] [%(levelname)s] %(name)s: %(message)s'
+# How a record written by these formatters starts: the time and level of
+# BASE_FMT, or the first key of JsonFormatter. Lines that do not match
+# (tracebacks, multi-line messages) continue the record before them
+RECORD_START = re.compile(r'\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}\] \[[^\]]+\] |\{"time": "')
+
+# %(name)s style fields; anything else containing '%' falls back to the stdlib
+_FIELD = re.compile(r"%\(([A-Za-z_]\w*)\)([#0 +-]*\d*(?:\.\d+)?[diouxXeEfFgGcrsa])")
+
+
+def compile_format(fmt: str) -> Optional[Callable[[logging.LogRecord], str]]:
+    """
+    Compile a %-style log format into a function rendering a record.
+
+    The function reads record attributes directly instead of building the
+    `record.__dict__` mapping and re-parsing the format on every call.
+
+    Args:
+        fmt (str): A %-style format such as `BASE_FMT`.
+
+    Returns:
+        Optional[Callable[[logging.LogRecord], str]]: The render function, or None
+            if the format uses something this compiler does not handle.
+    """
+    parts = []
+    pos = 0
+    for match in _FIELD.finditer(fmt):
+        literal = fmt[pos:match.start()]
+        if "%" in literal.replace("%%", ""):
+            return None
+        if literal:
+            parts.append(repr(literal.replace("%%", "%")))
+
+        name, spec = match.groups()
+        if spec == "s":
+            parts.append(f"str(r.{name})")
+        else:
+            parts.append(f"{'%' + spec!r} % (r.{name},)")
+        pos = match.end()
+
+    literal = fmt[pos:]
+    if "%" in literal.replace("%%", ""):
+        return None
+    if literal:
+        parts.append(repr(literal.replace("%%", "%")))
+
+    body = f"''.join(({', '.join(parts)},))" if parts else "''"
+    source = f"def render(r):\n    return {body}\n"
+    namespace: dict = {}
+    exec(compile(source, "<ntlog-format>", "exec"), namespace)
+    return namespace["render"]
+
+
+class FastFormatter(logging.Formatter):
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        """
+        A drop-in `logging.Formatter` for high record rates.
+
+        The `strftime` part of `%(asctime)s` is computed once per second and
+        reused, only the milliseconds are added per record, and the format
+        string is compiled once into a render function.
+
+        Args:
+            fmt (Optional[str]): The %-style record format.
+            datefmt (Optional[str]): The `time.strftime` format for `%(asctime)s`.
+        """
+        super().__init__(fmt, datefmt)
+        self._render = compile_format(self._fmt)
+        self._uses_time = self.usesTime()
+        self._time_cache = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """
+        Return the creation time of a record, reusing the per-second prefix.
+
+        Args:
+            record (logging.LogRecord): The record being formatted.
+            datefmt (Optional[str]): The `time.strftime` format; defaults to ISO-like.
+
+        Returns:
+            str: The formatted time.
+        """
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            self._time_cache = (second, prefix)
+
+        if datefmt or not self.default_msec_format:
+            return prefix
+        return self.default_msec_format % (prefix, record.msecs)
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record the same way `logging.Formatter.format` does.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: The formatted line.
+        """
+        if self._render is None:
+            return super().format(record)
+
+        record.message = record.getMessage()
+        if self._uses_time:
+            record.asctime = self.formatTime(record, self.datefmt)
+        try:
+            s = self._render(record)
+        except AttributeError as e:
+            raise ValueError(f"Formatting field not found in record: {e}")
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + record.exc_text
+        if record.stack_info:
+            if s[-1:] != "\n":
+                s = s + "\n"
+            s = s + self.formatStack(record.stack_info)
+        return s
+
+
+class JsonFormatter(FastFormatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as a single-line JSON object.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: A JSON object with time, level, name and message keys, plus
+                exc and stack when the record carries them.
+        """
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class ColorFormatter(FastFormatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record with its level name and message wrapped in ANSI colors.
+
+        The record is copied before coloring so other handlers sharing it
+        (file sinks, queues) still see the plain level name and message.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: The formatted, colored line.
+        """
+        color = COLOR_CODES.get(record.levelname, "")
+        if color and 'utf-8' in (sys.stdout.encoding or '').lower():
+            record = logging.makeLogRecord(record.__dict__)
+            record.levelname = f"{color}{record.levelname}{RESET_CODE}"
+            record.msg = f"{color}{record.msg}{RESET_CODE}"
+        return super().format(record)
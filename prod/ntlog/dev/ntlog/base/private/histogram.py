@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+# Bucket i holds durations in [2**(i-1), 2**i) microseconds; bucket 0 is < 1us
+BUCKETS = 32
+
+
+class Histogram:
+    def __init__(self):
+        """
+        Fixed-size log2 histogram of durations in seconds.
+
+        Recording is a few integer operations and never allocates, so it can
+        sit on hot paths; percentiles are estimated from the bucket bounds.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets: List[int] = [0] * BUCKETS
+
+    def add(self, seconds: float) -> None:
+        """
+        Record one duration.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        index = int(seconds * 1_000_000).bit_length()
+        self.buckets[index if index < BUCKETS else BUCKETS - 1] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile as the upper bound of the bucket it falls in.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated duration in seconds, capped by the observed max.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= rank:
+                return min((2 ** index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Return the count and the main statistics in milliseconds.
+
+        Returns:
+            Dict[str, float]: count, total, mean, min, p50, p99 and max.
+        """
+        if not self.count:
+            return {"count": 0}
+        ms = 1000
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * ms, 3),
+            "mean_ms": round(self.total / self.count * ms, 3),
+            "min_ms": round(self.min * ms, 3),
+            "p50_ms": round(self.percentile(0.50) * ms, 3),
+            "p99_ms": round(self.percentile(0.99) * ms, 3),
+            "max_ms": round(self.max * ms, 3),
+        }
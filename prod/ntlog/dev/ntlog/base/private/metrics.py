@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+import weakref
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Shards kept before finished threads are first looked for
+_RETIRE_MIN = 64
+
+
+class _Shard:
+    __slots__ = ("emitted", "suppressed", "dropped", "handler_calls", "handler_time")
+
+    def __init__(self):
+        self.emitted: Dict[int, int] = {}
+        self.suppressed: Dict[int, int] = {}
+        self.dropped: Dict[int, int] = {}
+        self.handler_calls: Dict[str, int] = {}
+        self.handler_time: Dict[str, float] = {}
+
+    def merge(self, other: "_Shard") -> None:
+        for attr in self.__slots__:
+            totals = getattr(self, attr)
+            for key, value in list(getattr(other, attr).items()):
+                totals[key] = totals.get(key, 0) + value
+
+
+class LogMetrics:
+    def __init__(self, name: str, level: int):
+        """
+        Per-logger counters of emitted, suppressed and dropped records and of handler time.
+
+        Every thread writes to its own shard, so counting takes no lock; a
+        snapshot sums the shards and may lag a concurrent increment. Shards of
+        threads that have finished are folded into one retired total, so a
+        thread-per-request workload does not grow the shard list.
+
+        Args:
+            name (str): The logger instance name.
+            level (int): The configured level; records below it that reach the logger
+                (e.g. for a flight recorder) count as suppressed.
+        """
+        self.name = name
+        self.level = level
+        self.enabled = True
+
+        self._local = threading.local()
+        # Each shard with a weak reference to the thread that writes it
+        self._shards: List[Tuple[weakref.ref, _Shard]] = []
+        self._retired = _Shard()
+        self._shards_lock = threading.Lock()
+        self._retire_at = _RETIRE_MIN
+
+    def shard(self) -> _Shard:
+        """Return the calling thread's shard, creating it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+                # Amortised: the list is only scanned when it doubled since the last scan
+                if len(self._shards) >= self._retire_at:
+                    self._retire_finished()
+                    self._retire_at = max(_RETIRE_MIN, 2 * len(self._shards))
+            return shard
+
+    def _retire_finished(self) -> None:
+        # Called with the shards lock held; a finished thread no longer writes its shard
+        live = []
+        for owner, shard in self._shards:
+            thread = owner()
+            if thread is not None and thread.is_alive():
+                live.append((owner, shard))
+            else:
+                self._retired.merge(shard)
+        self._shards = live
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Count a record reaching the logger; used as a logger filter, never rejects.
+
+        Args:
+            record (logging.LogRecord): The record being logged.
+
+        Returns:
+            bool: Always True.
+        """
+        if self.enabled:
+            counts = self.shard().emitted if record.levelno >= self.level else self.shard().suppressed
+            counts[record.levelno] = counts.get(record.levelno, 0) + 1
+        return True
+
+    def instrument(self, handler: logging.Handler, name: str) -> None:
+        """
+        Report a handler's time and dropped records to these metrics.
+
+        Only handlers built from `metered` classes report; others are left as they are.
+
+        Args:
+            handler (logging.Handler): The handler attached to the logger.
+            name (str): Name the handler is reported under.
+        """
+        if isinstance(handler, MeteredHandler):
+            handler.metrics = self
+            handler.metrics_name = name
+
+    def watch(self, logger: logging.Logger) -> None:
+        """
+        Count the calls a logger's level check turns away as suppressed.
+
+        The logger keeps its level, so a disabled call still costs only the
+        level check and one counter increment, and never builds a record.
+
+        Args:
+            logger (logging.Logger): The logger these metrics belong to.
+        """
+        is_enabled_for = type(logger).isEnabledFor.__get__(logger)
+
+        def counted(level: int) -> bool:
+            if is_enabled_for(level):
+                return True
+            if self.enabled:
+                suppressed = self.shard().suppressed
+                suppressed[level] = suppressed.get(level, 0) + 1
+            return False
+
+        logger.isEnabledFor = counted
+
+    @staticmethod
+    def unwatch(logger: logging.Logger) -> None:
+        """Restore a logger's own level check."""
+        logger.__dict__.pop("isEnabledFor", None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Sum the counters of every thread.
+
+        Returns:
+            Dict[str, Any]: emitted, suppressed and dropped counts per level name,
+                and calls and total seconds per handler.
+        """
+        retired = _Shard()
+        with self._shards_lock:
+            self._retire_finished()
+            retired.merge(self._retired)
+            shards = [retired] + [shard for _, shard in self._shards]
+
+        def by_level(attr: str) -> Dict[str, int]:
+            totals: Dict[str, int] = {}
+            for shard in shards:
+                for levelno, count in list(getattr(shard, attr).items()):
+                    levelname = logging.getLevelName(levelno)
+                    totals[levelname] = totals.get(levelname, 0) + count
+            return totals
+
+        handlers: Dict[str, Dict[str, float]] = {}
+        for shard in shards:
+            for name, calls in list(shard.handler_calls.items()):
+                stats = handlers.setdefault(name, {"calls": 0, "seconds": 0.0})
+                stats["calls"] += calls
+                stats["seconds"] += shard.handler_time.get(name, 0.0)
+
+        return {
+            "emitted": by_level("emitted"),
+            "suppressed": by_level("suppressed"),
+            "dropped": by_level("dropped"),
+            "handlers": handlers,
+        }
+
+
+class MeteredHandler(logging.Handler):
+    """
+    Times `handle` and counts records `handleError` gives up on, once `LogMetrics.instrument` set `metrics`.
+
+    Used through `metered`, which puts it in front of a handler class.
+    """
+    metrics: Optional[LogMetrics] = None
+    metrics_name: str = ""
+
+    def handle(self, record: logging.LogRecord):
+        metrics = self.metrics
+        if metrics is None or not metrics.enabled:
+            return super().handle(record)
+        started = time.perf_counter()
+        try:
+            return super().handle(record)
+        finally:
+            shard = metrics.shard()
+            shard.handler_calls[self.metrics_name] = shard.handler_calls.get(self.metrics_name, 0) + 1
+            shard.handler_time[self.metrics_name] = (
+                shard.handler_time.get(self.metrics_name, 0.0) + time.perf_counter() - started
+            )
+
+    def handleError(self, record: logging.LogRecord) -> None:
+        metrics = self.metrics
+        if metrics is not None and metrics.enabled:
+            dropped = metrics.shard().dropped
+            dropped[record.levelno] = dropped.get(record.levelno, 0) + 1
+        super().handleError(record)
+
+
+_metered: Dict[type, type] = {}
+
+
+def metered(cls: type) -> type:
+    """
+    Return a subclass of a handler class that can report to `LogMetrics`.
+
+    Args:
+        cls (type): A `logging.Handler` subclass.
+
+    Returns:
+        type: The subclass, created once per class; it reports nothing until instrumented.
+    """
+    subclass = _metered.get(cls)
+    if subclass is None:
+        subclass = _metered[cls] = type(cls.__name__, (MeteredHandler, cls), {"__module__": cls.__module__})
+    return subclass
+
+
+class MetricsDumper:
+    def __init__(self, interval: float, source: Callable[[], Dict[str, Any]], sink: Callable[[Dict[str, Any]], None]):
+        """
+        Periodically pass a metrics snapshot to a sink from a daemon thread.
+
+        Args:
+            interval (float): Seconds between dumps.
+            source (Callable[[], Dict[str, Any]]): Returns the snapshot.
+            sink (Callable[[Dict[str, Any]], None]): Receives the snapshot.
+        """
+        self.interval = interval
+        self.source = source
+        self.sink = sink
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MetricsDumper":
+        """Start dumping; returns self so it can be chained after construction."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ntlog-metrics-dump", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop dumping after a final dump."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.sink(self.source())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sink(self.source())
@@ -0,0 +1,139 @@
+import itertools
+import logging
+import signal
+import threading
+import weakref
+
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from ntlog.base.private.formatter import BASE_FMT, FastFormatter
+
+_recorders: "weakref.WeakSet[FlightRecorderHandler]" = weakref.WeakSet()
+
+
+class FlightRecorderHandler(logging.Handler):
+    def __init__(self, capacity: int, dump_file: Path, dump_level: int = logging.ERROR):
+        """
+        Keep the last `capacity` records of every level in memory.
+
+        Records go into a fixed, preallocated ring of slots without formatting
+        or locking; the ring is formatted and appended to `dump_file` only when
+        a record at `dump_level` or above arrives, on a signal, or on demand.
+
+        Args:
+            capacity (int): Number of records kept.
+            dump_file (Path): File the ring is appended to when dumped.
+            dump_level (int): Records at or above this level trigger a dump.
+        """
+        super().__init__()
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive number of records")
+
+        self.capacity = capacity
+        self.dump_file = Path(dump_file)
+        self.dump_level = dump_level
+        self.formatter = FastFormatter(BASE_FMT)
+
+        self._slots: List[Optional[Tuple[int, logging.LogRecord]]] = [None] * capacity
+        self._seq = itertools.count()
+        # Highest sequence number written by a dump; older slots are left to be overwritten
+        self._dumped = -1
+        self._dump_lock = threading.Lock()
+        _recorders.add(self)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skip the handler lock: a slot store is atomic and next() on
+        # itertools.count hands out unique sequence numbers to every thread
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        seq = next(self._seq)
+        self._slots[seq % self.capacity] = (seq, record)
+        if record.levelno >= self.dump_level:
+            self.dump(reason=f"{record.levelname} record")
+
+    def records(self) -> List[logging.LogRecord]:
+        """
+        Return the buffered records not dumped yet, oldest first.
+
+        Returns:
+            List[logging.LogRecord]: Up to `capacity` most recent records.
+        """
+        return [record for _, record in self._pending()]
+
+    def _pending(self) -> List[Tuple[int, logging.LogRecord]]:
+        dumped = self._dumped
+        slots = [slot for slot in list(self._slots) if slot is not None and slot[0] > dumped]
+        slots.sort(key=lambda slot: slot[0])
+        return slots
+
+    def dump(self, reason: str = "on demand") -> int:
+        """
+        Append the records not dumped yet to `dump_file`.
+
+        The ring is not cleared, as `emit` may store a record meanwhile; a
+        later dump skips everything up to the last record written here.
+
+        Args:
+            reason (str): Written in the dump header.
+
+        Returns:
+            int: Number of records written.
+        """
+        with self._dump_lock:
+            slots = self._pending()
+            if not slots:
+                return 0
+            self._dumped = slots[-1][0]
+            records = [record for _, record in slots]
+
+            lines = [f"---- flight recorder dump ({reason}) at {datetime.now().isoformat()} ----"]
+            for record in records:
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+
+            self.dump_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.dump_file, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            return len(records)
+
+    def close(self) -> None:
+        _recorders.discard(self)
+        super().close()
+
+
+def dump_all(reason: str = "on demand") -> int:
+    """
+    Dump every live flight recorder.
+
+    Args:
+        reason (str): Written in the dump headers.
+
+    Returns:
+        int: Total number of records written.
+    """
+    return sum(recorder.dump(reason) for recorder in list(_recorders))
+
+
+def dump_on_signal(signum: int) -> None:
+    """
+    Dump every live flight recorder when the process receives `signum`.
+
+    Must be called from the main thread, like `signal.signal`.
+
+    Args:
+        signum (int): The signal number, e.g. `signal.SIGUSR1`.
+    """
+    def _handler(received, frame):
+        # Write from a thread: the interrupted code may hold a recorder's lock
+        threading.Thread(
+            target=dump_all, args=(f"signal {signal.Signals(received).name}",), daemon=True
+        ).start()
+
+    signal.signal(signum, _handler)
@@ -0,0 +1,243 @@
+import gzip
+import logging
+import logging.handlers
+import lzma
+import os
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+from ntlog.base.private.formatter import RECORD_START
+
+COMPRESSORS = {"gzip": (".gz", gzip.open), "lzma": (".xz", lzma.open)}
+OPENERS = {suffix: opener for suffix, opener in COMPRESSORS.values()}
+
+# gzip and lzma release the GIL while compressing, so threads are enough
+MAX_COMPRESS_WORKERS = 2
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Plain segments a worker is compressing; retention leaves them alone
+_compressing: Set[Path] = set()
+_compressing_lock = threading.Lock()
+
+
+def _compress_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_COMPRESS_WORKERS, thread_name_prefix="ntlog-compress")
+        return _executor
+
+
+def segments(log_file: Path) -> List[Path]:
+    """
+    List the rotated segments of a log file, oldest first.
+
+    A segment that is being compressed is listed once: the finished archive
+    if it exists, otherwise the plain segment.
+
+    Args:
+        log_file (Path): The live log file.
+
+    Returns:
+        List[Path]: The rotated segments, compressed or not.
+    """
+    log_file = Path(log_file)
+    by_stem: Dict[str, Path] = {}
+    for path in log_file.parent.glob(f"{log_file.name}.*"):
+        if path.name.endswith(".tmp"):
+            continue
+        stem = path.name
+        if path.suffix in OPENERS:
+            stem = path.name[:-len(path.suffix)]
+        if stem not in by_stem or path.suffix in OPENERS:
+            by_stem[stem] = path
+    return [by_stem[stem] for stem in sorted(by_stem)]
+
+
+def compress_segment(segment: Path, compression: str, retention_bytes: int = 0) -> Path:
+    """
+    Compress a closed segment next to itself and remove the original.
+
+    The archive is written to a `.tmp` file and renamed when complete, so
+    readers never see a partial archive.
+
+    Args:
+        segment (Path): The rotated, closed segment.
+        compression (str): One of `COMPRESSORS`.
+        retention_bytes (int): If set, delete the oldest segments of the same log
+            until they take at most this many bytes.
+
+    Returns:
+        Path: The archive.
+    """
+    suffix, opener = COMPRESSORS[compression]
+    target = segment.with_name(segment.name + suffix)
+    tmp = target.with_name(target.name + ".tmp")
+
+    with _compressing_lock:
+        _compressing.add(segment)
+    try:
+        with open(segment, "rb") as src, opener(tmp, "wb") as dst:
+            while True:
+                chunk = src.read(1 << 20)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(tmp, target)
+        segment.unlink()
+    finally:
+        with _compressing_lock:
+            _compressing.discard(segment)
+
+    if retention_bytes:
+        log_file = segment.with_name(segment.name.rsplit(".", 1)[0])
+        enforce_retention(log_file, retention_bytes)
+    return target
+
+
+def enforce_retention(log_file: Path, retention_bytes: int) -> None:
+    """
+    Delete the oldest rotated segments of a log until they fit in `retention_bytes`.
+
+    Segments that are being compressed are neither counted nor deleted; their
+    archive is, by the retention run that follows its compression.
+
+    Args:
+        log_file (Path): The live log file; it is never deleted.
+        retention_bytes (int): The size budget for rotated segments.
+    """
+    with _compressing_lock:
+        busy = set(_compressing)
+    existing = []
+    for path in segments(log_file):
+        if path in busy:
+            continue
+        try:
+            existing.append((path, path.stat().st_size))
+        except FileNotFoundError:
+            continue
+
+    total = sum(size for _, size in existing)
+    for path, size in existing:
+        if total <= retention_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+class RotatingSegmentHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int, compression: Optional[str] = None,
+                 retention_bytes: int = 0, encoding: str = "utf-8"):
+        """
+        A size-rotated file sink whose closed segments are compressed in the background.
+
+        On rollover the live file is renamed to `<log_file>.<timestamp>`, a new
+        file is opened, and the closed segment is handed to a shared thread pool
+        (at most `MAX_COMPRESS_WORKERS` at a time), so the logging call only pays
+        for a rename.
+
+        Args:
+            filename (str): The live log file.
+            max_bytes (int): Size at which the live file is rotated.
+            compression (Optional[str]): "gzip", "lzma", or None to keep segments plain.
+            retention_bytes (int): Size budget for rotated segments; 0 keeps everything.
+            encoding (str): The file encoding.
+        """
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        super().__init__(filename, maxBytes=max_bytes, encoding=encoding)
+        self.compression = compression
+        self.retention_bytes = retention_bytes
+        self.pending: List[Future] = []
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        base = Path(self.baseFilename)
+        if base.exists() and base.stat().st_size:
+            segment = base.with_name(f"{base.name}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+            while segment.exists():
+                segment = segment.with_name(segment.name + "0")
+            os.rename(base, segment)
+            self._hand_off(segment)
+
+        self.stream = self._open()
+
+    def _hand_off(self, segment: Path) -> None:
+        self.pending = [f for f in self.pending if not f.done()]
+        if self.compression:
+            # Marked before it is queued, so a retention run in between skips it
+            with _compressing_lock:
+                _compressing.add(segment)
+            future = _compress_executor().submit(compress_segment, segment, self.compression, self.retention_bytes)
+            future.add_done_callback(self._report)
+            self.pending.append(future)
+        elif self.retention_bytes:
+            enforce_retention(Path(self.baseFilename), self.retention_bytes)
+
+    def _report(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            print(f"[NTLog] Failed to compress log segment: {error}")
+
+    def wait(self) -> None:
+        """Block until every segment handed off so far is compressed."""
+        for future in list(self.pending):
+            future.result()
+        self.pending = []
+
+
+def _open_segment(path: Path):
+    candidates = [path]
+    if path.suffix not in OPENERS:
+        # May have been replaced by its archive since it was listed
+        candidates += [path.with_name(path.name + suffix) for suffix in OPENERS]
+    for candidate in candidates:
+        try:
+            return OPENERS.get(candidate.suffix, open)(candidate, "rt", encoding="utf-8")
+        except FileNotFoundError:
+            continue
+    # Deleted by retention since it was listed
+    return None
+
+
+def iter_records(log_file: Path) -> Iterator[str]:
+    """
+    Iterate the records of a log across rotated segments and the live file, oldest first.
+
+    Compressed segments are decompressed as a stream, never to disk. Lines
+    that do not start a record as the formatters write it (`RECORD_START`),
+    such as traceback lines, are joined to the record before them.
+
+    Args:
+        log_file (Path): The live log file.
+
+    Yields:
+        str: One record, without its trailing newline.
+    """
+    log_file = Path(log_file)
+    paths = segments(log_file)
+    if log_file.exists():
+        paths.append(log_file)
+
+    record: Optional[str] = None
+    for path in paths:
+        f = _open_segment(path)
+        if f is None:
+            continue
+        with f:
+            for line in f:
+                line = line.rstrip("\n")
+                if record is not None and not RECORD_START.match(line):
+                    record += "\n" + line
+                    continue
+                if record is not None:
+                    yield record
+                record = line
+    if record is not None:
+        yield record
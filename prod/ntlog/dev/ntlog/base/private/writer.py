@@ -0,0 +1,214 @@
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import threading
+
+from typing import Dict, List, Optional
+
+
+def write_batch(handlers: List[logging.Handler], batch: List[logging.LogRecord]) -> None:
+    """
+    Write a batch of records to every sink, honouring each sink's level and filters.
+
+    Stream-based sinks get one write and one flush per batch; other handlers
+    receive the records one by one.
+
+    Args:
+        handlers (List[logging.Handler]): The sinks to write to.
+        batch (List[logging.LogRecord]): The records, oldest first.
+    """
+    for handler in handlers:
+        records = [r for r in batch if r.levelno >= handler.level]
+        if not records:
+            continue
+
+        if isinstance(handler, logging.StreamHandler):
+            # `handle` is bypassed here, so the filters are applied as it would
+            records = [r for r in records if handler.filter(r)]
+            if not records:
+                continue
+            lines = []
+            for record in records:
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+
+            handler.acquire()
+            try:
+                if handler.stream is None and isinstance(handler, logging.FileHandler):
+                    # Opened lazily (delay=True); a sink that was closed stays closed
+                    if handler._closed:
+                        continue
+                    handler.stream = handler._open()
+                handler.stream.write("".join(lines))
+                handler.flush()
+                # Size-rotated sinks are checked once per batch
+                if isinstance(handler, logging.handlers.BaseRotatingHandler) and handler.shouldRollover(records[-1]):
+                    handler.doRollover()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
+        else:
+            for record in records:
+                handler.handle(record)
+
+
+class ProcessQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Send a prepared record to the writer's queue.
+
+        Args:
+            record (logging.LogRecord): The record, already formatted by `prepare`.
+        """
+        self.queue.put(record)
+
+
+class LogWriter:
+    def __init__(self, handlers: List[logging.Handler], batch_size: int = 256):
+        """
+        Own the real sinks of a logger and write records sent by any process.
+
+        Records are put on a `multiprocessing` queue by `ProcessQueueHandler`s in
+        the parent and in its children; a single thread in the owning process
+        drains the queue and writes the records in batches, so only one process
+        ever touches the log file.
+
+        The queue is a `SimpleQueue` from the `spawn` context: puts go straight
+        to the pipe (nothing is lost when a pool terminates its workers) and it
+        can be handed to forked and spawned workers alike.
+
+        Args:
+            handlers (List[logging.Handler]): The sinks records are written to.
+            batch_size (int): Maximum number of records written per batch.
+        """
+        self.handlers = handlers
+        self.batch_size = batch_size
+
+        self.queue = multiprocessing.get_context("spawn").SimpleQueue()
+        self._owner_pid = os.getpid()
+        self._thread: Optional[threading.Thread] = None
+        # Held while a batch is written, so `swap` waits for it
+        self._write_lock = threading.Lock()
+
+    def swap(self, handlers: List[logging.Handler]) -> None:
+        """
+        Replace the sinks, waiting for a batch being written to the old ones.
+
+        Once this returns the writer no longer uses the old sinks, so they can be closed.
+
+        Args:
+            handlers (List[logging.Handler]): The new sinks.
+        """
+        with self._write_lock:
+            self.handlers = handlers
+
+    def start(self) -> None:
+        """Start the writer thread in the owning process."""
+        if self._thread is not None or os.getpid() != self._owner_pid:
+            return
+        self._thread = threading.Thread(target=self._run, name="ntlog-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, close_handlers: bool = True) -> None:
+        """
+        Drain pending records, stop the writer thread and close the sinks.
+
+        Calling this from a forked child is a no-op: the child does not own the sinks.
+
+        Args:
+            close_handlers (bool): If False, leave the sinks open so they can be reused.
+        """
+        if self._thread is None or os.getpid() != self._owner_pid:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if close_handlers:
+            for handler in self.handlers:
+                handler.close()
+
+    def _run(self) -> None:
+        while True:
+            record = self.queue.get()
+            batch = []
+            stopping = record is None
+            if not stopping:
+                batch.append(record)
+
+            # Drain whatever is already queued, up to one batch
+            while not stopping and len(batch) < self.batch_size and not self.queue.empty():
+                record = self.queue.get()
+                if record is None:
+                    stopping = True
+                else:
+                    batch.append(record)
+
+            if batch:
+                with self._write_lock:
+                    write_batch(self.handlers, batch)
+            if stopping:
+                return
+
+
+_writers: Dict[str, LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(name: str, handlers: List[logging.Handler]) -> LogWriter:
+    """
+    Return the running writer for a logger name, starting one if needed.
+
+    Args:
+        name (str): The logger instance name.
+        handlers (List[logging.Handler]): Sinks used when a new writer is created.
+
+    Returns:
+        LogWriter: The writer owning the sinks of that logger.
+    """
+    with _writers_lock:
+        writer = _writers.get(name)
+        if writer is None:
+            writer = LogWriter(handlers)
+            writer.start()
+            _writers[name] = writer
+        return writer
+
+
+def release_writer(name: str) -> None:
+    """
+    Stop the writer of a logger name without closing its sinks.
+
+    Args:
+        name (str): The logger instance name.
+    """
+    with _writers_lock:
+        writer = _writers.pop(name, None)
+    if writer is not None:
+        writer.stop(close_handlers=False)
+
+
+def stop_writers() -> None:
+    """Flush and stop every writer owned by the current process."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.stop()
+
+
+def _after_fork_in_child() -> None:
+    # The child keeps the inherited queues but must never stop or restart the
+    # parent's writers; forgetting them here makes exit handling a no-op.
+    global _writers_lock
+    _writers_lock = threading.Lock()
+    _writers.clear()
+
+
+atexit.register(stop_writers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
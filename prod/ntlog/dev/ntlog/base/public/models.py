@@ -11,7 +11,24 @@ class LogModel:
     to_file: bool = False
     to_stream: bool = True
     log_file: Optional[Path] = None
+    max_bytes: int = 0
+    compression: Optional[str] = None
+    retention_bytes: int = 0
+    multiprocess: bool = False
+    asyncio: bool = False
+    json_format: bool = False
+    metrics: bool = False
+    flight_recorder: int = 0
+    flight_recorder_file: Optional[Path] = None
 
     def __post_init__(self):
         if self.to_file and not self.log_file:
-            raise ValueError("log_file must be specified if to_file is True")
\ No newline at end of file
+            raise ValueError("log_file must be specified if to_file is True")
+        if self.compression not in (None, "gzip", "lzma"):
+            raise ValueError(f"Unsupported compression: {self.compression}")
+        if self.compression and not self.max_bytes:
+            raise ValueError("max_bytes must be specified if compression is set")
+        if self.multiprocess and self.asyncio:
+            raise ValueError("multiprocess and asyncio cannot both be True")
+        if self.flight_recorder and not self.flight_recorder_file:
+            raise ValueError("flight_recorder_file must be specified if flight_recorder is set")
\ No newline at end of file
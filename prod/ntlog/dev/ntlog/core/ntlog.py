@@ -1,18 +1,22 @@
+import json
 import logging
-import sys
+import signal
+from multiprocessing.queues import SimpleQueue
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
 from ntlog.base.public.models import LogModel
 from ntlog.base.private.abstract import Helper
+from ntlog.base.private.metrics import MetricsDumper
+from ntlog.base.private.recorder import FlightRecorderHandler, dump_on_signal
+from ntlog.base.private.rotation import iter_records
+from ntlog.base.private.writer import get_writer
+from ntlog.core.registry import registry
 
-# ANSI color codes
-COLOR_CODES = {
-    'DEBUG': '\033[94m',    # Blue
-    'INFO': '\033[92m',     # Green
-    'WARNING': '\033[93m',  # Yellow
-    'ERROR': '\033[91m',    # Red
-    'CRITICAL': '\033[95m', # Magenta
-}
-RESET_CODE = '\033[0m'
+DEFAULT_CONFIG = LogModel(
+    instance_name="DefaultLogger",
+    level=logging.DEBUG,
+    to_stream=True
+)
 
 
 class NTLog(Helper):
@@ -22,51 +26,186 @@ class NTLog(Helper):
         self.config: LogModel = config
 
     def get(self) -> logging.Logger:
-        logger = logging.getLogger(self.config.instance_name)
-        logger.setLevel(self.config.level)
-
-        if not logger.handlers:
-            base_fmt = '[%(asctime)s] [%(levelname)s] %(name)s: %(message)s'
-
-            # File handler (no color)
-            if self.config.to_file:
-                if not self.config.log_file:
-                    raise ValueError("log_file must be specified if to_file is True")
-                
-                log_path = Path(self.config.log_file)
-                log_dir = log_path.parent
-                if log_dir and not log_dir.exists():
-                    log_dir.mkdir(parents=True, exist_ok=True)
-
-                file_handler = logging.FileHandler(str(log_path), encoding='utf-8')
-                file_handler.setFormatter(logging.Formatter(base_fmt))
-                logger.addHandler(file_handler)
-
-            # Stream handler (with inline color logic)
-            if self.config.to_stream:
-                stream_handler = logging.StreamHandler()
-                stream_handler.setFormatter(logging.Formatter(base_fmt))
-
-                def emit_colored(self, record: logging.LogRecord):
-                    color = COLOR_CODES.get(record.levelname, "")
-                    if 'utf-8' in (sys.stdout.encoding or '').lower() and color:
-                        record.levelname = f"{color}{record.levelname}{RESET_CODE}"
-                        record.msg = f"{color}{record.msg}{RESET_CODE}"
-                    return logging.StreamHandler.emit(self, record)
-
-                # Patch emit with color logic
-                stream_handler.emit = emit_colored.__get__(stream_handler, logging.StreamHandler)
-                logger.addHandler(stream_handler)
-
         if not (self.config.to_stream or self.config.to_file):
             print("Warning: Logger configured with no output targets.")
 
-        return logger
+        return registry.get(self.config)
+
+    def queue(self) -> SimpleQueue:
+        """
+        Return the queue feeding this logger's writer in multiprocess mode.
+
+        Pass it to `init_worker` when workers are started with the `spawn` or
+        `forkserver` method; forked workers inherit it automatically.
+
+        Returns:
+            SimpleQueue: The queue records are sent through.
+        """
+        if not self.config.multiprocess:
+            raise ValueError("queue is only available if multiprocess is True")
+        self.get()
+        return get_writer(self.config.instance_name, []).queue
+
+    @staticmethod
+    def init_worker(queue: SimpleQueue, config: LogModel) -> None:
+        """
+        Attach a worker process's logger to the parent's writer.
+
+        Meant to be used as a pool initializer, e.g.
+        `Pool(initializer=NTLog.init_worker, initargs=(nt.queue(), config))`.
+
+        Args:
+            queue (SimpleQueue): The queue returned by `NTLog.queue()` in the parent.
+            config (LogModel): The logger configuration used in the parent.
+        """
+        registry.attach_worker(queue, config)
+
+    @staticmethod
+    def reconfigure(config: LogModel) -> logging.Logger:
+        """
+        Apply a changed config to an already configured logger.
+
+        The level is updated and only added or removed sinks are opened or closed;
+        existing handlers are kept, so references to the logger stay valid.
+
+        Args:
+            config (LogModel): The new logger configuration.
+
+        Returns:
+            logging.Logger: The reconfigured logger.
+        """
+        return registry.reconfigure(config)
+
+    @staticmethod
+    def configure(configs: Dict[str, Dict[str, Any]]) -> Dict[str, logging.Logger]:
+        """
+        Reconfigure many loggers at once.
+
+        Args:
+            configs (Dict[str, Dict[str, Any]]): `LogModel` fields keyed by instance name,
+                e.g. `{"db": {"level": "DEBUG", "to_file": True, "log_file": "db.log"}}`.
+
+        Returns:
+            Dict[str, logging.Logger]: The reconfigured loggers keyed by instance name.
+        """
+        return registry.configure(configs)
+
+    @staticmethod
+    def configure_file(path: Union[str, Path]) -> Dict[str, logging.Logger]:
+        """
+        Reconfigure loggers from a JSON file holding the mapping accepted by `configure`.
+
+        Args:
+            path (Union[str, Path]): Path to the JSON file.
+
+        Returns:
+            Dict[str, logging.Logger]: The reconfigured loggers keyed by instance name.
+        """
+        return registry.configure_file(path)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Return this logger's counters; requires `metrics=True` in its config.
+
+        Returns:
+            Dict[str, Any]: emitted, suppressed and dropped counts per level name,
+                and calls and total seconds spent in each handler.
+        """
+        if not self.config.metrics:
+            raise ValueError("metrics are only available if metrics is True")
+        self.get()
+        return registry.metrics().get(self.config.instance_name, {})
+
+    @staticmethod
+    def metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+        """
+        Return the counters of every logger configured with `metrics=True`.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Snapshots keyed by instance name.
+        """
+        return registry.metrics()
+
+    @staticmethod
+    def dump_metrics(interval: float, logger: logging.Logger) -> MetricsDumper:
+        """
+        Log `metrics_snapshot()` as one JSON record every `interval` seconds.
+
+        Args:
+            interval (float): Seconds between dumps.
+            logger (logging.Logger): Logger the snapshots are written to at INFO.
+
+        Returns:
+            MetricsDumper: The running dumper; call `stop()` to end it.
+        """
+        return MetricsDumper(
+            interval=interval,
+            source=registry.metrics,
+            sink=lambda snapshot: logger.info("metrics %s", json.dumps(snapshot, sort_keys=True)),
+        ).start()
+
+    async def flush_async(self) -> None:
+        """Wait until every record queued by an asyncio-mode logger has been written."""
+        sink = registry.async_sink(self.config.instance_name)
+        if sink is not None:
+            await sink.flush_async()
+
+    async def aclose(self) -> None:
+        """
+        Flush and shut down an asyncio-mode logger's writer task.
+
+        The logger is forgotten by the registry, so the next `get()` from a
+        running loop configures it again. Loggers left open are drained when
+        their loop cancels the writer task at shutdown.
+        """
+        sink = registry.async_sink(self.config.instance_name)
+        if sink is None:
+            return
+        registry.forget(self.config.instance_name, close_sinks=False)
+        await sink.aclose()
+
+    def read(self) -> Iterator[str]:
+        """
+        Iterate the records of this logger's `log_file`, oldest first.
+
+        Rotated segments, compressed or not, are read before the live file;
+        compressed ones are decompressed as a stream, never to disk.
+
+        Yields:
+            str: One record, with traceback lines joined to it.
+        """
+        if not self.config.log_file:
+            raise ValueError("read requires log_file to be specified")
+        return iter_records(Path(self.config.log_file))
+
+    def dump(self, reason: str = "on demand") -> int:
+        """
+        Write this logger's flight recorder to its `flight_recorder_file` now.
+
+        Args:
+            reason (str): Written in the dump header.
+
+        Returns:
+            int: Number of records written.
+        """
+        logger = self.get()
+        return sum(
+            handler.dump(reason) for handler in logger.handlers
+            if isinstance(handler, FlightRecorderHandler)
+        )
+
+    @staticmethod
+    def dump_on_signal(signum: Optional[int] = None) -> None:
+        """
+        Dump every flight recorder when the process receives a signal.
+
+        Must be called from the main thread.
+
+        Args:
+            signum (Optional[int]): The signal to listen for; defaults to `SIGUSR1`.
+        """
+        dump_on_signal(signum if signum is not None else signal.SIGUSR1)
 
     @staticmethod
     def get_default() -> logging.Logger:
-        return NTLog(LogModel(
-            instance_name="DefaultLogger",
-            level=logging.DEBUG,
-            to_stream=True
-        )).get()
+        return registry.get(DEFAULT_CONFIG)
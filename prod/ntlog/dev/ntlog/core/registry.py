@@ -0,0 +1,358 @@
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import threading
+from multiprocessing.queues import SimpleQueue
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from ntlog.base.public.models import LogModel
+from ntlog.base.private.aio import AsyncSinkHandler, get_async_sink, pop_async_sink
+from ntlog.base.private.formatter import BASE_FMT, ColorFormatter, FastFormatter, JsonFormatter
+from ntlog.base.private.metrics import LogMetrics, metered
+from ntlog.base.private.recorder import FlightRecorderHandler
+from ntlog.base.private.rotation import RotatingSegmentHandler
+from ntlog.base.private.writer import ProcessQueueHandler, get_writer, release_writer
+
+STREAM_SINK = "stream"
+FILE_SINK = "file:"
+ROTATING_SINK = "rotating:"
+FLIGHT_SINK = "flight:"
+QUEUE_SINK = "queue"
+ASYNC_SINK = "async"
+
+
+@dataclasses.dataclass
+class _Entry:
+    logger: logging.Logger
+    config: LogModel
+    sinks: Dict[str, logging.Handler]
+    # The handlers the registry put on the logger; any others are left alone
+    attached: Dict[str, logging.Handler] = dataclasses.field(default_factory=dict)
+    worker: bool = False
+    metrics: Optional[LogMetrics] = None
+
+
+class LogRegistry:
+    def __init__(self):
+        """
+        Cache configured loggers by instance name and the config that built them.
+
+        A logger is configured once; later calls with an equal `LogModel` return
+        it without touching the logger, and a changed `LogModel` is applied in
+        place: the level is set, sinks that are still wanted are kept, new sinks
+        are opened and the handler list is swapped in a single assignment.
+        Handlers added to the logger by anyone else are kept as they are.
+        """
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+
+    def get(self, config: LogModel) -> logging.Logger:
+        """
+        Return the logger for a config, configuring or reconfiguring it if needed.
+
+        Args:
+            config (LogModel): The logger configuration.
+
+        Returns:
+            logging.Logger: The cached, configured logger.
+        """
+        entry = self._entries.get(config.instance_name)
+        if entry is not None and (entry.worker or (entry.config == config and not self._async_stale(entry))):
+            return entry.logger
+
+        with self._lock:
+            return self._apply(config)
+
+    def reconfigure(self, config: LogModel) -> logging.Logger:
+        """
+        Apply a config to its logger even if an equal one was applied before.
+
+        Args:
+            config (LogModel): The new logger configuration.
+
+        Returns:
+            logging.Logger: The reconfigured logger.
+        """
+        with self._lock:
+            entry = self._entries.get(config.instance_name)
+            if entry is not None:
+                entry.worker = False
+            return self._apply(config)
+
+    def configure(self, configs: Dict[str, Dict[str, Any]]) -> Dict[str, logging.Logger]:
+        """
+        Reconfigure many loggers at once from a mapping of instance names to fields.
+
+        Levels may be given as numbers or names (e.g. "DEBUG"). Fields that are
+        not given keep the value of the logger's current config, or the
+        `LogModel` default for loggers not seen before.
+
+        Args:
+            configs (Dict[str, Dict[str, Any]]): `LogModel` fields keyed by instance name.
+
+        Returns:
+            Dict[str, logging.Logger]: The reconfigured loggers keyed by instance name.
+        """
+        models = {}
+        for name, fields in configs.items():
+            fields = dict(fields)
+            if isinstance(fields.get("level"), str):
+                fields["level"] = logging.getLevelName(fields["level"].upper())
+
+            entry = self._entries.get(name)
+            if entry is not None:
+                models[name] = dataclasses.replace(entry.config, **fields)
+            else:
+                models[name] = LogModel(instance_name=name, **fields)
+
+        with self._lock:
+            return {name: self.reconfigure(model) for name, model in models.items()}
+
+    def configure_file(self, path: Union[str, Path]) -> Dict[str, logging.Logger]:
+        """
+        Reconfigure loggers from a JSON file holding the mapping accepted by `configure`.
+
+        Args:
+            path (Union[str, Path]): Path to the JSON file.
+
+        Returns:
+            Dict[str, logging.Logger]: The reconfigured loggers keyed by instance name.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"[NTLog] Config file not found: {path}")
+        return self.configure(json.loads(path.read_text(encoding="utf-8")))
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a metrics snapshot of every logger configured with `metrics=True`.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Snapshots keyed by instance name.
+        """
+        return {
+            name: entry.metrics.snapshot()
+            for name, entry in list(self._entries.items())
+            if entry.metrics is not None and entry.metrics.enabled
+        }
+
+    def forget(self, name: str, close_sinks: bool = True) -> None:
+        """
+        Detach a logger's handlers and drop it from the cache.
+
+        Args:
+            name (str): The logger instance name.
+            close_sinks (bool): If False, leave the output sinks open for their current owner.
+        """
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is None:
+                return
+            self._swap_handlers(entry.logger, entry.attached, {})
+            if entry.metrics is not None:
+                entry.logger.removeFilter(entry.metrics.filter)
+                entry.metrics.unwatch(entry.logger)
+            pop_async_sink(name)
+            if entry.config.multiprocess:
+                release_writer(name)
+            for key, handler in entry.sinks.items():
+                if close_sinks or key.startswith(FLIGHT_SINK):
+                    handler.close()
+
+    def async_sink(self, name: str) -> Optional[AsyncSinkHandler]:
+        """
+        Return the async sink attached to a logger, if it runs in asyncio mode.
+
+        Args:
+            name (str): The logger instance name.
+
+        Returns:
+            Optional[AsyncSinkHandler]: The sink, or None.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        return entry.attached.get(ASYNC_SINK)
+
+    def attach_worker(self, queue: SimpleQueue, config: LogModel) -> logging.Logger:
+        """
+        Point a worker process's logger at its parent's writer queue.
+
+        The entry is pinned, so `get` in the worker returns the queue-backed
+        logger instead of opening sinks of its own.
+
+        Args:
+            queue (SimpleQueue): The queue of the parent's writer.
+            config (LogModel): The logger configuration used in the parent.
+
+        Returns:
+            logging.Logger: The worker's logger.
+        """
+        with self._lock:
+            logger = logging.getLogger(config.instance_name)
+            # A forked worker inherits the parent's entry and handlers
+            inherited = self._entries.get(config.instance_name)
+            attached = {QUEUE_SINK: ProcessQueueHandler(queue)}
+            self._swap_handlers(logger, inherited.attached if inherited else {}, attached)
+            logger.setLevel(config.level)
+            self._entries[config.instance_name] = _Entry(
+                logger=logger, config=dataclasses.replace(config), sinks={}, attached=attached, worker=True
+            )
+            return logger
+
+    def _apply(self, config: LogModel) -> logging.Logger:
+        entry = self._entries.get(config.instance_name)
+        if entry is None:
+            logger = logging.getLogger(config.instance_name)
+            entry = _Entry(logger=logger, config=config, sinks={})
+        elif entry.config == config and not self._async_stale(entry):
+            return entry.logger
+
+        old_sinks = entry.sinks
+        sinks: Dict[str, logging.Handler] = {}
+        for key in self._sink_keys(config):
+            sinks[key] = old_sinks.get(key) or self._make_sink(key)
+            if key.startswith(FLIGHT_SINK):
+                continue
+            if key not in old_sinks or entry.config.json_format != config.json_format:
+                sinks[key].setFormatter(self._make_formatter(key, config))
+            if key.startswith(ROTATING_SINK):
+                sinks[key].maxBytes = config.max_bytes
+                sinks[key].compression = config.compression
+                sinks[key].retention_bytes = config.retention_bytes
+
+        handlers = [h for key, h in sinks.items() if not key.startswith(FLIGHT_SINK)]
+        recorders = [h for key, h in sinks.items() if key.startswith(FLIGHT_SINK)]
+
+        # A flight recorder sees every level, so the level moves from the
+        # logger to the output sinks
+        capture_all = bool(recorders)
+        sink_level = config.level if capture_all else logging.NOTSET
+        for handler in handlers:
+            handler.setLevel(sink_level)
+
+        logger = entry.logger
+        logger.setLevel(min(config.level, logging.DEBUG) if capture_all else config.level)
+
+        # Multiprocess mode: one writer in this process owns the sinks,
+        # the logger (and every forked child) only enqueues records
+        if config.multiprocess and handlers:
+            writer = get_writer(config.instance_name, handlers)
+            writer.swap(handlers)
+            queue_handlers = [h for key, h in entry.attached.items() if key.startswith(QUEUE_SINK)]
+            queue_handlers = queue_handlers or [metered(ProcessQueueHandler)(writer.queue)]
+            for handler in queue_handlers:
+                handler.setLevel(sink_level)
+            attached = {f"{QUEUE_SINK}{i or ''}": h for i, h in enumerate(queue_handlers)}
+        # Asyncio mode: emits only enqueue, a task on the running loop writes
+        elif config.asyncio and handlers:
+            async_sink = get_async_sink(config.instance_name, handlers)
+            async_sink.swap(handlers)
+            async_sink.setLevel(sink_level)
+            attached = {ASYNC_SINK: async_sink}
+        else:
+            if entry.config.multiprocess:
+                release_writer(config.instance_name)
+            attached = {key: h for key, h in sinks.items() if not key.startswith(FLIGHT_SINK)}
+        if not config.asyncio and entry.config.asyncio:
+            async_sink = pop_async_sink(config.instance_name)
+            if async_sink is not None:
+                async_sink.detach()
+        attached.update((key, h) for key, h in sinks.items() if key.startswith(FLIGHT_SINK))
+
+        if config.metrics:
+            if entry.metrics is None:
+                entry.metrics = LogMetrics(config.instance_name, config.level)
+            entry.metrics.level = config.level
+            entry.metrics.enabled = True
+            for key, handler in attached.items():
+                entry.metrics.instrument(handler, key)
+            logger.addFilter(entry.metrics.filter)
+            entry.metrics.watch(logger)
+        elif entry.metrics is not None:
+            entry.metrics.enabled = False
+            logger.removeFilter(entry.metrics.filter)
+            entry.metrics.unwatch(logger)
+
+        self._swap_handlers(logger, entry.attached, attached)
+
+        # Closed only now: the writer no longer holds them once `swap` returned
+        for key, handler in old_sinks.items():
+            if key not in sinks:
+                handler.close()
+
+        entry.config = dataclasses.replace(config)
+        entry.sinks = sinks
+        entry.attached = attached
+        self._entries[config.instance_name] = entry
+        return logger
+
+    def _async_stale(self, entry: _Entry) -> bool:
+        # An asyncio logger reused from a later loop (e.g. a second `asyncio.run`)
+        # must get a new writer task; the old one would write on the loop thread
+        if not entry.config.asyncio:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        sink = entry.attached.get(ASYNC_SINK)
+        return sink is not None and not sink.bound_to(loop)
+
+    @staticmethod
+    def _swap_handlers(logger: logging.Logger, old: Dict[str, logging.Handler], new: Dict[str, logging.Handler]) -> None:
+        # One assignment, so a concurrent call sees either list; foreign handlers keep their place
+        owned = set(map(id, old.values()))
+        logger.handlers = [h for h in logger.handlers if id(h) not in owned] + list(new.values())
+
+    def _sink_keys(self, config: LogModel) -> List[str]:
+        keys = []
+        if config.to_file:
+            if not config.log_file:
+                raise ValueError("log_file must be specified if to_file is True")
+            prefix = ROTATING_SINK if config.max_bytes else FILE_SINK
+            keys.append(f"{prefix}{Path(config.log_file).resolve()}")
+        if config.to_stream:
+            keys.append(STREAM_SINK)
+        if config.flight_recorder:
+            if not config.flight_recorder_file:
+                raise ValueError("flight_recorder_file must be specified if flight_recorder is set")
+            keys.append(f"{FLIGHT_SINK}{config.flight_recorder}:{Path(config.flight_recorder_file).resolve()}")
+        return keys
+
+    def _make_formatter(self, key: str, config: LogModel) -> logging.Formatter:
+        if config.json_format:
+            return JsonFormatter()
+        # Color only on the stream
+        if key == STREAM_SINK:
+            return ColorFormatter(BASE_FMT)
+        return FastFormatter(BASE_FMT)
+
+    def _make_sink(self, key: str) -> logging.Handler:
+        if key == STREAM_SINK:
+            return metered(logging.StreamHandler)()
+
+        # In-memory ring of recent records, dumped on error
+        if key.startswith(FLIGHT_SINK):
+            capacity, dump_file = key[len(FLIGHT_SINK):].split(":", 1)
+            return metered(FlightRecorderHandler)(int(capacity), Path(dump_file))
+
+        # Size-rotated file; rotation settings are applied by _apply
+        if key.startswith(ROTATING_SINK):
+            log_path = Path(key[len(ROTATING_SINK):])
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            return metered(RotatingSegmentHandler)(str(log_path), max_bytes=0)
+
+        log_path = Path(key[len(FILE_SINK):])
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        return metered(logging.FileHandler)(str(log_path), encoding='utf-8')
+
+    def _after_fork_in_child(self) -> None:
+        self._lock = threading.RLock()
+
+
+registry = LogRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._after_fork_in_child)
@@ -0,0 +1,170 @@
+import functools
+import inspect
+import itertools
+import json
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+from ntlog.base.private.histogram import Histogram
+
+_ids = itertools.count(1)
+_current: ContextVar[Optional["Span"]] = ContextVar("ntlog_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+class NTSpan:
+    def __init__(self, logger: logging.Logger, flush_interval: Optional[float] = 60.0, log_spans: bool = False):
+        """
+        Time code sections and report them as periodic histogram summaries.
+
+        Every finished span adds its wall and CPU time to a per-name histogram;
+        `flush` logs all histograms as a single INFO record and resets them.
+
+        Args:
+            logger (logging.Logger): Logger the summaries are written to, e.g. `NTLog(config).get()`.
+            flush_interval (Optional[float]): Seconds between automatic flushes, or None to flush manually.
+            log_spans (bool): Also log every finished span at DEBUG with its ids.
+        """
+        self.logger = logger
+        self.flush_interval = flush_interval
+        self.log_spans = log_spans
+
+        self._wall: Dict[str, Histogram] = {}
+        self._cpu: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if flush_interval:
+            self.start()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """
+        Time the enclosed block.
+
+        Spans opened inside the block, in the same thread or task, get this
+        span's id as their `parent_id`. CPU time is the thread's, so in asyncio
+        code it includes other tasks that ran while the span was suspended.
+
+        Args:
+            name (str): Histogram name for the block.
+
+        Yields:
+            Span: The running span; `wall` and `cpu` are filled in when it ends.
+        """
+        parent = _current.get()
+        current = Span(name=name, span_id=next(_ids), parent_id=parent.span_id if parent else None)
+        token = _current.set(current)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield current
+        finally:
+            current.cpu = time.thread_time() - cpu_start
+            current.wall = time.perf_counter() - wall_start
+            _current.reset(token)
+            self._record(current)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorate a function so that every call runs inside a span.
+
+        Coroutine functions are timed until the awaited call completes; their
+        CPU time is that of the loop thread, so it includes other tasks run
+        while the call is suspended.
+
+        Args:
+            name (Optional[str]): Histogram name; defaults to the function's qualified name.
+
+        Returns:
+            Callable: The decorator.
+        """
+        def decorator(func: Callable) -> Callable:
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Return the current wall and CPU statistics of every span name.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: `{name: {"wall": {...}, "cpu": {...}}}`.
+        """
+        with self._lock:
+            return {
+                name: {"wall": self._wall[name].summary(), "cpu": self._cpu[name].summary()}
+                for name in self._wall
+            }
+
+    def flush(self) -> None:
+        """Log the statistics collected since the last flush as one record and reset them."""
+        with self._lock:
+            wall, cpu = self._wall, self._cpu
+            self._wall, self._cpu = {}, {}
+        if not wall:
+            return
+
+        summary = {name: {"wall": wall[name].summary(), "cpu": cpu[name].summary()} for name in wall}
+        self.logger.info("span summary %s", json.dumps(summary, sort_keys=True), extra={"spans": summary})
+
+    def start(self) -> None:
+        """Start the periodic flush thread."""
+        if self._thread is not None or not self.flush_interval:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ntlog-span-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the periodic flush thread and flush what is left."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            wall = self._wall.get(span.name)
+            if wall is None:
+                wall = self._wall[span.name] = Histogram()
+                self._cpu[span.name] = Histogram()
+            wall.add(span.wall)
+            self._cpu[span.name].add(span.cpu)
+
+        if self.log_spans:
+            self.logger.debug(
+                "span %s id=%d parent=%s wall=%.3fms cpu=%.3fms",
+                span.name, span.span_id, span.parent_id, span.wall * 1000, span.cpu * 1000,
+            )
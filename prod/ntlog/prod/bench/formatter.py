@@ -0,0 +1,61 @@
+import argparse
+import logging
+import time
+
+from ntlog.base.private.formatter import BASE_FMT, FastFormatter  # type: ignore
+
+
+def make_records(count: int) -> list:
+    return [
+        logging.LogRecord(
+            name="bench", level=logging.INFO, pathname=__file__, lineno=i,
+            msg="request %d served in %.3f ms", args=(i, i * 0.001), exc_info=None,
+        )
+        for i in range(count)
+    ]
+
+
+def spread(records: list, seconds: int) -> None:
+    # Spread records over a few seconds like a busy service would
+    start = time.time()
+    step = seconds / max(len(records), 1)
+    for i, record in enumerate(records):
+        record.created = start + i * step
+        record.msecs = (record.created - int(record.created)) * 1000
+
+
+def bench(formatter: logging.Formatter, records: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - started)
+    return len(records) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare FastFormatter with logging.Formatter.")
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--seconds", type=int, default=5, help="Wall-clock span the records are spread over.")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    spread(records, args.seconds)
+
+    stdlib = logging.Formatter(BASE_FMT)
+    fast = FastFormatter(BASE_FMT)
+    for record in records[:100]:
+        assert stdlib.format(record) == fast.format(record)
+
+    stdlib_rate = bench(stdlib, records, args.rounds)
+    fast_rate = bench(fast, records, args.rounds)
+
+    print(f"[Bench] logging.Formatter : {stdlib_rate:>12,.0f} records/s")
+    print(f"[Bench] FastFormatter     : {fast_rate:>12,.0f} records/s")
+    print(f"[Bench] Speedup           : {fast_rate / stdlib_rate:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
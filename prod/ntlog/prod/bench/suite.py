@@ -0,0 +1,226 @@
+import argparse
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ntlog import NTLog  # type: ignore
+from ntlog.base.public.models import LogModel  # type: ignore
+from ntlog.base.private.formatter import BASE_FMT  # type: ignore
+from ntlog.base.private.writer import stop_writers  # type: ignore
+
+SCENARIOS = ["stream", "file", "queue", "json", "disabled"]
+IMPLS = ["ntlog", "stdlib"]
+
+# Written on every run; lower is a regression for rate, higher for latency
+RATE_KEY = "records_per_s"
+LATENCY_KEY = "p99_us"
+
+
+class _StdlibJsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        })
+
+
+def setup_ntlog(scenario: str, name: str, tmp: Path, devnull) -> Tuple[logging.Logger, int, Callable]:
+    level = logging.DEBUG if scenario == "disabled" else logging.INFO
+    config = LogModel(
+        instance_name=name,
+        level=logging.WARNING if scenario == "disabled" else logging.INFO,
+        to_stream=scenario == "stream",
+        to_file=scenario != "stream",
+        log_file=None if scenario == "stream" else tmp / f"{name}.log",
+        multiprocess=scenario == "queue",
+        json_format=scenario == "json",
+    )
+    logger = NTLog(config).get()
+    for handler in logger.handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(devnull)
+    return logger, level, stop_writers
+
+
+def setup_stdlib(scenario: str, name: str, tmp: Path, devnull) -> Tuple[logging.Logger, int, Callable]:
+    level = logging.DEBUG if scenario == "disabled" else logging.INFO
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.WARNING if scenario == "disabled" else logging.INFO)
+    logger.propagate = False
+
+    if scenario == "stream":
+        handler: logging.Handler = logging.StreamHandler(devnull)
+    else:
+        handler = logging.FileHandler(str(tmp / f"{name}.log"), encoding="utf-8")
+    handler.setFormatter(_StdlibJsonFormatter() if scenario == "json" else logging.Formatter(BASE_FMT))
+
+    stop = lambda: None
+    if scenario == "queue":
+        # The documented stdlib pattern: QueueHandler in producers, QueueListener writes
+        queue = multiprocessing.Queue(-1)
+        listener = logging.handlers.QueueListener(queue, handler)
+        listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(queue))
+        stop = listener.stop
+    else:
+        logger.addHandler(handler)
+    return logger, level, stop
+
+
+def _log_loop(logger: logging.Logger, level: int, count: int) -> List[int]:
+    log = logger.log
+    clock = time.perf_counter_ns
+    latencies = [0] * count
+    for i in range(count):
+        started = clock()
+        log(level, "bench record %d of %s", i, "worker")
+        latencies[i] = clock() - started
+    return latencies
+
+
+def _process_worker(args) -> List[int]:
+    name, level, count = args
+    return _log_loop(logging.getLogger(name), level, count)
+
+
+def run_threads(logger: logging.Logger, level: int, threads: int, count: int) -> Tuple[float, List[int]]:
+    barrier = threading.Barrier(threads + 1)
+    results: List[List[int]] = []
+
+    def worker():
+        barrier.wait()
+        results.append(_log_loop(logger, level, count))
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return elapsed, [lat for result in results for lat in result]
+
+
+def run_processes(name: str, level: int, processes: int, count: int) -> Tuple[float, List[int]]:
+    # Forked workers inherit the configured logger, as a process pool would.
+    # close/join rather than terminate so stdlib queue feeders can flush.
+    pool = multiprocessing.get_context("fork").Pool(processes)
+    started = time.perf_counter()
+    results = pool.map(_process_worker, [(name, level, count)] * processes)
+    elapsed = time.perf_counter() - started
+    pool.close()
+    pool.join()
+    return elapsed, [lat for result in results for lat in result]
+
+
+def percentile(values: List[int], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * (len(values) - 1)))] / 1000
+
+
+def run_case(impl: str, scenario: str, threads: int, processes: int, count: int, tmp: Path, devnull) -> Dict:
+    name = f"bench.{impl}.{scenario}.t{threads}.p{processes}"
+    setup = setup_ntlog if impl == "ntlog" else setup_stdlib
+    logger, level, stop = setup(scenario, name, tmp, devnull)
+
+    if processes > 1:
+        elapsed, latencies = run_processes(name, level, processes, count)
+    else:
+        elapsed, latencies = run_threads(logger, level, threads, count)
+    stop()
+
+    latencies.sort()
+    return {
+        "impl": impl,
+        "scenario": scenario,
+        "threads": threads,
+        "processes": processes,
+        "records": len(latencies),
+        "seconds": round(elapsed, 6),
+        RATE_KEY: round(len(latencies) / elapsed, 1),
+        "p50_us": round(percentile(latencies, 0.50), 3),
+        LATENCY_KEY: round(percentile(latencies, 0.99), 3),
+    }
+
+
+def compare(results: List[Dict], baseline_path: Path, tolerance: float) -> List[str]:
+    """Return a message for every case that regressed against the baseline."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    key = lambda r: (r["impl"], r["scenario"], r["threads"], r["processes"])
+    previous = {key(r): r for r in baseline["results"]}
+
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        if result[RATE_KEY] < before[RATE_KEY] * (1 - tolerance):
+            regressions.append(f"{key(result)}: {RATE_KEY} {before[RATE_KEY]} -> {result[RATE_KEY]}")
+        if result[LATENCY_KEY] > before[LATENCY_KEY] * (1 + tolerance):
+            regressions.append(f"{key(result)}: {LATENCY_KEY} {before[LATENCY_KEY]} -> {result[LATENCY_KEY]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of NTLog loggers against stdlib logging.")
+    parser.add_argument("--records", type=int, default=20_000, help="Records logged per thread or process.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--processes", type=int, default=4, help="Also run each scenario in this many processes (0 to skip).")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "results" / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression.")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for scenario in args.scenarios:
+            runs = [(threads, 1) for threads in args.threads]
+            if args.processes > 1:
+                runs.append((1, args.processes))
+            for threads, processes in runs:
+                for impl in IMPLS:
+                    result = run_case(impl, scenario, threads, processes, args.records, Path(tmp), devnull)
+                    results.append(result)
+                    print(
+                        f"[Bench] {impl:<6} {scenario:<8} t={threads:<2} p={processes:<2} "
+                        f"{result[RATE_KEY]:>12,.0f} rec/s  p50 {result['p50_us']:>8.2f} us  "
+                        f"p99 {result[LATENCY_KEY]:>8.2f} us"
+                    )
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "records": args.records,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[Bench] ✅ Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"[Bench] ❌ Regression {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
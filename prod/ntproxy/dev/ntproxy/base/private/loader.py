@@ -0,0 +1,241 @@
+import csv
+import json
+import re
+
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+# (type, host, port, username, password)
+Fields = Tuple[str, str, int, Optional[str], Optional[str]]
+# A URL string or a mapping with `url` or `host`/`port` keys, as read from a file
+Item = Union[str, dict]
+
+FORMATS = ("lines", "csv", "json", "jsonl")
+SUFFIXES = {".csv": "csv", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# Runs of string content, and of text outside strings, skipped in one step
+_IN_STRING = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_OUTSIDE = re.compile(r'[^\[\]{},"]*')
+
+
+class Malformed(str):
+    """The text of a JSON array element that does not decode; rejected by `parse_item`."""
+
+
+def parse_url(line: str) -> Fields:
+    """
+    Parse `type://[user[:password]@]host:port`, with `[...]` around IPv6 hosts.
+
+    Args:
+        line (str): The proxy URL, without surrounding whitespace.
+
+    Returns:
+        Fields: The proxy fields; user and password are percent-decoded.
+
+    Raises:
+        ValueError: If the line is not a proxy URL with a port.
+    """
+    scheme, sep, rest = line.partition("://")
+    if not sep:
+        raise ValueError(f"Not a proxy URL: {line}")
+    userinfo, sep, hostport = rest.rpartition("@")
+    username = password = None
+    if sep:
+        username, _, password = userinfo.partition(":")
+        if "%" in userinfo:
+            username, password = unquote(username), unquote(password)
+        password = password or None
+
+    if hostport.startswith("["):
+        host, _, port = hostport[1:].partition("]:")
+    else:
+        host, _, port = hostport.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Proxy URL without host and port: {line}")
+    return scheme, host, int(port), username or None, password
+
+
+def parse_item(item: Item) -> Fields:
+    """
+    Parse one entry of a proxy list.
+
+    Args:
+        item (Item): A proxy URL, or a mapping with a `url` key or `host`, `port`
+            and optional `type`, `username` and `password` keys.
+
+    Returns:
+        Fields: The proxy fields.
+
+    Raises:
+        ValueError: If the entry does not describe a proxy.
+    """
+    if isinstance(item, Malformed):
+        raise ValueError(f"Malformed JSON entry: {item[:80]}")
+    if isinstance(item, str):
+        return parse_url(item.strip())
+    if not isinstance(item, dict):
+        raise ValueError(f"Not a proxy entry: {item!r}")
+    if item.get("url"):
+        return parse_url(item["url"].strip())
+    if not item.get("host") or not item.get("port"):
+        raise ValueError(f"Proxy entry without host and port: {item}")
+    return (
+        item.get("type") or "socks5h",
+        item["host"],
+        int(item["port"]),
+        item.get("username") or None,
+        item.get("password") or None,
+    )
+
+
+def iter_lines(f: IO[str]) -> Iterator[Item]:
+    """Yield every proxy URL line; blank lines and `#` comments are skipped."""
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def iter_csv(f: IO[str]) -> Iterator[Item]:
+    """Yield every CSV row, with either a `url` column or `host` and `port` columns."""
+    yield from csv.DictReader(f)
+
+
+def iter_jsonl(f: IO[str]) -> Iterator[Item]:
+    """Yield the JSON value of every line; lines that are not JSON are yielded as they are."""
+    for line in f:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
+
+
+def _element_end(text: str, pos: int, state: List) -> Tuple[int, int]:
+    # Find the depth-0 `,` or `]` that ends an array element, scanning from
+    # `pos`; `state` holds [depth, in_string] between consecutive chunks.
+    # Returns the delimiter index (or -1) and where scanning stopped.
+    depth, in_string = state
+    n = len(text)
+    while pos < n:
+        if in_string:
+            pos = _IN_STRING.match(text, pos).end()
+            if pos >= n or text[pos] == "\\":
+                # End of text, or an escape cut off by it: resume here
+                break
+            in_string = False
+            pos += 1
+            continue
+        pos = _OUTSIDE.match(text, pos).end()
+        if pos >= n:
+            break
+        char = text[pos]
+        if char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}" and depth:
+            depth -= 1
+        elif char in ",]" and not depth:
+            state[:] = [depth, in_string]
+            return pos, pos
+        pos += 1
+    state[:] = [depth, in_string]
+    return -1, pos
+
+
+def iter_json(f: IO[str], chunk_size: int = 1 << 20, max_item_size: int = 1 << 16) -> Iterator[Item]:
+    """
+    Yield every element of a top-level JSON array, reading the file in chunks.
+
+    Elements are decoded one at a time with `JSONDecoder.raw_decode`, so the
+    whole document is never held in memory. An element that does not decode
+    is skipped up to the next `,` or `]` outside strings and brackets and
+    yielded as `Malformed`, so it is counted as invalid and loading goes on;
+    an element longer than `max_item_size` is skipped without being buffered.
+
+    Args:
+        f (IO[str]): The open file.
+        chunk_size (int): Characters read at a time.
+        max_item_size (int): Characters buffered for one element.
+
+    Yields:
+        Item: One array element.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("A JSON proxy list must be an array")
+    pos = 1
+    eof = False
+    # Set while looking for the end of an element raw_decode could not take
+    scan: Optional[List] = None
+    scan_pos = 0
+    oversized = False
+    while True:
+        if scan is None:
+            # Skip separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # A number or literal may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield item
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                pass
+            scan, scan_pos = [0, False], pos
+
+        end, scan_pos = _element_end(buffer, scan_pos, scan)
+        if end >= 0 or eof:
+            text = buffer[pos:end if end >= 0 else len(buffer)].strip()
+            scan = None
+            if oversized:
+                oversized = False
+                yield Malformed(text[:80])
+            elif text:
+                try:
+                    item, item_end = decoder.raw_decode(text)
+                    yield item if item_end == len(text) else Malformed(text)
+                except json.JSONDecodeError:
+                    yield Malformed(text)
+            if end < 0:
+                return
+            pos = end
+            continue
+
+        if scan_pos - pos > max_item_size:
+            # Keep scanning the element, but stop holding on to it
+            oversized = True
+            pos = scan_pos
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        scan_pos -= pos
+        pos = 0
+
+
+def iter_file(path: Path, format: Optional[str] = None) -> Iterator[Item]:
+    """
+    Stream the entries of a proxy list file; parse them with `parse_item`.
+
+    Args:
+        path (Path): The proxy list.
+        format (Optional[str]): One of `FORMATS`; guessed from the suffix if None.
+
+    Yields:
+        Item: One entry at a time.
+    """
+    path = Path(path)
+    format = format or SUFFIXES.get(path.suffix.lower(), "lines")
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported proxy list format: {format}")
+    readers = {"lines": iter_lines, "csv": iter_csv, "json": iter_json, "jsonl": iter_jsonl}
+    with open(path, encoding="utf-8", newline="" if format == "csv" else None) as f:
+        yield from readers[format](f)
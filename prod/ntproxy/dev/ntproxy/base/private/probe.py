@@ -0,0 +1,38 @@
+import socket
+import time
+
+from ntproxy.base.public.models import ProxyModel
+
+
+def probe(proxy: ProxyModel, timeout: float) -> float:
+    """
+    Time a SOCKS5 greeting with a proxy.
+
+    Opens a TCP connection, offers the auth method the proxy is configured
+    for and waits for the method selection; no tunnel is requested.
+
+    Args:
+        proxy (ProxyModel): The proxy to probe.
+        timeout (float): Seconds allowed for connecting and for the reply.
+
+    Returns:
+        float: Seconds from connect to the proxy's reply.
+
+    Raises:
+        OSError: If the proxy cannot be reached or answers with anything but
+            a SOCKS5 method selection it accepts.
+    """
+    method = 0x02 if proxy.username else 0x00
+    started = time.perf_counter()
+    with socket.create_connection((proxy.host, proxy.port), timeout=timeout) as sock:
+        sock.settimeout(timeout)
+        sock.sendall(bytes([5, 1, method]))
+        reply = b""
+        while len(reply) < 2:
+            chunk = sock.recv(2 - len(reply))
+            if not chunk:
+                raise ConnectionError(f"{proxy.key} closed the connection")
+            reply += chunk
+    if reply[0] != 5 or reply[1] != method:
+        raise ConnectionError(f"{proxy.key} rejected the greeting: {reply.hex()}")
+    return time.perf_counter() - started
@@ -0,0 +1,83 @@
+import dataclasses
+import sqlite3
+import time
+
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+from ntproxy.base.public.models import ProxyStats
+
+SCHEMA_VERSION = 1
+FIELDS = [field.name for field in dataclasses.fields(ProxyStats)]
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=10.0)
+    # WAL keeps checkpoints from blocking readers and makes them one fsync at most
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.execute("DROP TABLE IF EXISTS proxy_stats")
+        conn.execute(
+            "CREATE TABLE proxy_stats (key TEXT PRIMARY KEY, "
+            + ", ".join(f"{name} REAL" for name in FIELDS)
+            + ", updated REAL NOT NULL)"
+        )
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.commit()
+    return conn
+
+
+def save_state(path: Path, rows: Iterable[Tuple[str, ProxyStats]]) -> int:
+    """
+    Upsert proxy statistics in one transaction.
+
+    Args:
+        path (Path): The SQLite state file; created, with its directory, if missing.
+        rows (Iterable[Tuple[str, ProxyStats]]): Statistics per proxy key.
+
+    Returns:
+        int: Number of rows written.
+    """
+    now = time.time()
+    values = [(key, *dataclasses.astuple(stats), now) for key, stats in rows]
+    if not values:
+        return 0
+    columns = ", ".join(["key", *FIELDS, "updated"])
+    placeholders = ", ".join("?" * (len(FIELDS) + 2))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with closing(_connect(path)) as conn, conn:
+        conn.executemany(f"INSERT OR REPLACE INTO proxy_stats ({columns}) VALUES ({placeholders})", values)
+    return len(values)
+
+
+def load_state(path: Path, max_age: float = 0.0) -> Dict[str, ProxyStats]:
+    """
+    Read the proxy statistics saved by `save_state`.
+
+    Args:
+        path (Path): The SQLite state file.
+        max_age (float): Skip rows last saved more than this many seconds ago; 0 keeps all.
+
+    Returns:
+        Dict[str, ProxyStats]: Statistics per proxy key; empty if the file does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    query = f"SELECT key, {', '.join(FIELDS)} FROM proxy_stats"
+    params: Tuple = ()
+    if max_age:
+        query += " WHERE updated >= ?"
+        params = (time.time() - max_age,)
+
+    with closing(_connect(path)) as conn:
+        state = {}
+        for key, *values in conn.execute(query, params):
+            stats = ProxyStats(*values)
+            # SQLite REAL columns come back as floats
+            for name in ("successes", "failures", "consecutive_failures", "ejections"):
+                setattr(stats, name, int(getattr(stats, name)))
+            state[key] = stats
+        return state
@@ -1,4 +1,3 @@
-
 from dataclasses import dataclass
 from typing import Optional
 
@@ -14,4 +13,27 @@ class ProxyModel:
 
     def __post_init__(self):
         if self.type not in self.TYPES:
-            raise ValueError(f"Unsupported proxy type: {self.type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported proxy type: {self.type}")
+
+    @property
+    def key(self) -> str:
+        """Identity of the proxy; the password is left out."""
+        user = f"{self.username}@" if self.username else ""
+        return f"{self.type}://{user}{self.host}:{self.port}"
+
+@dataclass
+class ProxyStats:
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    last_probe: float = 0.0
+
+@dataclass
+class LoadStats:
+    added: int = 0
+    duplicates: int = 0
+    invalid: int = 0
@@ -1,19 +1,31 @@
 
-from typing import List, Optional
+from pathlib import Path
+from typing import List, Optional, Set
 from ntproxy.base.public.models import ProxyModel
+from ntproxy.core.pool import ProxyPool
+from ntproxy.core.rotation import ROTATIONS, Rotation
+from ntproxy.core.store import ProxyStore
 
 class NTProxy:
     def __init__(self):
         self.proxies:List[Optional[ProxyModel]] = []
+        self._keys: Set[str] = set()
 
-    def add(self, proxy: ProxyModel):
+    def add(self, proxy: ProxyModel) -> bool:
         """
-        Add a new proxy configuration to the list.
+        Add a new proxy configuration to the list, unless one with the same key was added.
 
         Args:
             proxy (ProxyModel): The proxy instance to be added.
+
+        Returns:
+            bool: True if it was added, False if it is a duplicate.
         """
+        if proxy.key in self._keys:
+            return False
+        self._keys.add(proxy.key)
         self.proxies.append(proxy)
+        return True
 
     def get(self) -> List[Optional[ProxyModel]]:
         """
@@ -22,4 +34,51 @@ class NTProxy:
         Returns:
             List[Optional[ProxyModel]]: The list of proxies added to the container.
         """
-        return self.proxies
\ No newline at end of file
+        return self.proxies
+
+    @staticmethod
+    def load(path: Path, format: Optional[str] = None) -> ProxyStore:
+        """
+        Stream a large proxy list into a compact, deduplicated store.
+
+        The store can be passed wherever proxies are expected, e.g. `ProxyPool(store)`.
+
+        Args:
+            path (Path): Proxy URL lines, CSV, a JSON array or JSON lines.
+            format (Optional[str]): "lines", "csv", "json" or "jsonl"; guessed from the suffix if None.
+
+        Returns:
+            ProxyStore: The loaded proxies.
+        """
+        store = ProxyStore()
+        stats = store.load(path, format)
+        if stats.invalid:
+            print(f"[NTProxy] Skipped {stats.invalid} invalid entries in {path}")
+        return store
+
+    def pool(self, **kwargs) -> ProxyPool:
+        """
+        Build a health-checked pool from the added proxies.
+
+        Args:
+            **kwargs: Options passed to `ProxyPool`, e.g. `strategy` or `probe_interval`.
+
+        Returns:
+            ProxyPool: The pool; call `start()` on it to run background probes.
+        """
+        return ProxyPool([proxy for proxy in self.proxies if proxy is not None], **kwargs)
+
+    def rotation(self, strategy: str = "round_robin", **kwargs) -> Rotation:
+        """
+        Build a thread-safe rotation over the added proxies.
+
+        Args:
+            strategy (str): One of "round_robin", "weighted", "sticky" or "least_in_flight".
+            **kwargs: Options of the rotation class, e.g. `replicas` for "sticky".
+
+        Returns:
+            Rotation: The rotation.
+        """
+        if strategy not in ROTATIONS:
+            raise ValueError(f"Unsupported rotation: {strategy}")
+        return ROTATIONS[strategy]([proxy for proxy in self.proxies if proxy is not None], **kwargs)
\ No newline at end of file
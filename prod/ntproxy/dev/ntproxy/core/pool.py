@@ -0,0 +1,390 @@
+import bisect
+import dataclasses
+import itertools
+import random
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ntproxy.base.private.probe import probe
+from ntproxy.base.private.state import load_state, save_state
+from ntproxy.base.public.models import ProxyModel, ProxyStats
+
+STRATEGIES = ("best", "p2c", "weighted")
+
+# Floor for scores so unmeasured or very fast proxies do not get infinite weight
+_MIN_SCORE = 0.001
+
+
+def score(stats: ProxyStats, latency_prior: float = 5.0) -> float:
+    """
+    Expected seconds per successful connection: EWMA latency inflated by the error rate.
+
+    Lower is better. A proxy without any outcome scores 0 so it is tried
+    early; one that has outcomes but no latency sample (it has only failed)
+    is scored with `latency_prior` instead.
+
+    Args:
+        stats (ProxyStats): The proxy's statistics.
+        latency_prior (float): Latency assumed before the first success, e.g. the probe timeout.
+
+    Returns:
+        float: The score.
+    """
+    if stats.latency is None:
+        if stats.successes + stats.failures == 0:
+            return 0.0
+        latency = latency_prior
+    else:
+        latency = stats.latency
+    return latency / max(1.0 - stats.error_rate, 0.05)
+
+
+class ProxyPool:
+    def __init__(
+        self,
+        proxies: Iterable[ProxyModel] = (),
+        strategy: str = "p2c",
+        probe_interval: float = 30.0,
+        probe_timeout: float = 5.0,
+        probe_workers: int = 32,
+        alpha: float = 0.3,
+        eject_failures: int = 3,
+        eject_error_rate: float = 0.5,
+        min_samples: int = 10,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        refresh_interval: float = 0.05,
+        state_file: Optional[Path] = None,
+        checkpoint_interval: float = 60.0,
+        max_state_age: float = 86400.0,
+    ):
+        """
+        A pool of proxies scored by health probes and by the outcomes callers report.
+
+        Every proxy keeps an EWMA of its latency and error rate. A proxy is
+        ejected after `eject_failures` consecutive failures, or once its error
+        rate reaches `eject_error_rate` over at least `min_samples` outcomes.
+        It stays out for a backoff that doubles with each ejection, then gets
+        a trial: a success re-admits it, a failure ejects it again.
+
+        `select` never takes a lock: it reads a ranked snapshot of the healthy
+        proxies that is rebuilt at most every `refresh_interval` seconds after
+        statistics change, and right away when a proxy is ejected.
+
+        With a `state_file`, statistics saved by an earlier run are restored
+        when proxies are added, so a restarted pool ranks and ejects proxies
+        from its first selection. Only statistics changed since the last
+        checkpoint are written.
+
+        Args:
+            proxies (Iterable[ProxyModel]): Initial proxies.
+            strategy (str): Default selection strategy, one of `STRATEGIES`.
+            probe_interval (float): Seconds between background probe rounds.
+            probe_timeout (float): Seconds allowed for one probe.
+            probe_workers (int): Maximum number of concurrent probes.
+            alpha (float): EWMA smoothing factor; higher follows recent samples faster.
+            eject_failures (int): Consecutive failures that eject a proxy.
+            eject_error_rate (float): Error rate that ejects a proxy.
+            min_samples (int): Outcomes needed before the error rate can eject.
+            base_backoff (float): Seconds out after the first ejection.
+            max_backoff (float): Upper bound of the ejection backoff.
+            refresh_interval (float): Minimum seconds between snapshot rebuilds.
+            state_file (Optional[Path]): SQLite file statistics are restored from and checkpointed to.
+            checkpoint_interval (float): Seconds between checkpoints while the pool is started.
+            max_state_age (float): Ignore saved statistics older than this many seconds; 0 keeps all.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported strategy: {strategy}")
+        self.strategy = strategy
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.probe_workers = probe_workers
+        self.alpha = alpha
+        self.eject_failures = eject_failures
+        self.eject_error_rate = eject_error_rate
+        self.min_samples = min_samples
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.refresh_interval = refresh_interval
+        self.state_file = Path(state_file) if state_file else None
+        self.checkpoint_interval = checkpoint_interval
+
+        self._proxies: Dict[str, ProxyModel] = {}
+        self._stats: Dict[str, ProxyStats] = {}
+        self._lock = threading.Lock()
+
+        # Replaced as a whole, never mutated: (healthy proxies best first, cumulative weights)
+        self._view: Tuple[Tuple[ProxyModel, ...], List[float]] = ((), [])
+        self._dirty = False
+        self._refreshed = 0.0
+        self._next_readmit = float("inf")
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._changed: Set[str] = set()
+        self._restored: Dict[str, ProxyStats] = {}
+        self._checkpointer: Optional[threading.Thread] = None
+        if self.state_file is not None:
+            self._restored = load_state(self.state_file, max_state_age)
+
+        for proxy in proxies:
+            self.add(proxy)
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def add(self, proxy: ProxyModel) -> None:
+        """
+        Add a proxy; adding one with the same key again keeps its statistics.
+
+        A proxy seen in the state file starts from its saved statistics.
+
+        Args:
+            proxy (ProxyModel): The proxy to add.
+        """
+        with self._lock:
+            self._proxies[proxy.key] = proxy
+            if proxy.key not in self._stats:
+                self._stats[proxy.key] = self._restored.pop(proxy.key, None) or ProxyStats()
+            self._invalidate()
+
+    def remove(self, proxy: ProxyModel) -> None:
+        """
+        Remove a proxy and forget its statistics.
+
+        Args:
+            proxy (ProxyModel): The proxy to remove.
+        """
+        with self._lock:
+            self._proxies.pop(proxy.key, None)
+            self._stats.pop(proxy.key, None)
+            self._invalidate()
+
+    def select(self, strategy: Optional[str] = None) -> ProxyModel:
+        """
+        Pick a healthy proxy.
+
+        "best" returns the lowest score of the last snapshot, "p2c" samples two
+        healthy proxies and keeps the one with the lower current score, and
+        "weighted" draws with probability inversely proportional to the score.
+
+        Args:
+            strategy (Optional[str]): Overrides the pool's default strategy.
+
+        Returns:
+            ProxyModel: The selected proxy.
+
+        Raises:
+            RuntimeError: If no proxy is healthy.
+        """
+        now = time.time()
+        if (self._dirty and now - self._refreshed >= self.refresh_interval) or now >= self._next_readmit:
+            with self._lock:
+                self._refresh(now)
+
+        ranked, cumulative = self._view
+        if not ranked:
+            raise RuntimeError("No healthy proxy in the pool")
+
+        strategy = strategy or self.strategy
+        if strategy == "best":
+            return ranked[0]
+        if strategy == "p2c":
+            if len(ranked) == 1:
+                return ranked[0]
+            i = random.randrange(len(ranked))
+            j = random.randrange(len(ranked) - 1)
+            a, b = ranked[i], ranked[j + (j >= i)]
+            sa, sb = self._stats.get(a.key), self._stats.get(b.key)
+            if sa is None or sb is None:
+                return b if sa is None else a
+            return a if score(sa, self.probe_timeout) <= score(sb, self.probe_timeout) else b
+        if strategy == "weighted":
+            return ranked[bisect.bisect_right(cumulative, random.random() * cumulative[-1])]
+        raise ValueError(f"Unsupported strategy: {strategy}")
+
+    def report(self, proxy: ProxyModel, latency: Optional[float] = None, error: bool = False) -> None:
+        """
+        Record the outcome of using a proxy.
+
+        Args:
+            proxy (ProxyModel): The proxy that was used.
+            latency (Optional[float]): Seconds the connection took, if it succeeded.
+            error (bool): Whether the connection failed.
+        """
+        with self._lock:
+            stats = self._stats.get(proxy.key)
+            if stats is None:
+                return
+            if error:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                stats.error_rate += self.alpha * (1.0 - stats.error_rate)
+                too_many = stats.successes + stats.failures >= self.min_samples
+                if stats.consecutive_failures >= self.eject_failures or (
+                    too_many and stats.error_rate >= self.eject_error_rate
+                ):
+                    self._eject(stats)
+            else:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+                stats.error_rate -= self.alpha * stats.error_rate
+                if latency is not None:
+                    if stats.latency is None:
+                        stats.latency = latency
+                    else:
+                        stats.latency += self.alpha * (latency - stats.latency)
+            self._changed.add(proxy.key)
+            self._dirty = True
+
+    def probe_all(self) -> Dict[str, Optional[float]]:
+        """
+        Probe every proxy that is healthy or due for a trial, concurrently.
+
+        Returns:
+            Dict[str, Optional[float]]: Probe latency per proxy key, None for failures.
+        """
+        now = time.time()
+        with self._lock:
+            targets = [p for key, p in self._proxies.items() if self._stats[key].ejected_until <= now]
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.probe_workers, thread_name_prefix="ntproxy-probe")
+        return {proxy.key: latency for proxy, latency in zip(targets, self._executor.map(self._probe, targets))}
+
+    def start(self) -> "ProxyPool":
+        """
+        Probe now and then every `probe_interval` seconds in a daemon thread; returns self.
+
+        With a `state_file`, also checkpoint every `checkpoint_interval` seconds.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ntproxy-health", daemon=True)
+            self._thread.start()
+            if self.state_file is not None:
+                self._checkpointer = threading.Thread(target=self._run_checkpoints, name="ntproxy-checkpoint", daemon=True)
+                self._checkpointer.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background probes and write a final checkpoint."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._checkpointer is not None:
+            self._checkpointer.join()
+            self._checkpointer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.state_file is not None:
+            self.checkpoint()
+
+    def checkpoint(self) -> int:
+        """
+        Write the statistics changed since the last checkpoint to the state file.
+
+        Returns:
+            int: Number of proxies written.
+        """
+        if self.state_file is None:
+            raise ValueError("checkpoint needs a state_file")
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            rows = [(key, dataclasses.replace(self._stats[key])) for key in changed if key in self._stats]
+        try:
+            return save_state(self.state_file, rows)
+        except sqlite3.Error:
+            # Try again with the next checkpoint
+            with self._lock:
+                self._changed |= changed
+            raise
+
+    def stats(self) -> Dict[str, ProxyStats]:
+        """
+        Copy the statistics of every proxy.
+
+        Returns:
+            Dict[str, ProxyStats]: Statistics per proxy key.
+        """
+        with self._lock:
+            return {key: dataclasses.replace(stats) for key, stats in self._stats.items()}
+
+    def healthy(self) -> List[ProxyModel]:
+        """
+        List the proxies that are not ejected, best first.
+
+        Returns:
+            List[ProxyModel]: The healthy proxies.
+        """
+        with self._lock:
+            self._refresh(time.time())
+            return list(self._view[0])
+
+    def _run(self) -> None:
+        while True:
+            self.probe_all()
+            if self._stop.wait(self.probe_interval):
+                return
+
+    def _run_checkpoints(self) -> None:
+        while not self._stop.wait(self.checkpoint_interval):
+            try:
+                self.checkpoint()
+            except sqlite3.Error as e:
+                print(f"[NTProxy] Failed to checkpoint pool state: {e}")
+
+    def _probe(self, proxy: ProxyModel) -> Optional[float]:
+        try:
+            latency: Optional[float] = probe(proxy, self.probe_timeout)
+        except OSError:
+            latency = None
+
+        with self._lock:
+            stats = self._stats.get(proxy.key)
+            if stats is not None:
+                stats.last_probe = time.time()
+                if latency is not None:
+                    # A healthy probe slowly forgives past ejections
+                    stats.ejections = max(0, stats.ejections - 1)
+        self.report(proxy, latency, error=latency is None)
+        return latency
+
+    def _eject(self, stats: ProxyStats) -> None:
+        now = time.time()
+        if stats.ejected_until > now:
+            return
+        backoff = min(self.base_backoff * 2 ** stats.ejections, self.max_backoff)
+        stats.ejections += 1
+        stats.ejected_until = now + backoff
+        # Stop handing it out right away rather than after the next refresh
+        self._refresh(now)
+
+    def _invalidate(self) -> None:
+        self._dirty = True
+        self._refreshed = 0.0
+
+    def _refresh(self, now: float) -> None:
+        scored = []
+        next_readmit = float("inf")
+        for key, proxy in self._proxies.items():
+            stats = self._stats[key]
+            if stats.ejected_until > now:
+                next_readmit = min(next_readmit, stats.ejected_until)
+                continue
+            scored.append((score(stats, self.probe_timeout), proxy))
+        scored.sort(key=lambda item: item[0])
+
+        ranked = tuple(proxy for _, proxy in scored)
+        cumulative = list(itertools.accumulate(1.0 / max(s, _MIN_SCORE) for s, _ in scored))
+        self._view = (ranked, cumulative)
+        self._next_readmit = next_readmit
+        self._dirty = False
+        self._refreshed = now
@@ -0,0 +1,268 @@
+import bisect
+import hashlib
+import heapq
+import itertools
+import random
+import threading
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+from ntproxy.base.public.models import ProxyModel
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _points(key: str, replicas: int) -> List[int]:
+    # One 64-byte digest yields eight 8-byte ring points
+    points: List[int] = []
+    for i in range((replicas + 7) // 8):
+        digest = hashlib.blake2b(f"{key}#{i}".encode(), digest_size=64).digest()
+        points.extend(int.from_bytes(digest[j:j + 8], "big") for j in range(0, 64, 8))
+    return points[:replicas]
+
+
+class Rotation(ABC):
+    def __init__(self, proxies: Iterable[ProxyModel] = ()):
+        """
+        Base of the rotation strategies.
+
+        Writers (`add`, `extend`, `remove`) serialise on a lock, build a new
+        immutable view and publish it with a single assignment; `select` reads
+        whichever view is current and never waits for a writer.
+
+        Args:
+            proxies (Iterable[ProxyModel]): Initial proxies.
+        """
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[ProxyModel, float]] = {}
+        self._view = self._build(self._entries)
+        self.extend(proxies)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, proxy: ProxyModel, weight: float = 1.0) -> None:
+        """
+        Add a proxy, or update the weight of one with the same key.
+
+        Args:
+            proxy (ProxyModel): The proxy to add.
+            weight (float): Relative share of selections, used by weighted rotation.
+        """
+        self.extend([proxy], weight)
+
+    def extend(self, proxies: Iterable[ProxyModel], weight: float = 1.0) -> None:
+        """
+        Add many proxies with a single rebuild of the view.
+
+        Args:
+            proxies (Iterable[ProxyModel]): The proxies to add.
+            weight (float): Relative share of selections of each proxy.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        with self._lock:
+            entries = dict(self._entries)
+            for proxy in proxies:
+                entries[proxy.key] = (proxy, weight)
+            self._publish(entries)
+
+    def remove(self, proxy: ProxyModel) -> None:
+        """
+        Remove a proxy; unknown proxies are ignored.
+
+        Args:
+            proxy (ProxyModel): The proxy to remove.
+        """
+        with self._lock:
+            if proxy.key not in self._entries:
+                return
+            entries = dict(self._entries)
+            del entries[proxy.key]
+            self._publish(entries)
+
+    @abstractmethod
+    def select(self, target: Optional[str] = None) -> ProxyModel:
+        """
+        Pick a proxy.
+
+        Args:
+            target (Optional[str]): Target host, used by sticky rotation.
+
+        Returns:
+            ProxyModel: The selected proxy.
+
+        Raises:
+            RuntimeError: If there is no proxy.
+        """
+        pass
+
+    def release(self, proxy: ProxyModel) -> None:
+        """
+        Report that a selected proxy is no longer in use; only least-in-flight rotation counts these.
+
+        Args:
+            proxy (ProxyModel): A proxy returned by `select`.
+        """
+
+    def _publish(self, entries: Dict[str, Tuple[ProxyModel, float]]) -> None:
+        view = self._build(entries)
+        self._entries = entries
+        self._view = view
+
+    def _build(self, entries: Dict[str, Tuple[ProxyModel, float]]):
+        return tuple(proxy for proxy, _ in entries.values())
+
+
+class RoundRobinRotation(Rotation):
+    """Hand out proxies in turn, O(1) per selection."""
+
+    def __init__(self, proxies: Iterable[ProxyModel] = ()):
+        # `next` on itertools.count is atomic under the GIL
+        self._counter = itertools.count()
+        super().__init__(proxies)
+
+    def select(self, target: Optional[str] = None) -> ProxyModel:
+        proxies = self._view
+        if not proxies:
+            raise RuntimeError("No proxy to select")
+        return proxies[next(self._counter) % len(proxies)]
+
+
+class WeightedRotation(Rotation):
+    """Pick proxies with probability proportional to their weight, O(log n) per selection."""
+
+    def __init__(self, proxies: Iterable[ProxyModel] = (), seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        super().__init__(proxies)
+
+    def _build(self, entries: Dict[str, Tuple[ProxyModel, float]]):
+        proxies = tuple(proxy for proxy, _ in entries.values())
+        cumulative = list(itertools.accumulate(weight for _, weight in entries.values()))
+        return proxies, cumulative
+
+    def select(self, target: Optional[str] = None) -> ProxyModel:
+        proxies, cumulative = self._view
+        if not proxies:
+            raise RuntimeError("No proxy to select")
+        return proxies[bisect.bisect_right(cumulative, self._random.random() * cumulative[-1])]
+
+
+class StickyRotation(Rotation):
+    def __init__(self, proxies: Iterable[ProxyModel] = (), replicas: int = 64):
+        """
+        Send every target host to the same proxy using a consistent hash ring.
+
+        Each proxy owns `replicas` points on the ring; a target goes to the
+        first point at or after its hash, O(log n) per selection. Adding or
+        removing a proxy only moves the targets of its own points.
+
+        Args:
+            proxies (Iterable[ProxyModel]): Initial proxies.
+            replicas (int): Ring points per proxy; more points spread targets more evenly.
+        """
+        self.replicas = replicas
+        super().__init__(proxies)
+
+    def _build(self, entries: Dict[str, Tuple[ProxyModel, float]]):
+        # Called with the entries about to be published; only the difference is hashed
+        previous = getattr(self, "_entries", {})
+        points, owners = getattr(self, "_view", ([], ()))
+        kept = [(point, owner) for point, owner in zip(points, owners)
+                if owner.key in entries and entries[owner.key][0] is owner]
+
+        added = []
+        for key, (proxy, _) in entries.items():
+            if key not in previous or previous[key][0] is not proxy:
+                added.extend((point, proxy) for point in _points(key, self.replicas))
+        added.sort(key=lambda point: point[0])
+
+        ring = list(heapq.merge(kept, added, key=lambda point: point[0]))
+        return [point for point, _ in ring], tuple(proxy for _, proxy in ring)
+
+    def select(self, target: Optional[str] = None) -> ProxyModel:
+        if target is None:
+            raise ValueError("StickyRotation needs a target host")
+        points, owners = self._view
+        if not owners:
+            raise RuntimeError("No proxy to select")
+        index = bisect.bisect_left(points, _hash(target))
+        return owners[index if index < len(owners) else 0]
+
+
+class LeastInFlightRotation(Rotation):
+    def __init__(self, proxies: Iterable[ProxyModel] = ()):
+        """
+        Pick the proxy with the fewest selections not yet released, O(1) per selection.
+
+        Proxies are kept in buckets by in-flight count, so selecting and
+        releasing move one proxy between neighbouring buckets. Every
+        `select` must be paired with a `release`.
+
+        Args:
+            proxies (Iterable[ProxyModel]): Initial proxies.
+        """
+        self._counts: Dict[str, int] = {}
+        self._buckets: List[Dict[str, ProxyModel]] = [{}]
+        self._min = 0
+        super().__init__(proxies)
+
+    def extend(self, proxies: Iterable[ProxyModel], weight: float = 1.0) -> None:
+        with self._lock:
+            for proxy in proxies:
+                count = self._counts.get(proxy.key)
+                if count is None:
+                    self._counts[proxy.key] = count = 0
+                    self._min = 0
+                self._entries[proxy.key] = (proxy, weight)
+                self._buckets[count][proxy.key] = proxy
+
+    def remove(self, proxy: ProxyModel) -> None:
+        with self._lock:
+            count = self._counts.pop(proxy.key, None)
+            if count is not None:
+                del self._entries[proxy.key]
+                del self._buckets[count][proxy.key]
+
+    def select(self, target: Optional[str] = None) -> ProxyModel:
+        with self._lock:
+            if not self._counts:
+                raise RuntimeError("No proxy to select")
+            while not self._buckets[self._min]:
+                self._min += 1
+            key, proxy = self._buckets[self._min].popitem()
+            count = self._counts[key] = self._min + 1
+            if count == len(self._buckets):
+                self._buckets.append({})
+            self._buckets[count][key] = proxy
+            return proxy
+
+    def release(self, proxy: ProxyModel) -> None:
+        with self._lock:
+            count = self._counts.get(proxy.key)
+            if not count:
+                return
+            del self._buckets[count][proxy.key]
+            self._counts[proxy.key] = count - 1
+            self._buckets[count - 1][proxy.key] = proxy
+            self._min = min(self._min, count - 1)
+
+    def in_flight(self) -> Dict[str, int]:
+        """
+        Return the number of unreleased selections per proxy key.
+
+        Returns:
+            Dict[str, int]: In-flight count per proxy key.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+ROTATIONS = {
+    "round_robin": RoundRobinRotation,
+    "weighted": WeightedRotation,
+    "sticky": StickyRotation,
+    "least_in_flight": LeastInFlightRotation,
+}
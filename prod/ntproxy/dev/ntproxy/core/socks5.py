@@ -0,0 +1,101 @@
+import asyncio
+import ipaddress
+import struct
+
+from typing import Tuple
+from ntproxy.base.public.models import ProxyModel
+
+REPLIES = {
+    0x01: "general SOCKS server failure",
+    0x02: "connection not allowed by ruleset",
+    0x03: "network unreachable",
+    0x04: "host unreachable",
+    0x05: "connection refused",
+    0x06: "TTL expired",
+    0x07: "command not supported",
+    0x08: "address type not supported",
+}
+
+
+def _address(host: str) -> bytes:
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        # socks5h: the proxy resolves the name
+        name = host.encode("idna")
+        if len(name) > 255:
+            raise ValueError(f"Host name too long for SOCKS5: {host}")
+        return b"\x03" + bytes([len(name)]) + name
+    return (b"\x01" if ip.version == 4 else b"\x04") + ip.packed
+
+
+async def _handshake(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                     proxy: ProxyModel, host: str, port: int) -> None:
+    methods = b"\x00\x02" if proxy.username else b"\x00"
+    writer.write(b"\x05" + bytes([len(methods)]) + methods)
+    version, method = await reader.readexactly(2)
+    if version != 5:
+        raise ConnectionError(f"{proxy.key} is not a SOCKS5 server")
+    if method == 0xFF:
+        raise ConnectionError(f"{proxy.key} accepted none of the offered auth methods")
+
+    if method == 0x02:
+        username = (proxy.username or "").encode()
+        password = (proxy.password or "").encode()
+        if len(username) > 255 or len(password) > 255:
+            raise ValueError("SOCKS5 username and password are limited to 255 bytes")
+        writer.write(b"\x01" + bytes([len(username)]) + username + bytes([len(password)]) + password)
+        _, status = await reader.readexactly(2)
+        if status != 0:
+            raise ConnectionError(f"{proxy.key} rejected the credentials")
+    elif method != 0x00:
+        raise ConnectionError(f"{proxy.key} selected an unsupported auth method: {method}")
+
+    writer.write(b"\x05\x01\x00" + _address(host) + struct.pack("!H", port))
+    _, reply, _, atyp = await reader.readexactly(4)
+    if reply != 0:
+        raise ConnectionError(f"{proxy.key} could not connect to {host}:{port}: {REPLIES.get(reply, reply)}")
+
+    # Skip the bound address
+    if atyp == 0x01:
+        await reader.readexactly(4 + 2)
+    elif atyp == 0x04:
+        await reader.readexactly(16 + 2)
+    elif atyp == 0x03:
+        length = (await reader.readexactly(1))[0]
+        await reader.readexactly(length + 2)
+    else:
+        raise ConnectionError(f"{proxy.key} replied with an unknown address type: {atyp}")
+
+
+async def open_connection(proxy: ProxyModel, host: str, port: int,
+                          timeout: float = 10.0) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Open a TCP connection to `host:port` through a SOCKS5 proxy.
+
+    Host names are sent to the proxy unresolved (`socks5h`); username/password
+    auth is offered when the proxy has a username.
+
+    Args:
+        proxy (ProxyModel): The proxy to tunnel through.
+        host (str): Target host name or IP address.
+        port (int): Target port.
+        timeout (float): Seconds allowed for connecting and for the handshake, each.
+
+    Returns:
+        Tuple[asyncio.StreamReader, asyncio.StreamWriter]: The streams of the tunnel.
+
+    Raises:
+        ConnectionError: If the proxy refuses the handshake or the target.
+        asyncio.TimeoutError: If the proxy does not answer in time.
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(proxy.host, proxy.port), timeout)
+    try:
+        await asyncio.wait_for(_handshake(reader, writer, proxy, host, port), timeout)
+    except asyncio.IncompleteReadError:
+        writer.close()
+        raise ConnectionError(f"{proxy.key} closed the connection during the handshake")
+    except BaseException:
+        writer.close()
+        raise
+    return reader, writer
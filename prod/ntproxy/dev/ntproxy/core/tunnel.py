@@ -0,0 +1,253 @@
+import asyncio
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+from ntproxy.base.public.models import ProxyModel
+from ntproxy.core.pool import ProxyPool
+from ntproxy.core.socks5 import open_connection
+
+
+class Tunnel:
+    __slots__ = ("proxy", "host", "port", "reader", "writer", "released", "reusable")
+
+    def __init__(self, proxy: ProxyModel, host: str, port: int,
+                 reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        An established connection to a target through a proxy.
+
+        Set `reusable` to False before releasing it if the connection is not in
+        a state another request can continue from.
+
+        Args:
+            proxy (ProxyModel): The proxy the tunnel goes through.
+            host (str): Target host.
+            port (int): Target port.
+            reader (asyncio.StreamReader): Reads from the target.
+            writer (asyncio.StreamWriter): Writes to the target.
+        """
+        self.proxy = proxy
+        self.host = host
+        self.port = port
+        self.reader = reader
+        self.writer = writer
+        self.released = 0.0
+        self.reusable = True
+
+    def alive(self) -> bool:
+        """Whether neither side has closed the connection."""
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+
+class _Slot:
+    __slots__ = ("idle", "open", "waiters")
+
+    def __init__(self):
+        self.idle: Deque[Tunnel] = deque()
+        self.open = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+
+class TunnelPool:
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, max_size: int = 8,
+                 idle_timeout: float = 30.0, connect_timeout: float = 10.0):
+        """
+        Reuse established SOCKS5 tunnels, keyed by proxy and target.
+
+        At most `max_size` tunnels are open per proxy and target; further
+        acquires wait for one to be released. Released tunnels are kept idle
+        for `idle_timeout` seconds and handed out newest first. Must be used
+        from a single event loop.
+
+        Args:
+            proxy_pool (Optional[ProxyPool]): Picks the proxy when none is given and
+                receives the handshake latency or failure of every new tunnel.
+            max_size (int): Maximum open tunnels per proxy and target.
+            idle_timeout (float): Seconds an idle tunnel is kept.
+            connect_timeout (float): Seconds allowed for connecting and for the handshake.
+        """
+        self.proxy_pool = proxy_pool
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+
+        self.opened = 0
+        self.reused = 0
+        self._slots: Dict[Tuple[str, str, int], _Slot] = {}
+        self._swept = time.monotonic()
+        self._closed = False
+
+    async def acquire(self, host: str, port: int, proxy: Optional[ProxyModel] = None) -> Tunnel:
+        """
+        Take an idle tunnel to a target or open a new one.
+
+        Args:
+            host (str): Target host.
+            port (int): Target port.
+            proxy (Optional[ProxyModel]): The proxy to use; selected from `proxy_pool` if None.
+
+        Returns:
+            Tunnel: The tunnel; give it back with `release`.
+
+        Raises:
+            RuntimeError: If the pool is closed, or if no proxy is given and there is no `proxy_pool`.
+            ConnectionError: If the handshake fails.
+            asyncio.TimeoutError: If the proxy does not answer in time.
+        """
+        if self._closed:
+            raise RuntimeError("TunnelPool is closed")
+        if proxy is None:
+            if self.proxy_pool is None:
+                raise RuntimeError("A proxy is required when the TunnelPool has no proxy_pool")
+            proxy = self.proxy_pool.select()
+
+        key = (proxy.key, host, port)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot()
+
+        while True:
+            tunnel = self._pop_idle(slot)
+            if tunnel is not None:
+                self.reused += 1
+                return tunnel
+            if slot.open < self.max_size:
+                slot.open += 1
+                try:
+                    return await self._open(proxy, host, port)
+                except BaseException:
+                    slot.open -= 1
+                    self._wake(slot)
+                    raise
+
+            waiter = asyncio.get_running_loop().create_future()
+            slot.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken and cancelled at once: pass the turn on
+                    self._wake(slot)
+                raise
+            finally:
+                if waiter in slot.waiters:
+                    slot.waiters.remove(waiter)
+
+    def release(self, tunnel: Tunnel) -> None:
+        """
+        Give a tunnel back; it is kept idle if reusable and still open, closed otherwise.
+
+        Args:
+            tunnel (Tunnel): A tunnel returned by `acquire`.
+        """
+        slot = self._slots.get((tunnel.proxy.key, tunnel.host, tunnel.port))
+        if slot is None:
+            tunnel.writer.close()
+            return
+
+        if self._closed or not tunnel.reusable or not tunnel.alive():
+            tunnel.writer.close()
+            slot.open -= 1
+        else:
+            tunnel.released = time.monotonic()
+            slot.idle.append(tunnel)
+        self._wake(slot)
+        self._sweep()
+
+    @asynccontextmanager
+    async def connect(self, host: str, port: int, proxy: Optional[ProxyModel] = None) -> AsyncIterator[Tunnel]:
+        """
+        Acquire a tunnel for the enclosed block and release it afterwards.
+
+        The tunnel is not reused if the block raises.
+
+        Args:
+            host (str): Target host.
+            port (int): Target port.
+            proxy (Optional[ProxyModel]): The proxy to use; selected from `proxy_pool` if None.
+
+        Yields:
+            Tunnel: The tunnel.
+        """
+        tunnel = await self.acquire(host, port, proxy)
+        try:
+            yield tunnel
+        except BaseException:
+            tunnel.reusable = False
+            raise
+        finally:
+            self.release(tunnel)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count tunnels.
+
+        Returns:
+            Dict[str, int]: Tunnels opened and reused so far, and currently open and idle.
+        """
+        return {
+            "opened": self.opened,
+            "reused": self.reused,
+            "open": sum(slot.open for slot in self._slots.values()),
+            "idle": sum(len(slot.idle) for slot in self._slots.values()),
+        }
+
+    async def aclose(self) -> None:
+        """Close every idle tunnel; tunnels in use are closed when released."""
+        self._closed = True
+        writers: List[asyncio.StreamWriter] = []
+        for slot in self._slots.values():
+            while slot.idle:
+                writers.append(slot.idle.popleft().writer)
+                slot.open -= 1
+            for waiter in slot.waiters:
+                if not waiter.done():
+                    waiter.set_exception(RuntimeError("TunnelPool is closed"))
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+    async def _open(self, proxy: ProxyModel, host: str, port: int) -> Tunnel:
+        started = time.perf_counter()
+        try:
+            reader, writer = await open_connection(proxy, host, port, self.connect_timeout)
+        except (OSError, asyncio.TimeoutError):
+            if self.proxy_pool is not None:
+                self.proxy_pool.report(proxy, error=True)
+            raise
+        if self.proxy_pool is not None:
+            self.proxy_pool.report(proxy, time.perf_counter() - started)
+        self.opened += 1
+        return Tunnel(proxy, host, port, reader, writer)
+
+    def _pop_idle(self, slot: _Slot) -> Optional[Tunnel]:
+        deadline = time.monotonic() - self.idle_timeout
+        while slot.idle:
+            tunnel = slot.idle.pop()
+            if tunnel.released >= deadline and tunnel.alive():
+                return tunnel
+            tunnel.writer.close()
+            slot.open -= 1
+        return None
+
+    def _wake(self, slot: _Slot) -> None:
+        while slot.waiters:
+            waiter = slot.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        if now - self._swept < self.idle_timeout / 2:
+            return
+        self._swept = now
+        deadline = now - self.idle_timeout
+        for key, slot in list(self._slots.items()):
+            # Oldest first: stop at the first tunnel still within its timeout
+            while slot.idle and slot.idle[0].released < deadline:
+                slot.idle.popleft().writer.close()
+                slot.open -= 1
+            if not slot.open and not slot.waiters:
+                del self._slots[key]
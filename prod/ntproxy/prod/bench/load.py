@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "usage"))
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ntproxy import ProxyPool, TunnelPool  # type: ignore
+from ntproxy.base.public.models import ProxyModel  # type: ignore
+from ntproxy.core.rotation import ROTATIONS, Rotation  # type: ignore
+from socks5_standin import EchoServer, Socks5StandIn
+
+# ProxyPool strategies get handshake feedback; rotations are blind
+POOL_STRATEGIES = ["best", "p2c", "weighted"]
+STRATEGIES = [f"pool:{name}" for name in POOL_STRATEGIES] + [f"rotation:{name}" for name in ROTATIONS]
+PAYLOAD = b"x" * 64
+
+
+def parse_proxies(spec: str) -> List[Tuple[float, float]]:
+    """Parse `latency:failure_rate,...`, e.g. `0.001:0,0.05:0.2`."""
+    proxies = []
+    for part in spec.split(","):
+        latency, _, failure_rate = part.partition(":")
+        proxies.append((float(latency), float(failure_rate or 0)))
+    return proxies
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * (len(values) - 1)))]
+
+
+def raise_fd_limit() -> None:
+    # Every tunnel holds four sockets in this process: client, stand-in, upstream, echo
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run_case(strategy: str, proxies: List[ProxyModel], target: Tuple[str, int],
+                   requests: int, concurrency: int, pool_size: int, reuse: bool, timeout: float) -> Dict:
+    kind, _, name = strategy.partition(":")
+    proxy_pool: Optional[ProxyPool] = None
+    rotation: Optional[Rotation] = None
+    if kind == "pool":
+        proxy_pool = ProxyPool(proxies, strategy=name)
+    else:
+        rotation = ROTATIONS[name](proxies)
+    tunnels = TunnelPool(proxy_pool, max_size=pool_size, connect_timeout=timeout)
+
+    host, port = target
+    remaining = requests
+    connect: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def request(i: int) -> None:
+        proxy = rotation.select(f"host{i % 1000}") if rotation is not None else None
+        started = time.perf_counter()
+        try:
+            tunnel = await tunnels.acquire(host, port, proxy)
+        except (OSError, asyncio.TimeoutError, RuntimeError) as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            if rotation is not None:
+                rotation.release(proxy)
+            return
+        connect.append(time.perf_counter() - started)
+        try:
+            tunnel.writer.write(PAYLOAD)
+            await tunnel.reader.readexactly(len(PAYLOAD))
+            tunnel.reusable = reuse
+        except (OSError, asyncio.IncompleteReadError) as e:
+            tunnel.reusable = False
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        finally:
+            tunnels.release(tunnel)
+            # In flight until the round trip is done, not just the handshake
+            if rotation is not None:
+                rotation.release(proxy)
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await request(remaining)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stats = tunnels.stats()
+    await tunnels.aclose()
+
+    connect.sort()
+    failed = sum(errors.values())
+    return {
+        "strategy": strategy,
+        "requests": requests,
+        "concurrency": concurrency,
+        "pool_size": pool_size,
+        "reuse": reuse,
+        "seconds": round(elapsed, 6),
+        "requests_per_s": round((requests - failed) / elapsed, 1),
+        "connect_p50_ms": round(percentile(connect, 0.50) * 1000, 3),
+        "connect_p99_ms": round(percentile(connect, 0.99) * 1000, 3),
+        "error_rate": round(failed / requests, 4),
+        "errors": errors,
+        "tunnels_opened": stats["opened"],
+        "tunnels_reused": stats["reused"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent connections through ntproxy selection and tunnel pooling.")
+    parser.add_argument("--proxies", default="0.001:0,0.002:0,0.01:0,0.05:0.05,0.005:0.5",
+                        help="Stand-ins as latency:failure_rate pairs, comma separated.")
+    parser.add_argument("--requests", type=int, default=20_000, help="Requests per strategy.")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=64, help="TunnelPool max_size per proxy and target.")
+    parser.add_argument("--no-reuse", action="store_true", help="Close every tunnel after one request.")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Connect and handshake timeout.")
+    parser.add_argument("--strategies", nargs="+", default=STRATEGIES, choices=STRATEGIES)
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "results" / "load.json")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    echo = EchoServer().start()
+    servers = [Socks5StandIn(latency=latency, failure_rate=failure_rate).start()
+               for latency, failure_rate in parse_proxies(args.proxies)]
+    proxies = [ProxyModel(type="socks5h", host="127.0.0.1", port=server.port) for server in servers]
+
+    results = []
+    try:
+        for strategy in args.strategies:
+            result = asyncio.run(run_case(
+                strategy, proxies, ("127.0.0.1", echo.port), args.requests,
+                args.concurrency, args.pool_size, not args.no_reuse, args.timeout,
+            ))
+            results.append(result)
+            print(
+                f"[Bench] {strategy:<26} {result['requests_per_s']:>10,.0f} req/s  "
+                f"connect p50 {result['connect_p50_ms']:>8.2f} ms  p99 {result['connect_p99_ms']:>8.2f} ms  "
+                f"errors {result['error_rate']:>6.2%}  opened {result['tunnels_opened']}"
+            )
+    finally:
+        for server in servers:
+            server.stop()
+        echo.stop()
+
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "proxies": args.proxies,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"[Bench] ✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
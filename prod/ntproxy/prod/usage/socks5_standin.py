@@ -0,0 +1,177 @@
+import asyncio
+import random
+import socket
+import struct
+import threading
+
+from typing import Optional, Set
+
+
+class Socks5StandIn:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ):
+        """
+        A local SOCKS5 server for tests and benchmarks.
+
+        Supports no-auth and username/password auth and the CONNECT command with
+        IPv4 or domain targets (resolved here, as `socks5h` expects). Each new
+        connection can be delayed by `latency` seconds and refused with
+        probability `failure_rate`.
+
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on; 0 picks a free one.
+            latency (float): Delay added before answering the greeting.
+            failure_rate (float): Probability of closing a new connection at once.
+            username (Optional[str]): Required username, or None for no auth.
+            password (Optional[str]): Required password.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.username = username
+        self.password = password
+
+        self.connections = 0
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Socks5StandIn":
+        """Start serving in a background thread; returns self once listening."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, backlog=4096)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=f"socks5-standin-{self.port}", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close every connection."""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            self._server.close()
+            # Closing the transports ends the handlers, which cancelling would not do quietly
+            for writer in list(self._writers):
+                writer.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            if tasks:
+                await asyncio.wait(tasks, timeout=1.0)
+            self._loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop)
+        self._thread.join()
+        self._loop = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        upstream: Optional[asyncio.StreamWriter] = None
+        try:
+            if self.failure_rate and random.random() < self.failure_rate:
+                return
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            # Greeting
+            version, count = await reader.readexactly(2)
+            methods = await reader.readexactly(count)
+            wanted = 0x02 if self.username is not None else 0x00
+            if version != 5 or wanted not in methods:
+                writer.write(b"\x05\xff")
+                return
+            writer.write(bytes([5, wanted]))
+
+            # Username/password sub-negotiation (RFC 1929)
+            if wanted == 0x02:
+                _, ulen = await reader.readexactly(2)
+                username = (await reader.readexactly(ulen)).decode()
+                plen = (await reader.readexactly(1))[0]
+                password = (await reader.readexactly(plen)).decode()
+                ok = username == self.username and password == self.password
+                writer.write(b"\x01\x00" if ok else b"\x01\x01")
+                if not ok:
+                    return
+
+            # Request
+            _, command, _, atyp = await reader.readexactly(4)
+            if atyp == 0x01:
+                target_host = socket.inet_ntoa(await reader.readexactly(4))
+            elif atyp == 0x03:
+                length = (await reader.readexactly(1))[0]
+                target_host = (await reader.readexactly(length)).decode()
+            else:
+                writer.write(b"\x05\x08\x00\x01" + b"\x00" * 6)
+                return
+            (target_port,) = struct.unpack("!H", await reader.readexactly(2))
+
+            if command != 0x01:
+                writer.write(b"\x05\x07\x00\x01" + b"\x00" * 6)
+                return
+            try:
+                up_reader, upstream = await asyncio.open_connection(target_host, target_port)
+            except OSError:
+                writer.write(b"\x05\x05\x00\x01" + b"\x00" * 6)
+                return
+            writer.write(b"\x05\x00\x00\x01" + b"\x00" * 6)
+            await writer.drain()
+
+            await asyncio.gather(self._pipe(reader, upstream), self._pipe(up_reader, writer))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if upstream is not None:
+                upstream.close()
+            writer.close()
+            self._writers.discard(writer)
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if writer.can_write_eof():
+                try:
+                    writer.write_eof()
+                except OSError:
+                    pass
+
+
+class EchoServer(Socks5StandIn):
+    """A plain TCP echo server used as the target behind the stand-ins."""
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            await self._pipe(reader, writer)
+        finally:
+            writer.close()
+            self._writers.discard(writer)
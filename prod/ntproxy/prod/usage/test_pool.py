@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from collections import Counter
+from ntproxy import NTProxy  # type: ignore
+from ntproxy.base.public.models import ProxyModel  # type: ignore
+from socks5_standin import Socks5StandIn
+
+fast = Socks5StandIn(latency=0.001).start()
+slow = Socks5StandIn(latency=0.05).start()
+dead = Socks5StandIn().start()
+dead.stop()
+
+nt = NTProxy()
+for server in (fast, slow, dead):
+    nt.add(ProxyModel(type="socks5h", host="127.0.0.1", port=server.port))
+
+pool = nt.pool(probe_interval=0.2, probe_timeout=1.0, eject_failures=1, base_backoff=60.0)
+pool.start()
+time.sleep(0.5)
+
+for key, stats in pool.stats().items():
+    print(f"[NTProxy] {key} latency={stats.latency} error_rate={stats.error_rate:.2f} ejected={stats.ejected_until > time.time()}")
+
+healthy = [proxy.port for proxy in pool.healthy()]
+assert dead.port not in healthy, healthy
+assert healthy[0] == fast.port, healthy
+
+for strategy in ("best", "p2c", "weighted"):
+    picks = Counter(pool.select(strategy).port for _ in range(10000))
+    print(f"[NTProxy] {strategy}: fast={picks[fast.port]} slow={picks[slow.port]} dead={picks[dead.port]}")
+    assert picks[dead.port] == 0
+    assert picks[fast.port] > picks[slow.port]
+
+pool.stop()
+fast.stop()
+slow.stop()
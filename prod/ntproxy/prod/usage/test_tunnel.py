@@ -0,0 +1,47 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ntproxy import ProxyPool, TunnelPool, open_connection  # type: ignore
+from ntproxy.base.public.models import ProxyModel  # type: ignore
+from socks5_standin import EchoServer, Socks5StandIn
+
+echo = EchoServer().start()
+server = Socks5StandIn(latency=0.01, username="user", password="secret").start()
+proxy = ProxyModel(type="socks5h", host="127.0.0.1", port=server.port, username="user", password="secret")
+
+
+async def main():
+    # Host names are resolved by the proxy
+    reader, writer = await open_connection(proxy, "localhost", echo.port)
+    writer.write(b"ping")
+    assert await reader.readexactly(4) == b"ping"
+    writer.close()
+
+    try:
+        await open_connection(ProxyModel(type="socks5h", host="127.0.0.1", port=server.port,
+                                         username="user", password="wrong"), "localhost", echo.port)
+        raise AssertionError("bad credentials were accepted")
+    except ConnectionError as e:
+        print(f"[NTProxy] {e}")
+
+    tunnels = TunnelPool(ProxyPool([proxy]), max_size=4, idle_timeout=5.0)
+
+    async def request(i: int):
+        async with tunnels.connect("localhost", echo.port) as tunnel:
+            tunnel.writer.write(b"%04d" % i)
+            assert await tunnel.reader.readexactly(4) == b"%04d" % i
+
+    await asyncio.gather(*(request(i) for i in range(1000)))
+    stats = tunnels.stats()
+    print(f"[NTProxy] {stats}")
+    assert stats["opened"] <= 4 and stats["opened"] + stats["reused"] == 1000
+
+    await tunnels.aclose()
+
+
+asyncio.run(main())
+server.stop()
+echo.stop()
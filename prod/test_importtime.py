@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+base = Path(__file__).parent.parent
+
+# Every package with lazy exports, and one export to compare its bare import with
+PACKAGES = {
+    "ntdocs": "SearchIndex",
+    "ntexample": "NTExample",
+    "ntlog": "NTLog",
+    "ntproxy": "NTProxy",
+    "ntwheel": "EnvModel",
+}
+SOURCES = {name: base / "prod" / name / "dev" for name in PACKAGES}
+SOURCES["ntwheel"] = base / "dev"
+# Exports cheaper than this (µs) are not compared with the bare import
+MIN_EXPORT_US = 10_000
+
+
+def import_times(statement: str, env: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+    """Run a statement in a fresh interpreter; returns the cumulative import time in µs and nesting depth per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = (int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2)
+    return times
+
+
+def check(package: str, symbol: str) -> None:
+    # An installed package (e.g. the wheel under test) is used as is, otherwise its source tree
+    env = dict(os.environ)
+    spec = importlib.util.find_spec(package)
+    # `prod/<package>` next to this script is found as a namespace package, without an origin
+    if spec is None or spec.origin is None:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SOURCES[package]), env.get("PYTHONPATH")]))
+
+    # Importing the package loads none of its modules until an export is used
+    bare = import_times(f"import {package}", env)
+    loaded = sorted(name for name in bare if name.startswith(f"{package}."))
+    assert not loaded, f"import {package} loaded {loaded}"
+    assert "pkgutil" not in bare, f"import {package} loaded pkgutil"
+
+    # Compared on the same machine, so the check does not depend on its speed
+    used = import_times(f"from {package} import {symbol}", env)
+    total = sum(time for name, (time, depth) in used.items() if depth == 0 and name.split(".")[0] == package)
+    ratio = bare[package][0] / total
+    print(f"import {package}: {bare[package][0] / 1000:.1f} ms, {ratio:.0%} of importing {symbol} ({total / 1000:.1f} ms)")
+    # A package whose exports are this cheap has nothing to defer; the submodule check above still applies
+    if total >= MIN_EXPORT_US:
+        assert ratio < 0.25, (package, ratio)
+
+
+# Packages may be named on the command line, e.g. the one a build session installed
+for package in sys.argv[1:] or PACKAGES:
+    check(package, PACKAGES[package])